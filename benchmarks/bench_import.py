@@ -0,0 +1,129 @@
+'''
+Время импорта пакета и проверка, что лёгкие сценарии не загружают тяжёлые модули
+----------
+
+Каждый сценарий выполняется в новом интерпретаторе. Для каждого выводится
+лучшее время запуска из нескольких попыток за вычетом пустого запуска python
+и время импорта модулей my_project с их зависимостями по данным -X importtime.
+
+Если сценарий загрузил запрещённый для него модуль (например, typing или
+asyncio при загрузке модели для предсказаний) или время импорта my_project
+превысило бюджет, скрипт завершается с кодом 1, поэтому его можно запускать
+в CI как проверку от регрессий.
+
+Запуск из корня репозитория:
+    python benchmarks/bench_import.py [--repeat 7] [--budget 30]
+'''
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# модули, загрузка которых в коротком сценарии считается регрессией
+HEAVY = ['typing', 'json', 're', 'random', 'asyncio', 'concurrent.futures', 'multiprocessing', 'hashlib']
+
+SCENARIOS = [
+    ('import my_project', 'import my_project',
+     HEAVY + ['my_project.mmath', 'my_project.ml', 'my_project.mdata_reader']),
+    ('загрузка модели и предсказание',
+     'from my_project import Linear_Regression\n'
+     'model = Linear_Regression.load(MODEL)\n'
+     'model.predict_one([0.5, 0.5, 0.5])',
+     HEAVY + ['my_project.mdata_reader', 'my_project.moptim', 'my_project.mparallel',
+              'my_project.mstats', 'my_project.mpreprocessing', 'my_project.mcache']),
+    ('import read_data', 'from my_project import read_data',
+     HEAVY + ['my_project.ml', 'my_project.mcache']),
+]
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = SRC + os.pathsep + env.get('PYTHONPATH', '')
+    return env
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, '-c', code], env=_env(), capture_output=True, text=True, check=True)
+
+
+def best_time(code: str, repeat: int) -> float:
+    '''
+    Лучшее время запуска интерпретатора с кодом code из repeat попыток
+    ----------
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _run(code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def own_import_time(code: str) -> float:
+    '''
+    Время импорта модулей my_project вместе со всем, что они загрузили, в секундах по -X importtime
+    ----------
+    '''
+    total = 0
+    for line in _run(code, '-X', 'importtime').stderr.splitlines():
+        parts = line.split('|')
+        # внешние импорты записаны без отступа, вложенные уже учтены в их общем времени
+        if len(parts) == 3 and parts[2].startswith(' my_project'):
+            total += int(parts[1])
+    return total / 1e6
+
+
+def loaded(code: str, modules: List[str]) -> List[str]:
+    '''
+    Какие из modules оказались в sys.modules после выполнения code
+    ----------
+    '''
+    probe = code + f'\nimport sys\nprint(",".join(m for m in {modules!r} if m in sys.modules))'
+    return [m for m in _run(probe).stdout.strip().split(',') if m]
+
+
+def write_model(path: str) -> None:
+    from my_project import Linear_Regression, Matrix
+    X = Matrix([[float(i % 7), float(i % 5), float(i % 3)] for i in range(50)])
+    y = Matrix([[2.0 * i % 7 + i % 5 - i % 3] for i in range(50)])
+    model = Linear_Regression(solver='normal')
+    model.fit(X, y)
+    model.save(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=7, help='количество запусков каждого сценария')
+    parser.add_argument('--budget', type=float, default=30.0,
+                        help='наибольшее допустимое время импорта my_project в сценарии, мс')
+    args = parser.parse_args()
+    sys.path.insert(0, SRC)
+    failures: List[Tuple[str, str]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, 'model.bin')
+        write_model(model_path)
+        empty = best_time('pass', args.repeat)
+        print(f'{"сценарий":<34}{"запуск, мс":>12}{"my_project, мс":>16}')
+        for name, code, forbidden in SCENARIOS:
+            code = f'MODEL = {model_path!r}\n' + code
+            elapsed = max(best_time(code, args.repeat) - empty, 0.0)
+            own = min(own_import_time(code) for _ in range(args.repeat))
+            print(f'{name:<34}{elapsed * 1000:>12.1f}{own * 1000:>16.1f}')
+            extra = loaded(code, forbidden)
+            if extra:
+                failures.append((name, 'загружены модули: ' + ', '.join(extra)))
+            if own * 1000 > args.budget:
+                failures.append((name, f'импорт my_project {own * 1000:.1f} мс больше бюджета {args.budget} мс'))
+    for name, reason in failures:
+        print(f'РЕГРЕССИЯ [{name}]: {reason}', file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
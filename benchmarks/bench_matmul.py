@@ -0,0 +1,71 @@
+'''
+Сравнение ядер умножения матриц с исходной реализацией Matrix.matmul
+----------
+
+Запуск из корня репозитория:
+    python benchmarks/bench_matmul.py
+'''
+from __future__ import annotations
+import random
+import time
+from typing import Callable, List, Tuple
+from my_project import mmath as mm
+
+
+def naive_matmul(a: mm.Matrix, b: mm.Matrix) -> mm.Matrix:
+    '''
+    Исходное ядро: цикл i-j-k по спискам с промежуточной ZeroMatrix
+    ----------
+    '''
+    result = mm.ZeroMatrix(size=(a.size[0], b.size[1]))
+    for i in range(a.size[0]):
+        for j in range(b.size[1]):
+            for k in range(a.size[1]):
+                result.values[i][j] += a.values[i][k] * b.values[k][j]
+    return mm.Matrix(result.values)
+
+
+def random_values(rows: int, cols: int) -> List[List[float]]:
+    return [[random.random() for _ in range(cols)] for _ in range(rows)]
+
+
+def best_time(func: Callable[[], object], repeat: int = 3) -> float:
+    '''
+    Лучшее время из нескольких запусков в секундах
+    ----------
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+CASES: List[Tuple[str, Tuple[int, int], Tuple[int, int]]] = [
+    ('X @ w', (20000, 10), (10, 1)),
+    ('X.T() @ e', (10, 20000), (20000, 1)),
+    ('квадратные', (150, 150), (150, 150)),
+    ('широкая правая', (200, 20), (20, 500)),
+]
+
+
+def main() -> None:
+    random.seed(0)
+    print(f'{"случай":<16}{"размеры":<26}{"исходное, с":>14}{"Matrix, с":>12}{"ArrayMatrix, с":>16}')
+    for name, left, right in CASES:
+        a_values, b_values = random_values(*left), random_values(*right)
+        a, b = mm.Matrix(a_values), mm.Matrix(b_values)
+        a_arr, b_arr = mm.ArrayMatrix(a_values), mm.ArrayMatrix(b_values)
+        if name == 'X.T() @ e':
+            # как в Linear_Regression.fit: левая матрица - транспонированное представление X
+            a_arr = mm.ArrayMatrix([list(row) for row in zip(*a_values)]).T()
+        old = best_time(lambda: naive_matmul(a, b), repeat=1)
+        new = best_time(lambda: a.matmul(b))
+        new_arr = best_time(lambda: a_arr.matmul(b_arr))
+        shape = f'{left[0]}x{left[1]} @ {right[0]}x{right[1]}'
+        print(f'{name:<16}{shape:<26}{old:>14.4f}{new:>12.4f}{new_arr:>16.4f}')
+
+
+if __name__ == '__main__':
+    main()
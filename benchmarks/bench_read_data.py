@@ -0,0 +1,74 @@
+'''
+Сравнение скорости чтения txt файлов: исходная реализация, построчный и блочный разбор
+----------
+
+Запуск из корня репозитория:
+    python benchmarks/bench_read_data.py [количество строк]
+'''
+from __future__ import annotations
+import os
+import random
+import sys
+import tempfile
+import time
+from copy import deepcopy
+from typing import Callable, List
+from my_project import mdata_reader as mr
+
+
+def legacy_read_data(path: str, sep: str = ',') -> List[List[float]]:
+    '''
+    Исходный алгоритм: список списков по строкам и его глубокая копия в конструкторе матрицы
+    ----------
+    '''
+    with open(path, 'r') as f:
+        f.readline()
+        res = []
+        for line in f:
+            try:
+                res.append([float(x) for x in line.strip().split(sep)])
+            except:
+                continue
+        return deepcopy(res)
+
+
+def write_dataset(path: str, rows: int, cols: int = 14) -> None:
+    '''
+    Синтетический файл в формате examples/train_data.txt
+    ----------
+    '''
+    random.seed(0)
+    with open(path, 'w') as f:
+        f.write(','.join(f'col{j}' for j in range(cols)) + '\n')
+        for _ in range(rows):
+            f.write(','.join(f'{random.uniform(0, 5000):.2f}' for _ in range(cols)) + '\n')
+
+
+def best_time(func: Callable[[], object], repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.txt')
+        write_dataset(path, rows)
+        results = [
+            ('исходный', best_time(lambda: legacy_read_data(path))),
+            ('построчный', best_time(lambda: mr.read_data(path, sep=',', bulk=False))),
+            ('блочный', best_time(lambda: mr.read_data(path, sep=',', bulk=True))),
+        ]
+    base = results[0][1]
+    print(f'{rows} строк x 14 столбцов')
+    print(f'{"режим":<14}{"время, с":>10}{"строк/с":>14}{"ускорение":>12}')
+    for name, seconds in results:
+        print(f'{name:<14}{seconds:>10.3f}{rows / seconds:>14,.0f}{base / seconds:>11.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+'''
+Набор замеров производительности mmath, read_data и Linear_Regression
+----------
+
+Для каждого размера синтетических данных n x d замеряются операции с
+матрицами, разбор txt файла, обучение и предсказание. Для каждого замера
+сохраняются лучшее время, пропускная способность (строк в секунду) и пиковая
+память по tracemalloc, а по нескольким n - показатель роста времени
+(время ~ n^k). Результаты пишутся в JSON и могут сравниваться с сохранённой
+базовой линией: замедление больше порога считается регрессией и скрипт
+завершается с кодом 1.
+
+Запуск из корня репозитория:
+    python -m benchmarks.suite --sizes 1000,10000,100000 --features 10 --output results.json
+    python -m benchmarks.suite --baseline benchmarks/suite/baseline.json --threshold 0.25
+    python -m benchmarks.suite --cases matmul,fit   # только замеры с такими префиксами
+'''
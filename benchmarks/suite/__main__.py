@@ -0,0 +1,3 @@
+from benchmarks.suite.runner import main
+
+main()
@@ -0,0 +1,152 @@
+'''
+Замеряемые операции
+----------
+
+Каждый замер - функция от Dataset, возвращающая вызов без аргументов, время
+которого измеряется, и количество строк, которые этот вызов обрабатывает
+(для пропускной способности). Подготовка (копии, обучение модели для
+предсказания) выполняется до замера
+'''
+from __future__ import annotations
+from typing import Callable, List, Tuple
+from my_project import mmath as mm
+from my_project import mdata_reader as mr
+from my_project.ml import Linear_Regression
+from benchmarks.suite.datasets import Dataset
+
+GD_EPOCHS = 5
+
+Case = Callable[[Dataset], Tuple[Callable[[], object], int]]
+
+
+def matmul_xw(data: Dataset):
+    w = mm.ArrayMatrix([[1.0] for _ in range(data.d)])
+    return lambda: data.X.matmul(w), data.n
+
+
+def matmul_xw_list(data: Dataset):
+    X, w = mm.Matrix(data.X.tolist()), mm.Matrix([[1.0] for _ in range(data.d)])
+    return lambda: X.matmul(w), data.n
+
+
+def matmul_gram(data: Dataset):
+    Xt = data.X.T()
+    return lambda: Xt.matmul(data.X), data.n
+
+
+def transpose(data: Dataset):
+    return lambda: data.X.T(), data.n
+
+
+def transpose_copy(data: Dataset):
+    # T() возвращает представление, копия показывает стоимость материализации
+    return lambda: data.X.T()._flat(), data.n
+
+
+def add(data: Dataset):
+    other = mm.ArrayMatrix(data.X)
+    return lambda: data.X + other, data.n
+
+
+def add_out(data: Dataset):
+    other, out = mm.ArrayMatrix(data.X), mm.ArrayMatrix(data.X)
+    return lambda: data.X.add(other, out=out), data.n
+
+
+def mul_scalar(data: Dataset):
+    return lambda: data.X * 2.5, data.n
+
+
+def sub_broadcast(data: Dataset):
+    mean = data.X.mean(axis=0)
+    return lambda: data.X - mean, data.n
+
+
+def sum_axis0(data: Dataset):
+    return lambda: data.X.sum(axis=0), data.n
+
+
+def var_axis0(data: Dataset):
+    return lambda: data.X.var(axis=0), data.n
+
+
+def read_data(data: Dataset):
+    return lambda: mr.read_data(data.path, sep=','), data.n
+
+
+def read_data_rows(data: Dataset):
+    return lambda: mr.read_data(data.path, sep=',', bulk=False), data.n
+
+
+def iter_chunks(data: Dataset):
+    return lambda: sum(chunk.size[0] for chunk in mr.iter_chunks(data.path, sep=',', chunk_rows=10000)), data.n
+
+
+def _fit(data: Dataset, **params):
+    def run():
+        model = Linear_Regression(**params)
+        model.fit(data.X, data.y)
+        return model
+    return run
+
+
+def fit_gd(data: Dataset):
+    return _fit(data, solver='gd', n_epochs=GD_EPOCHS, learning_rate=0.001), data.n * GD_EPOCHS
+
+
+def fit_minibatch(data: Dataset):
+    return _fit(data, solver='gd', n_epochs=1, batch_size=256, learning_rate=0.001, random_state=0), data.n
+
+
+def fit_normal(data: Dataset):
+    return _fit(data, solver='normal'), data.n
+
+
+def fit_qr(data: Dataset):
+    return _fit(data, solver='qr'), data.n
+
+
+def _fitted(data: Dataset) -> Linear_Regression:
+    model = Linear_Regression(solver='normal')
+    model.fit(data.X, data.y)
+    return model
+
+
+def predict(data: Dataset):
+    model = _fitted(data)
+    return lambda: model.predict(data.X), data.n
+
+
+def predict_iter(data: Dataset):
+    model, rows = _fitted(data), data.X.tolist()
+    return lambda: sum(len(batch) for batch in model.predict_iter(rows)), data.n
+
+
+def predict_one(data: Dataset):
+    model, rows = _fitted(data), data.X.tolist()[:1000]
+    return lambda: [model.predict_one(row) for row in rows], len(rows)
+
+
+CASES: List[Tuple[str, Case]] = [
+    ('matmul X@w', matmul_xw),
+    ('matmul X@w Matrix', matmul_xw_list),
+    ('matmul X.T()@X', matmul_gram),
+    ('T', transpose),
+    ('T copy', transpose_copy),
+    ('add', add),
+    ('add out=', add_out),
+    ('mul scalar', mul_scalar),
+    ('sub broadcast', sub_broadcast),
+    ('sum axis=0', sum_axis0),
+    ('var axis=0', var_axis0),
+    ('read_data', read_data),
+    ('read_data bulk=False', read_data_rows),
+    ('iter_chunks', iter_chunks),
+    ('fit gd', fit_gd),
+    ('fit minibatch', fit_minibatch),
+    ('fit normal', fit_normal),
+    ('fit qr', fit_qr),
+    ('predict', predict),
+    ('predict_iter', predict_iter),
+    ('predict_one', predict_one),
+]
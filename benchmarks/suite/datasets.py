@@ -0,0 +1,70 @@
+'''
+Синтетические данные для замеров
+----------
+'''
+from __future__ import annotations
+import os
+import random
+from array import array
+from typing import List, Tuple
+from my_project import mmath as mm
+
+
+class Dataset:
+    '''
+    Синтетическая задача регрессии y = X w + b + шум размера n x d
+    ----------
+
+    Параметры
+    ----------
+    n: int
+        Количество строк
+    d: int
+        Количество признаков
+    directory: str
+        Каталог, в который записывается txt файл с теми же данными
+    seed: int
+        Начальное значение генератора случайных чисел
+
+    Атрибуты
+    ----------
+    X: ArrayMatrix
+        Матрица признаков
+    y: ArrayMatrix
+        Столбец целевых значений
+    path: str
+        Путь к txt файлу с заголовками x0..x{d-1}, y и разделителем ','
+    '''
+    def __init__(self, n: int, d: int, directory: str, seed: int = 0):
+        self.n, self.d = n, d
+        X, y, self.weights, self.bias = make_regression(n, d, seed=seed)
+        self.X = mm.ArrayMatrix._from_buffer(X, (n, d))
+        self.y = mm.ArrayMatrix._from_buffer(y, (n, 1))
+        self.path = os.path.join(directory, f'data_{n}x{d}.txt')
+        write_txt(self.path, self.X, self.y)
+
+
+def make_regression(n: int, d: int, noise: float = 0.1, seed: int = 0) -> Tuple[array, array, List[float], float]:
+    '''
+    Значения X построчно, y, истинные веса и смещение
+    ----------
+    '''
+    rng = random.Random(seed)
+    weights = [rng.uniform(-3, 3) for _ in range(d)]
+    bias = rng.uniform(-1, 1)
+    X = array('d', (rng.uniform(0, 10) for _ in range(n * d)))
+    y = array('d', (sum(w * x for w, x in zip(weights, X[i * d:(i + 1) * d])) + bias + rng.gauss(0, noise)
+                    for i in range(n)))
+    return X, y, weights, bias
+
+
+def write_txt(path: str, X: mm.Matrix, y: mm.Matrix) -> None:
+    '''
+    Запись X и y в txt файл в формате examples/train_data.txt
+    ----------
+    '''
+    d = X.size[1]
+    with open(path, 'w') as f:
+        f.write(','.join([f'x{j}' for j in range(d)] + ['y']) + '\n')
+        for row, target in zip(X._iter_rows(), y._col(0)):
+            f.write(','.join(f'{value:.6g}' for value in row) + f',{target:.6g}\n')
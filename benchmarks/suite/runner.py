@@ -0,0 +1,182 @@
+'''
+Запуск замеров, запись JSON и сравнение с базовой линией
+----------
+'''
+from __future__ import annotations
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from math import log
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from benchmarks.suite.cases import CASES
+from benchmarks.suite.datasets import Dataset
+
+
+def best_time(func: Callable[[], object], repeat: int = 3, min_time: float = 0.2) -> float:
+    '''
+    Лучшее время из нескольких запусков в секундах
+    ----------
+
+    Быстрые вызовы повторяются, пока суммарное время не достигнет min_time,
+    чтобы лучшее время не зависело от единичных задержек
+    '''
+    best, total, runs = float('inf'), 0.0, 0
+    while runs < repeat or (total < min_time and runs < 1000):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best, total, runs = min(best, elapsed), total + elapsed, runs + 1
+    return best
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    '''
+    Наибольший объём памяти в байтах, выделенный во время одного вызова, по tracemalloc
+    ----------
+
+    Замер идёт отдельным запуском: под tracemalloc вызовы заметно медленнее
+    '''
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+
+def scaling(points: List[Tuple[int, float]]) -> Optional[float]:
+    '''
+    Показатель k в зависимости время ~ n^k по методу наименьших квадратов в логарифмах
+    ----------
+    '''
+    points = [(log(n), log(seconds)) for n, seconds in points if seconds > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def run(sizes: List[int], features: int, repeat: int, prefixes: Optional[List[str]] = None) -> Dict[str, Any]:
+    '''
+    Выполнение замеров для всех размеров
+    ----------
+
+    Параметры
+    ----------
+    sizes: list[int]
+        Количества строк синтетических данных
+    features: int
+        Количество признаков
+    repeat: int
+        Количество запусков каждого замера, берётся лучшее время
+    prefixes: list[str] | None
+        Выполнять только замеры, названия которых начинаются с одного из префиксов
+
+    Возвращает
+    ----------
+    dict
+        meta, results (по записи на замер и размер) и scaling (показатель роста по замерам)
+    '''
+    cases = [(name, case) for name, case in CASES if not prefixes or name.startswith(tuple(prefixes))]
+    results = []
+    print(f'{"замер":<22}{"n x d":>14}{"время, с":>12}{"строк/с":>16}{"пик, КБ":>12}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            data = Dataset(n, features, tmp)
+            for name, case in cases:
+                func, rows = case(data)
+                seconds = best_time(func, repeat)
+                peak = peak_memory(func)
+                results.append({'case': name, 'n': n, 'd': features, 'seconds': seconds,
+                                'rows_per_s': rows / seconds if seconds else None, 'peak_bytes': peak})
+                print(f'{name:<22}{f"{n}x{features}":>14}{seconds:>12.4f}{rows / seconds:>16,.0f}{peak / 1024:>12,.0f}')
+            del data
+    growth = {}
+    for name, _ in cases:
+        growth[name] = scaling([(r['n'], r['seconds']) for r in results if r['case'] == name])
+    if len(sizes) > 1:
+        print()
+        print(f'{"замер":<22}{"время ~ n^k":>12}')
+        for name, k in growth.items():
+            print(f'{name:<22}{"-" if k is None else f"{k:.2f}":>12}')
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': repeat,
+        },
+        'results': results,
+        'scaling': growth,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    '''
+    Сравнение результатов с базовой линией
+    ----------
+
+    Сравниваются замеры с одинаковыми названием и размером. Регрессией
+    считается время или пиковая память больше базовых в 1 + threshold раз
+
+    Возвращает
+    ----------
+    list[str]
+        Описания регрессий, пустой список - регрессий нет
+    '''
+    base = {(r['case'], r['n'], r['d']): r for r in baseline['results']}
+    regressions = []
+    print()
+    print(f'{"замер":<22}{"n x d":>14}{"время":>10}{"память":>10}')
+    for result in current['results']:
+        key = (result['case'], result['n'], result['d'])
+        if key not in base:
+            continue
+        old = base[key]
+        time_ratio = result['seconds'] / old['seconds']
+        memory_ratio = result['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else 1.0
+        print(f'{key[0]:<22}{f"{key[1]}x{key[2]}":>14}{time_ratio:>9.2f}x{memory_ratio:>9.2f}x')
+        if time_ratio > 1 + threshold:
+            regressions.append(f'{key[0]} {key[1]}x{key[2]}: время {time_ratio:.2f}x от базовой линии')
+        if memory_ratio > 1 + threshold:
+            regressions.append(f'{key[0]} {key[1]}x{key[2]}: память {memory_ratio:.2f}x от базовой линии')
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Замеры производительности mmath, read_data и Linear_Regression')
+    parser.add_argument('--sizes', default='1000,10000,100000', help='количества строк через запятую')
+    parser.add_argument('--features', type=int, default=10, help='количество признаков')
+    parser.add_argument('--repeat', type=int, default=3, help='количество запусков каждого замера')
+    parser.add_argument('--cases', help='префиксы названий замеров через запятую')
+    parser.add_argument('--output', help='путь для записи результатов в JSON')
+    parser.add_argument('--baseline', help='JSON с базовой линией для сравнения')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='допустимое замедление относительно базовой линии (0.25 - на 25%%)')
+    args = parser.parse_args(argv)
+    sizes = [int(n) for n in args.sizes.split(',')]
+    prefixes = args.cases.split(',') if args.cases else None
+    current = run(sizes, args.features, args.repeat, prefixes)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f'РЕГРЕССИЯ: {regression}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,54 @@
+'''
+Линейная регрессия без сторонних библиотек
+----------
+
+Подмодули и основные классы загружаются при первом обращении (PEP 562):
+`import my_project` ничего не импортирует, а `my_project.Linear_Regression`
+загружает только ml и то, от чего он зависит. Поэтому короткие запуски для
+предсказаний не платят за разбор файлов, параллельный режим, оптимизаторы и
+сервер. По той же причине модули пакета импортируют typing только для
+проверки типов (TYPE_CHECKING), аннотации в них не вычисляются.
+
+Время импорта проверяется benchmarks/bench_import.py
+'''
+from __future__ import annotations
+import importlib
+
+_SUBMODULES = ('mcache', 'mdata_reader', 'mkernels', 'ml', 'mmath', 'moptim',
+               'mparallel', 'mprofile', 'mpreprocessing', 'mserver', 'mstats')
+
+_ATTRIBUTES = {
+    'Matrix': 'mmath',
+    'ZeroMatrix': 'mmath',
+    'ArrayMatrix': 'mmath',
+    'Vector': 'mmath',
+    'Linear_Regression': 'ml',
+    'DataFrame': 'mdata_reader',
+    'DataFrameBuilder': 'mdata_reader',
+    'read_data': 'mdata_reader',
+    'iter_chunks': 'mdata_reader',
+    'ParseCache': 'mcache',
+    'RegressionStats': 'mstats',
+    'StandardScaler': 'mpreprocessing',
+    'Pipeline': 'mpreprocessing',
+    'ParallelBackend': 'mparallel',
+    'Profiler': 'mprofile',
+    'ScoringServer': 'mserver',
+}
+
+__all__ = list(_SUBMODULES) + list(_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    module = _ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'{__name__}.{module}'), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,391 @@
+from __future__ import annotations
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, List, Dict, Any
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import time
+from my_project.mdata_reader import DataFrame
+
+try:
+    import fcntl
+
+    def _lock(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:
+    import msvcrt
+
+    def _lock(f) -> None:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK ждёт около 10 секунд и сдаётся, ожидание продолжается
+                continue
+
+    def _unlock(f) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# Переменная окружения с каталогом кеша по умолчанию
+CACHE_DIR_ENV = 'MY_PROJECT_CACHE_DIR'
+
+_default_cache = None
+
+
+def _file_hash(path: str) -> str:
+    '''
+    Хеш содержимого файла (blake2b), читается блоками по 1 МиБ
+    ----------
+    '''
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    '''
+    Дисковый кеш разобранных txt файлов в двоичном формате DataFrame.save
+    ----------
+
+    Запись в кеше определяется хешем содержимого файла вместе с аргументами
+    sep и header и помнит все пути, по которым её находили, с их временем
+    изменения. Повторное чтение неизменённого файла загружает таблицу через
+    DataFrame.load без разбора. При превышении max_bytes вытесняются записи,
+    которые дольше всего не использовались (LRU)
+
+    Индекс читается и изменяется под блокировкой файла index.lock, поэтому
+    кеш можно использовать из нескольких процессов одновременно. Файлы
+    записей, которых нет в индексе (например, после аварийного завершения
+    процесса), удаляются при следующей записи в кеш
+
+    Параметры
+    ----------
+    directory: str | None
+        Каталог кеша, по умолчанию $MY_PROJECT_CACHE_DIR или ~/.cache/my_project
+    max_bytes: int
+        Наибольший суммарный размер файлов кеша в байтах
+    verify: bool
+        Проверять хеш содержимого при каждом обращении; при False совпадения
+        пути, размера и времени изменения достаточно
+
+    Атрибуты
+    ----------
+    hits: int
+        Количество обращений, обслуженных из кеша
+    misses: int
+        Количество обращений, потребовавших разбора файла
+    '''
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 1 << 30, verify: bool = True):
+        if max_bytes <= 0:
+            raise ValueError('max_bytes должен быть положительным')
+        if directory is None:
+            directory = os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.expanduser('~'), '.cache', 'my_project')
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.verify = verify
+        self.hits = 0
+        self.misses = 0
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, 'index.json')
+
+    @contextmanager
+    def _locked(self):
+        '''
+        Монопольная блокировка каталога кеша на время чтения и изменения индекса
+        ----------
+        '''
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, 'index.lock'), 'a+b') as f:
+            _lock(f)
+            try:
+                yield
+            finally:
+                _unlock(f)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        '''
+        Чтение индекса записей кеша, повреждённый индекс считается пустым
+        ----------
+
+        Записи старого формата с одним путём 'path' переводятся в словарь
+        'paths': путь -> время изменения
+        '''
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        for entry in index.values():
+            if 'paths' not in entry:
+                entry['paths'] = {entry.pop('path'): entry.pop('mtime_ns')}
+        return index
+
+    def _save_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        '''
+        Атомарная запись индекса через временный файл
+        ----------
+        '''
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self._index_path() + f'.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp, self._index_path())
+
+    def _remove(self, index: Dict[str, Dict[str, Any]], name: str) -> None:
+        index.pop(name, None)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+    def _remove_orphans(self, index: Dict[str, Dict[str, Any]]) -> None:
+        '''
+        Удаление файлов записей и временных файлов, которых нет в индексе
+        ----------
+
+        Вызывается под блокировкой: все записи в каталог идут под ней, поэтому
+        такие файлы остались от процессов, завершившихся до обновления индекса
+        '''
+        for name in os.listdir(self.directory):
+            if name not in index and (name.endswith('.mdf') or name.endswith('.tmp')):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def source(self, path: str) -> Dict[str, Any]:
+        '''
+        Размер и время изменения файла для get и put
+        ----------
+
+        Снимается до разбора файла и передаётся в get и put, поэтому таблица
+        сохраняется под хешем того содержимого, которое было до разбора: если
+        файл изменится во время разбора, запись просто не совпадёт с ним при
+        следующем чтении. Хеш содержимого ('hash') вычисляется при первой
+        необходимости и запоминается здесь же
+
+        Параметры
+        ----------
+        path: str
+            Путь к txt файлу
+        '''
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        return {'path': path, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': None}
+
+    @staticmethod
+    def _hash(source: Dict[str, Any]) -> str:
+        if source['hash'] is None:
+            source['hash'] = _file_hash(source['path'])
+        return source['hash']
+
+    def _lookup(self, index: Dict[str, Dict[str, Any]], source: Dict[str, Any], sep: str, header: bool) -> Optional[str]:
+        '''
+        Поиск записи для файла: сначала по пути, размеру и времени изменения,
+        затем (или при verify всегда) по хешу содержимого
+        ----------
+
+        Путь, найденный только по хешу, записывается в запись, чтобы его можно
+        было найти быстрым путём и удалить через invalidate
+        '''
+        path, size = source['path'], source['size']
+        candidates = [name for name, entry in index.items() if entry['sep'] == sep and entry['header'] == header]
+        for name in candidates:
+            entry = index[name]
+            if entry['paths'].get(path) == source['mtime_ns'] and entry['size'] == size:
+                if not self.verify or entry['hash'] == self._hash(source):
+                    return name
+                break
+        content_hash = self._hash(source)
+        for name in candidates:
+            entry = index[name]
+            if entry['hash'] == content_hash and entry['size'] == size:
+                entry['paths'][path] = source['mtime_ns']
+                return name
+        return None
+
+    def _forget(self, index: Dict[str, Dict[str, Any]], path: str) -> int:
+        '''
+        Удаление записей, по которым находили путь path
+        ----------
+
+        Запись удаляется целиком, даже если её находили и по другим путям:
+        иначе другой путь с тем же содержимым снова нашёл бы её по хешу
+
+        Возвращает
+        ----------
+        int
+            Количество удалённых записей
+        '''
+        names = [name for name, entry in index.items() if path in entry['paths']]
+        for name in names:
+            self._remove(index, name)
+        return len(names)
+
+    def get(self, path: str, sep: str, header: bool, source: Optional[Dict[str, Any]] = None) -> Optional[DataFrame]:
+        '''
+        Таблица из кеша для неизменённого файла
+        ----------
+
+        Повреждённый файл записи удаляется вместе с записью, и обращение
+        считается промахом
+
+        Параметры
+        ----------
+        path: str
+            Путь к txt файлу
+        sep: str
+            Разделитель, с которым файл был разобран
+        header: bool
+            Наличие заголовков
+        source: dict | None
+            Результат source(path), по умолчанию снимается здесь
+
+        Возвращает
+        ----------
+        DataFrame | None
+            Таблица, отображённая в память, или None, если записи нет
+        '''
+        if source is None:
+            source = self.source(path)
+        with self._locked():
+            index = self._load_index()
+            name = self._lookup(index, source, sep, header)
+            frame = None
+            if name is not None:
+                try:
+                    frame = DataFrame.load(os.path.join(self.directory, name), mmap=True)
+                except (OSError, ValueError):
+                    self._remove(index, name)
+                    self._save_index(index)
+            if frame is None:
+                self.misses += 1
+                return None
+            index[name]['last_used'] = time.time()
+            self._save_index(index)
+        frame.skipped_rows = index[name]['skipped_rows']
+        self.hits += 1
+        return frame
+
+    def put(self, path: str, sep: str, header: bool, frame: DataFrame, source: Optional[Dict[str, Any]] = None) -> None:
+        '''
+        Сохранение разобранной таблицы в кеш
+        ----------
+
+        Устаревшие записи того же файла и файлы, которых нет в индексе,
+        удаляются, затем вытесняются наименее давно использованные записи,
+        пока размер кеша не станет меньше max_bytes
+
+        Параметры
+        ----------
+        path: str
+            Путь к txt файлу
+        sep: str
+            Разделитель, с которым файл был разобран
+        header: bool
+            Наличие заголовков
+        frame: DataFrame
+            Результат разбора
+        source: dict | None
+            Результат source(path), снятый до разбора; по умолчанию снимается здесь
+        '''
+        if source is None:
+            source = self.source(path)
+        path = source['path']
+        content_hash = self._hash(source)
+        name = hashlib.blake2b(f'{content_hash}|{sep}|{header}'.encode('utf-8'), digest_size=16).hexdigest() + '.mdf'
+        with self._locked():
+            index = self._load_index()
+            self._remove_orphans(index)
+            tmp = os.path.join(self.directory, name + f'.{os.getpid()}.tmp')
+            frame.save(tmp)
+            os.replace(tmp, os.path.join(self.directory, name))
+
+            # путь больше не указывает на старое содержимое; запись без путей удаляется
+            for key, entry in list(index.items()):
+                if key != name and entry['sep'] == sep and entry['header'] == header \
+                        and entry['paths'].pop(path, None) is not None and not entry['paths']:
+                    self._remove(index, key)
+            paths = index[name]['paths'] if name in index else {}
+            paths[path] = source['mtime_ns']
+            index[name] = {
+                'paths': paths, 'size': source['size'], 'hash': content_hash,
+                'sep': sep, 'header': header, 'bytes': os.path.getsize(os.path.join(self.directory, name)),
+                'skipped_rows': list(frame.skipped_rows), 'last_used': time.time(),
+            }
+            total = sum(entry['bytes'] for entry in index.values())
+            for key in sorted(index, key=lambda key: index[key]['last_used']):
+                if total <= self.max_bytes:
+                    break
+                total -= index[key]['bytes']
+                self._remove(index, key)
+            self._save_index(index)
+
+    def invalidate(self, path: str) -> int:
+        '''
+        Удаление всех записей кеша для файла
+        ----------
+
+        Удаляются записи, которые находили по этому пути, в том числе общие с
+        другими файлами того же содержимого
+
+        Параметры
+        ----------
+        path: str
+            Путь к txt файлу
+
+        Возвращает
+        ----------
+        int
+            Количество удалённых записей
+        '''
+        path = os.path.abspath(path)
+        with self._locked():
+            index = self._load_index()
+            removed = self._forget(index, path)
+            self._save_index(index)
+        return removed
+
+    def clear(self) -> None:
+        '''
+        Удаление всех записей кеша
+        ----------
+        '''
+        with self._locked():
+            index = self._load_index()
+            for name in list(index):
+                self._remove(index, name)
+            self._remove_orphans(index)
+            self._save_index(index)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        '''
+        Описание записей кеша от недавно использованных к давно использованным
+        ----------
+        '''
+        with self._locked():
+            index = self._load_index()
+        return sorted(index.values(), key=lambda entry: entry['last_used'], reverse=True)
+
+
+def default_cache() -> ParseCache:
+    '''
+    Общий кеш с настройками по умолчанию, который использует read_data(cache=True)
+    ----------
+    '''
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
@@ -1,13 +1,28 @@
 from __future__ import annotations
-from typing import Optional, List, Union, Tuple, Any, Self
-from my_project.mmath import Matrix
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, List, Union, Tuple, Any, Self, Iterator, Iterable, Sequence
+from array import array
+from itertools import repeat
+import mmap as mmap_module
+import os
+import struct
+import sys
+import warnings
+from my_project.mmath import Matrix, ArrayMatrix
 
 
-class DataFrame(Matrix):
+class DataFrame(ArrayMatrix):
     '''
     Класс реализующий хранение числовых данных в "таблице"
     ----------
     
+    Значения хранятся в буфере ArrayMatrix по столбцам (каждый столбец лежит
+    в буфере подряд), а заголовки дополнительно хранятся в словаре
+    заголовок -> номер столбца. Поэтому столбец по заголовку находится за O(1)
+    и возвращается представлением без копирования, а выборка нескольких
+    столбцов не содержит циклов по строкам
+    
     Параметры
     ----------
     data: list[list[int | float]]
@@ -17,22 +32,41 @@ class DataFrame(Matrix):
     
     Атрибуты
     ----------
-    values: list[list[int | float]]
-        Значения таблицы
+    values: list[memoryview]
+        Значения таблицы (только для чтения)
     size: tuple(int, int)
         Размер таблицы (кроме заголовков)
     labels: list[str]
         Заголовки таблицы
+    skipped_rows: list[int]
+        Номера строк файла, пропущенных при чтении из-за ошибок разбора
     '''
+    __slots__ = ('_labels', '_index', 'skipped_rows')
     
     def __init__(self, data: List[List[int | float]], labels: List[str] = None):
         self.labels = labels if labels else False
+        self.skipped_rows = []
         super().__init__(data)
+        rows, cols = self.size
+        self._set_buffer(_columns(self._data, rows, cols), self.size, strides=(1, rows))
+    
+    @property
+    def labels(self) -> Union[List[str], bool]:
+        return self._labels
+    
+    @labels.setter
+    def labels(self, labels: Union[List[str], bool]) -> None:
+        self._labels = labels
+        # при повторяющихся заголовках, как и list.index, берётся первый столбец
+        index = {}
+        for j, label in enumerate(labels or ()):
+            index.setdefault(label, j)
+        self._index = index
             
     def __repr__(self):
         res = ''
         max_len = max(map(len, self.labels)) if self.labels else 8
-        sep_line = '-' * ((max_len + 3) * len(self.values[0])) + '-\n'
+        sep_line = '-' * ((max_len + 3) * self.size[1]) + '-\n'
         if self.labels:
             res += sep_line
             for name in self.labels:
@@ -40,8 +74,8 @@ class DataFrame(Matrix):
             res += '|\n' + sep_line
         else:
             res += sep_line
-        for i in range(min(5, len(self.values))):
-            line_data = self.values[i]
+        for i in range(min(5, self.size[0])):
+            line_data = self._row(i)
             for number in line_data:
                 res += f'| {str(number):^{max_len}} '
             res += '|\n'
@@ -64,63 +98,532 @@ class DataFrame(Matrix):
         Возвращает
         ----------
         Matrix
-            Новый экземпляр матрицы с данными из одного или нескольких столбцов
+            Представление с данными из одного или нескольких столбцов, разделяющее
+            буфер с таблицей, или новая матрица в случае списка заголовков
         '''
         if not isinstance(idx, (int, slice, str, list)):
             raise ValueError('Индексы могут быть только числами, срезами или строками в случае с наличием заголовков')
-        res = []
-        if isinstance(idx, int):
-            for i in range(len(self.values)):
-                res.append([self.values[i][idx]])
-        elif isinstance(idx, slice):
-            for i in range(len(self.values)):
-                res.append(self.values[i][idx])
-        else:
-            if not self.labels:
-                raise ValueError('Заголовки отсутствуют')
-            if isinstance(idx, str):
-                idx = int(self.labels.index(idx))
-                for i in range(len(self.values)):
-                    res.append([self.values[i][idx]])
-            else:
-                for label in idx:
-                    current_idx = self.labels.index(label)
-                    if not res:
-                        current_res = []
-                        for i in range(len(self.values)):
-                            current_res.append([self.values[i][current_idx]])
-                        res = Matrix(current_res)
-                    else:
-                        current_res = []
-                        for i in range(len(self.values)):
-                            current_res.append(self.values[i][current_idx])
-                        res.addcol(current_res)
-                return res
-                
+        if isinstance(idx, (int, slice)):
+            return super().__getitem__((slice(None), idx))
+        if not self.labels:
+            raise ValueError('Заголовки отсутствуют')
+        if isinstance(idx, str):
+            return super().__getitem__((slice(None), self._label_index(idx)))
+        if not idx:
+            raise ValueError('список заголовков пуст')
+        indices = [self._label_index(label) for label in idx]
+        # столбцы с постоянным шагом (например, все признаки кроме последнего
+        # столбца) выбираются представлением без копирования
+        step = indices[1] - indices[0] if len(indices) > 1 else 1
+        if step > 0 and all(b - a == step for a, b in zip(indices, indices[1:])):
+            return super().__getitem__((slice(None), slice(indices[0], indices[-1] + 1, step)))
+        # иначе столбцы собираются за один проход в общий буфер по столбцам
+        res = array('d')
+        for j in indices:
+            res.extend(self._col(j))
+        return ArrayMatrix._from_buffer(res, (self.size[0], len(idx)), strides=(1, self.size[0]))
+    
+    def _label_index(self, label: str) -> int:
+        try:
+            return self._index[label]
+        except (KeyError, TypeError):
+            raise ValueError(f'нет столбца с заголовком {label!r}') from None
+    
+    def addcol(self, other: Union[List, Tuple], label: Optional[str] = None) -> Self:
+        '''
+        Добавление столбца в конец таблицы
+        ----------
+        
+        Параметры
+        ----------
+        other: list | tuple
+            Значения нового столбца
+        label: str | None
+            Заголовок нового столбца, обязателен для таблицы с заголовками
+            
+        Возвращает
+        ----------
+        self
+        '''
+        if self.labels and label is None:
+            raise ValueError('для таблицы с заголовками нужен заголовок нового столбца')
+        super().addcol(other)
+        if self.labels:
+            # список заголовков может быть общим с другими частями того же файла
+            self.labels = [*self.labels, label]
+        return self
+    
+    def save(self, path) -> None:
+        '''
+        Сохранение таблицы в двоичный столбцовый файл
+        ----------
+        
+        Формат: заголовок _HEADER (сигнатура, версия, флаги, число строк и столбцов,
+        длина заголовков в байтах), заголовки в utf-8 через перевод строки,
+        выравнивание до 8 байт и затем столбцы подряд как float64 little-endian.
+        Заголовки с переводом строки сохранить нельзя
+        
+        Параметры
+        ----------
+        path: str
+            Путь к файлу
+        '''
+        rows, cols = self.size
+        if self.labels and any('\n' in label or '\r' in label for label in self.labels):
+            raise ValueError('заголовки не должны содержать перевод строки')
+        labels = '\n'.join(self.labels).encode('utf-8') if self.labels else b''
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, _HAS_LABELS if self.labels else 0, rows, cols, len(labels)))
+            f.write(labels)
+            f.write(b'\0' * (-(_HEADER.size + len(labels)) % 8))
+            for j in range(cols):
+                column = array('d', self._col(j))
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                f.write(column.tobytes())
+    
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> DataFrame:
+        '''
+        Загрузка таблицы из двоичного столбцового файла, созданного save()
+        ----------
+        
+        При mmap=True файл отображается в память и столбцы читаются прямо из него
+        без разбора и копирования. Такая таблица доступна только для чтения:
+        при первой записи её данные копируются в память (copy-on-write)
         
-        return Matrix(res)
+        Параметры
+        ----------
+        path: str
+            Путь к файлу
+        mmap: bool
+            Отображать файл в память вместо чтения целиком
+        '''
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size or header[:len(_MAGIC)] != _MAGIC:
+                raise ValueError('файл не является сохранённой таблицей')
+            magic, version, flags, rows, cols, labels_len = _HEADER.unpack(header)
+            if version != _VERSION:
+                raise ValueError(f'неподдерживаемая версия формата: {version}')
+            if flags & ~_HAS_LABELS:
+                raise ValueError(f'неизвестные флаги формата: {flags:#x}')
+            offset = _HEADER.size + labels_len + (-(_HEADER.size + labels_len) % 8)
+            # обрезанный файл обнаруживается до разбора заголовков и отображения в память
+            if os.fstat(f.fileno()).st_size < offset + rows * cols * 8:
+                raise ValueError('файл таблицы повреждён')
+            labels = f.read(labels_len).decode('utf-8').split('\n') if flags & _HAS_LABELS else None
+            if labels is not None and len(labels) != cols:
+                raise ValueError('файл таблицы повреждён')
+            if mmap and sys.byteorder == 'little':
+                mapped = mmap_module.mmap(f.fileno(), 0, access=mmap_module.ACCESS_READ)
+                data = memoryview(mapped)[offset:offset + rows * cols * 8].cast('d')
+            else:
+                f.seek(offset)
+                data = array('d')
+                data.frombytes(f.read(rows * cols * 8))
+                if sys.byteorder != 'little':
+                    data.byteswap()
+        if len(data) != rows * cols:
+            raise ValueError('файл таблицы повреждён')
+        frame = cls._from_buffer(data, (rows, cols), strides=(1, rows), shared=isinstance(data, memoryview))
+        frame.labels = labels if labels else False
+        frame.skipped_rows = []
+        return frame
             
 
-def read_data(data, sep: str = ' ', header = True) -> DataFrame:
+
+class DataFrameBuilder:
+    '''
+    Построение таблицы из строк, поступающих по одной (например, из потока)
+    ----------
+    
+    Строки дописываются в конец одного буфера array('d'), который растёт с
+    запасом, поэтому добавление строки стоит амортизированно O(d), а таблица
+    не пересобирается. snapshot() возвращает таблицу над уже накопленными
+    строками без копирования: она разделяет буфер со сборщиком (copy-on-write)
+    и не меняется при добавлении следующих строк
+    
+        builder = DataFrameBuilder(['x1', 'x2', 'y'])
+        for row in feed:
+            builder.append(row)
+            if len(builder) % 1000 == 0:
+                frame = builder.snapshot()
+                model.fit(frame[['x1', 'x2']], frame['y'])
+    
+    Параметры
+    ----------
+    labels: list[str] | None
+        Заголовки столбцов
+    n_cols: int | None
+        Количество столбцов для таблицы без заголовков, по умолчанию по первой строке
+    '''
+    def __init__(self, labels: Optional[List[str]] = None, n_cols: Optional[int] = None):
+        if labels and n_cols is not None and n_cols != len(labels):
+            raise ValueError('количество заголовков не совпадает с n_cols')
+        self.labels = list(labels) if labels else None
+        self.n_cols = len(labels) if labels else n_cols
+        self.n_rows = 0
+        self._data = array('d')
+    
+    def __len__(self) -> int:
+        return self.n_rows
+    
+    def append(self, row: Sequence[float]) -> DataFrameBuilder:
+        '''
+        Добавление одной строки
+        ----------
+        
+        Параметры
+        ----------
+        row: Sequence[float]
+            Значения строки (list, tuple, array или memoryview)
+        '''
+        values = array('d', row)
+        if self.n_cols is None:
+            if not values:
+                raise ValueError('строка не должна быть пустой')
+            self.n_cols = len(values)
+        elif len(values) != self.n_cols:
+            raise ValueError('количество значений в строке не совпадает с количеством столбцов')
+        try:
+            self._data.extend(values)
+        except BufferError:
+            # на буфер есть memoryview из снимка (values, столбцы для обучения):
+            # снимки остаются на старом буфере, а сборщик продолжает в копии
+            self._data = array('d', self._data)
+            self._data.extend(values)
+        self.n_rows += 1
+        return self
+    
+    def extend(self, rows: Iterable[Sequence[float]]) -> DataFrameBuilder:
+        '''
+        Добавление нескольких строк
+        ----------
+        '''
+        for row in rows:
+            self.append(row)
+        return self
+    
+    def snapshot(self) -> DataFrame:
+        '''
+        Таблица из накопленных строк без копирования данных
+        ----------
+        
+        В отличие от остальных DataFrame, такая таблица хранится по строкам -
+        в раскладке буфера сборщика, иначе её пришлось бы копировать. Выборка
+        столбцов из неё работает так же, но столбцы читаются с шагом
+        
+        Возвращает
+        ----------
+        DataFrame
+            Таблица, разделяющая буфер со сборщиком; запись в неё копирует буфер
+        '''
+        if not self.n_rows:
+            raise ValueError('в таблице ещё нет строк')
+        frame = DataFrame._from_buffer(self._data, (self.n_rows, self.n_cols), shared=True)
+        frame.labels = list(self.labels) if self.labels else False
+        frame.skipped_rows = []
+        return frame
+
+# Заголовок двоичного файла таблицы: сигнатура, версия, флаги, строки, столбцы, длина заголовков
+_HEADER = struct.Struct('<4sHHQQQ')
+_MAGIC = b'MYDF'
+_VERSION = 1
+_HAS_LABELS = 1
+
+# Размер блока текста, который быстрый разбор обрабатывает за раз
+_BLOCK_SIZE = 1 << 18
+
+# Количество значений в блоке построчного разбора, который раскладывается по
+# столбцам, и наименьшее количество строк в нём (для очень широких таблиц)
+_BLOCK_VALUES = 1 << 12
+_BLOCK_MIN_ROWS = 16
+
+# Символы, при наличии которых json может принять поле, не являющееся числом для float()
+_NOT_NUMERIC = '"[{tl'
+
+
+def _columns(data: array, rows: int, cols: int) -> array:
+    '''
+    Перекладка построчного буфера rows x cols в буфер по столбцам
+    ----------
+    '''
+    if rows < 2 or cols < 2:
+        return data
+    columns = array('d')
+    for j in range(cols):
+        columns.extend(data[j::cols])
+    return columns
+
+
+def _scatter(block: array, columns: List[array], cols: int) -> None:
+    '''
+    Раскладка построчного блока разбора по массивам столбцов
+    ----------
+    
+    Каждый столбец блока берётся одним срезом с шагом, без циклов по строкам
+    '''
+    if not columns:
+        columns.extend(array('d') for _ in range(cols))
+    for j, column in enumerate(columns):
+        column.extend(block[j::cols])
+
+
+def _frame(columns: List[array], size: Tuple[int, int], labels: Optional[List[str]], skipped: Optional[List[int]] = None) -> DataFrame:
+    '''
+    Создание таблицы из массивов столбцов, собранных при разборе
+    ----------
+    
+    Столбцы дописываются в конец первого из них и сразу освобождаются, поэтому
+    кроме самих данных в памяти одновременно находится не больше одного столбца
+    '''
+    data = columns[0]
+    for j in range(1, len(columns)):
+        data.extend(columns[j])
+        columns[j] = None
+    frame = DataFrame._from_buffer(data, size, strides=(1, size[0]))
+    frame.labels = labels if labels else False
+    frame.skipped_rows = skipped if skipped else []
+    return frame
+
+
+def _parse_rows(lines, sep: str, data: array, n_cols: Optional[int], limit: Optional[int] = None,
+                skipped: Optional[List[int]] = None) -> Tuple[int, Optional[int]]:
+    '''
+    Построчный разбор файла с дописыванием значений в буфер
+    ----------
+    
+    Пустые строки пропускаются, номера строк, которые не удалось разобрать как
+    числа или в которых другое количество столбцов, записываются в skipped
+    
+    Параметры
+    ----------
+    lines: Iterable[tuple(int, str)]
+        Пары из номера строки в файле и самой строки
+    sep: str
+        Разделитель между данными
+    data: array
+        Буфер, в конец которого дописываются значения
+    n_cols: int | None
+        Ожидаемое количество столбцов, None - по первой разобранной строке
+    limit: int | None
+        Наибольшее количество строк для разбора
+    skipped: list[int] | None
+        Список для номеров пропущенных строк
+        
+    Возвращает
+    ----------
+    tuple(int, int | None)
+        Количество разобранных строк и количество столбцов
+    '''
+    rows = 0
+    for line_no, line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            values = [float(x) for x in line.split(sep)]
+        except ValueError:
+            values = None
+        if values is None or n_cols is not None and len(values) != n_cols:
+            if skipped is not None:
+                skipped.append(line_no)
+            continue
+        n_cols = len(values)
+        data.extend(values)
+        rows += 1
+        if rows == limit:
+            break
+    return rows, n_cols
+
+
+def _parse_columns(lines, sep: str, columns: List[array], n_cols: Optional[int], limit: Optional[int] = None,
+                   skipped: Optional[List[int]] = None) -> Tuple[int, Optional[int]]:
+    '''
+    Построчный разбор в массивы столбцов блоками по _BLOCK_VALUES значений
+    ----------
+    
+    Построчно разбирается только очередной блок, поэтому дополнительная память
+    при разборе не превышает одного блока. Параметры и результат как у _parse_rows
+    '''
+    rows = 0
+    while limit is None or rows < limit:
+        step = max(_BLOCK_MIN_ROWS, _BLOCK_VALUES // n_cols) if n_cols else _BLOCK_MIN_ROWS
+        if limit is not None:
+            step = min(step, limit - rows)
+        block = array('d')
+        block_rows, n_cols = _parse_rows(lines, sep, block, n_cols, step, skipped)
+        if not block_rows:
+            break
+        _scatter(block, columns, n_cols)
+        rows += block_rows
+        if block_rows < step:
+            break
+    return rows, n_cols
+
+
+def _parse_block(text: str, sep: str, data: array, n_cols: Optional[int], first_line: int, skipped: List[int]) -> Tuple[int, Optional[int]]:
+    '''
+    Разбор блока целых строк целиком
+    ----------
+    
+    Если во всех строках блока одинаковое правильное количество разделителей,
+    все поля разбираются за один вызов json.loads (или map(float, ...), если json
+    не принимает формат чисел) прямо в буфер. Иначе блок разбирается построчно,
+    чтобы найти и записать некорректные строки
+    '''
+    import json
+    lines = text.split('\n')
+    if n_cols is not None and set(map(str.count, lines, repeat(sep))) == {n_cols - 1}:
+        if (sep == ',' or ',' not in text) and not any(c in text for c in _NOT_NUMERIC):
+            try:
+                data.extend(array('d', json.loads('[' + text.replace('\n', ',').replace(sep, ',') + ']')))
+                return len(lines), n_cols
+            except (ValueError, TypeError, OverflowError):
+                pass
+        try:
+            data.extend(array('d', map(float, text.replace('\n', sep).split(sep))))
+            return len(lines), n_cols
+        except ValueError:
+            pass
+    return _parse_rows(enumerate(lines, first_line), sep, data, n_cols, skipped=skipped)
+
+
+def _parse_bulk(f, sep: str, columns: List[array], n_cols: Optional[int], first_line: int, skipped: List[int]) -> Tuple[int, Optional[int]]:
+    '''
+    Разбор файла блоками по _BLOCK_SIZE символов в массивы столбцов
+    ----------
+    
+    Блок обрезается по последнему переводу строки, остаток переносится в следующий блок.
+    Значения блока разбираются построчно в отдельный буфер и сразу раскладываются по столбцам
+    
+    Возвращает
+    ----------
+    tuple(int, int | None)
+        Количество разобранных строк и количество столбцов
+    '''
+    rows = 0
+    tail = ''
+    line_no = first_line
+    while True:
+        chunk = f.read(_BLOCK_SIZE)
+        text = tail + chunk
+        if chunk:
+            cut = text.rfind('\n')
+            if cut < 0:
+                tail = text
+                continue
+            text, tail = text[:cut], text[cut + 1:]
+        elif not text:
+            break
+        block = array('d')
+        block_rows, n_cols = _parse_block(text, sep, block, n_cols, line_no, skipped)
+        if block_rows:
+            _scatter(block, columns, n_cols)
+        rows += block_rows
+        line_no += text.count('\n') + 1
+        if not chunk:
+            break
+    return rows, n_cols
+
+
+def _report_skipped(path, skipped: List[int]) -> None:
+    '''
+    Предупреждение о пропущенных при чтении строках
+    ----------
+    '''
+    if skipped:
+        shown = ', '.join(map(str, skipped[:10])) + (', ...' if len(skipped) > 10 else '')
+        warnings.warn(f'{path}: пропущено некорректных строк: {len(skipped)} (строки {shown})')
+
+
+def read_data(data, sep: str = ' ', header = True, bulk: bool = True, cache = False) -> DataFrame:
     '''
     Чтение данных из txt файла
     ----------
     
+    Значения разбираются блоками и раскладываются по столбцам таблицы, без
+    промежуточного списка строк и без второй копии всех данных. Строки,
+    которые не удалось разобрать, пропускаются с предупреждением, их
+    номера сохраняются в skipped_rows
+    
     Параметры
     ----------
     sep: str
         Разделитель между данными
     header: bool
         Наличие или отсутствие заголовков
+    bulk: bool
+        Разбирать файл крупными блоками (быстрее) или построчно
+    cache: bool | mcache.ParseCache
+        Кеш разобранных файлов: True - общий кеш mcache.default_cache(), False - без кеша.
+        Повторное чтение неизменённого файла загружает таблицу из кеша без разбора
     '''
+    if cache:
+        from my_project import mcache
+        cache = mcache.default_cache() if cache is True else cache
+        source = cache.source(data)
+        frame = cache.get(data, sep, header, source)
+        if frame is not None:
+            _report_skipped(data, frame.skipped_rows)
+            return frame
+        frame = read_data(data, sep, header, bulk)
+        cache.put(data, sep, header, frame, source)
+        return frame
+    
+    skipped = []
     with open(data, 'r') as f:
-        if header:
-            labels = [x for x in f.readline().strip().split(sep)]
-        res = []
-        for line in f:
-            try:
-                res.append([float(x) for x in line.strip().split(sep)])
-            except:
-                continue
-        return DataFrame(res, labels) if header else DataFrame(res)
-    
\ No newline at end of file
+        labels = [x for x in f.readline().strip().split(sep)] if header else None
+        columns = []
+        cols = len(labels) if labels else None
+        first_line = 2 if header else 1
+        if bulk:
+            rows, cols = _parse_bulk(f, sep, columns, cols, first_line, skipped)
+        else:
+            rows, cols = _parse_columns(enumerate(f, first_line), sep, columns, cols, skipped=skipped)
+    _report_skipped(data, skipped)
+    if not rows:
+        raise ValueError('values должно быть матрицей')
+    return _frame(columns, (rows, cols), labels, skipped)
+
+
+def iter_chunks(path, sep: str = ' ', header: bool = True, chunk_rows: int = 100000) -> Iterator[DataFrame]:
+    '''
+    Чтение txt файла частями по chunk_rows строк
+    ----------
+    
+    В памяти одновременно находится только одна часть, поэтому так можно
+    обрабатывать файлы больше доступной памяти. Номера пропущенных строк
+    каждой части сохраняются в её skipped_rows
+    
+    Параметры
+    ----------
+    path: str
+        Путь к файлу
+    sep: str
+        Разделитель между данными
+    header: bool
+        Наличие или отсутствие заголовков, заголовки передаются каждой части
+    chunk_rows: int
+        Количество строк в одной части (последняя часть может быть короче)
+        
+    Возвращает
+    ----------
+    Iterator[DataFrame]
+        Таблицы с очередными строками файла
+    '''
+    if chunk_rows < 1:
+        raise ValueError('chunk_rows должен быть положительным')
+    with open(path, 'r') as f:
+        labels = [x for x in f.readline().strip().split(sep)] if header else None
+        cols = len(labels) if labels else None
+        lines = enumerate(f, 2 if header else 1)
+        while True:
+            columns = []
+            skipped = []
+            rows, cols = _parse_columns(lines, sep, columns, cols, chunk_rows, skipped)
+            _report_skipped(path, skipped)
+            if not rows:
+                return
+            yield _frame(columns, (rows, cols), labels, skipped)
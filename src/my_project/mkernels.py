@@ -0,0 +1,269 @@
+'''
+Вычислительные ядра для матричных операций
+----------
+
+Функции работают с обычными последовательностями чисел (list, array, memoryview)
+и ничего не знают о классах матриц, поэтому подходят для любого способа хранения.
+Внутренние циклы построены на sum(map(operator.mul, ...)), которые выполняются
+на уровне C без создания промежуточных списков.
+'''
+from __future__ import annotations
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Iterable, Sequence, MutableSequence, Tuple
+from array import array
+from itertools import repeat
+import operator
+
+mul = operator.mul
+add = operator.add
+sub = operator.sub
+
+
+def dot(a: Sequence[float], b: Sequence[float]) -> float:
+    '''
+    Скалярное произведение двух векторов
+    ----------
+
+    Параметры
+    ----------
+    a, b: Sequence[float]
+        Векторы одинаковой длины
+    '''
+    return sum(map(mul, a, b))
+
+
+def matvec(rows: Iterable[Sequence[float]], vec: Sequence[float], out: MutableSequence[float]) -> MutableSequence[float]:
+    '''
+    Произведение матрицы на вектор-столбец: (n x d) @ (d x 1)
+    ----------
+
+    Каждое значение результата - скалярное произведение строки на вектор,
+    поэтому вектор читается подряд и не копируется
+
+    Параметры
+    ----------
+    rows: Iterable[Sequence[float]]
+        Строки матрицы
+    vec: Sequence[float]
+        Вектор длины d
+    out: list | array
+        Последовательность, в конец которой дописывается результат
+
+    Возвращает
+    ----------
+    out
+    '''
+    out.extend([sum(map(mul, row, vec)) for row in rows])
+    return out
+
+
+def affine(rows: Iterable[Sequence[float]], weights: Sequence[float], bias: float,
+           out: MutableSequence[float]) -> MutableSequence[float]:
+    '''
+    Предсказания линейной модели: Xw + b для каждой строки за один проход
+    ----------
+
+    Параметры
+    ----------
+    rows: Iterable[Sequence[float]]
+        Строки матрицы X
+    weights: Sequence[float]
+        Веса модели
+    bias: float
+        Смещение модели
+    out: list | array
+        Последовательность, в конец которой дописываются предсказания
+
+    Возвращает
+    ----------
+    out
+    '''
+    out.extend([sum(map(mul, row, weights), bias) for row in rows])
+    return out
+
+
+def affine_cols(cols: Iterable[Sequence[float]], weights: Sequence[float], bias: float,
+                n: int) -> List[float]:
+    '''
+    Предсказания линейной модели Xw + b по столбцам X
+    ----------
+
+    Для матриц, хранящихся по столбцам: столбцы читаются подряд, а вместо
+    n скалярных произведений выполняется d проходов map на уровне C
+
+    Параметры
+    ----------
+    cols: Iterable[Sequence[float]]
+        Столбцы матрицы X
+    weights: Sequence[float]
+        Веса модели
+    bias: float
+        Смещение модели
+    n: int
+        Количество строк X
+
+    Возвращает
+    ----------
+    list[float]
+    '''
+    out = [bias] * n
+    for col, weight in zip(cols, weights):
+        out = list(map(add, out, map(mul, col, repeat(weight))))
+    return out
+
+
+def matmul(rows: Iterable[Sequence[float]], cols: List[Sequence[float]], out: MutableSequence[float]) -> MutableSequence[float]:
+    '''
+    Произведение матриц через скалярные произведения строк на столбцы
+    ----------
+
+    Столбцы правой матрицы собираются один раз заранее, после чего каждый
+    элемент результата считается одним проходом по двум непрерывным векторам
+
+    Параметры
+    ----------
+    rows: Iterable[Sequence[float]]
+        Строки левой матрицы
+    cols: list[Sequence[float]]
+        Столбцы правой матрицы
+    out: list | array
+        Последовательность, в конец которой построчно дописывается результат
+
+    Возвращает
+    ----------
+    out
+    '''
+    for row in rows:
+        out.extend([sum(map(mul, row, col)) for col in cols])
+    return out
+
+
+def gd_epoch(rows: Iterable[Sequence[float]], cols: List[Sequence[float]], targets: Sequence[float],
+             weights: Sequence[float], bias: float, residuals: MutableSequence[float]) -> Tuple[List[float], float, float]:
+    '''
+    Одна эпоха градиентного спуска для линейной регрессии без промежуточных матриц
+    ----------
+
+    Проход по строкам считает предсказания и остатки y - (Xw + b) прямо в заранее
+    выделенный буфер residuals, после чего градиент по весам считается скалярными
+    произведениями столбцов X на остатки. Новых буферов размера n не создаётся
+
+    Параметры
+    ----------
+    rows: Iterable[Sequence[float]]
+        Строки матрицы X
+    cols: list[Sequence[float]]
+        Столбцы матрицы X, лучше всего представления без копирования
+    targets: Sequence[float]
+        Целевые значения
+    weights: Sequence[float]
+        Текущие веса
+    bias: float
+        Текущее смещение
+    residuals: array | list
+        Буфер длины n для остатков, переиспользуется между эпохами
+
+    Возвращает
+    ----------
+    tuple(list[float], float, float)
+        Суммы остатков, умноженных на каждый из столбцов X (X^T r), сумма остатков
+        и сумма квадратов остатков
+    '''
+    for i, row, target in zip(range(len(residuals)), rows, targets):
+        residuals[i] = target - sum(map(mul, row, weights)) - bias
+    grad = [sum(map(mul, col, residuals)) for col in cols]
+    return grad, sum(residuals), sum(map(mul, residuals, residuals))
+
+
+def gd_epoch_cols(cols: List[Sequence[float]], targets: Sequence[float], weights: Sequence[float], bias: float,
+                  residuals: array) -> Tuple[List[float], float, float]:
+    '''
+    То же, что gd_epoch, для матриц, хранящихся по столбцам
+    ----------
+
+    Предсказания считаются через affine_cols, поэтому X читается только
+    подряд идущими столбцами
+
+    Параметры
+    ----------
+    cols: list[Sequence[float]]
+        Столбцы матрицы X
+    targets: Sequence[float]
+        Целевые значения
+    weights: Sequence[float]
+        Текущие веса
+    bias: float
+        Текущее смещение
+    residuals: array
+        Буфер array('d') длины n для остатков
+
+    Возвращает
+    ----------
+    tuple(list[float], float, float)
+        Как у gd_epoch
+    '''
+    residuals[:] = array('d', map(sub, targets, affine_cols(cols, weights, bias, len(residuals))))
+    grad = [sum(map(mul, col, residuals)) for col in cols]
+    return grad, sum(residuals), sum(map(mul, residuals, residuals))
+
+
+def gram(cols: List[Sequence[float]]) -> List[List[float]]:
+    '''
+    Матрица попарных скалярных произведений столбцов (X^T X)
+    ----------
+
+    Считается только верхний треугольник, нижний заполняется симметрично
+
+    Параметры
+    ----------
+    cols: list[Sequence[float]]
+        Столбцы матрицы X
+
+    Возвращает
+    ----------
+    list[list[float]]
+        Квадратная матрица размера len(cols) x len(cols)
+    '''
+    k = len(cols)
+    result = [[0.0] * k for _ in range(k)]
+    for i in range(k):
+        for j in range(i, k):
+            result[i][j] = result[j][i] = sum(map(mul, cols[i], cols[j]))
+    return result
+
+
+def batch_gradient(rows: Iterable[Sequence[float]], targets: Iterable[float], weights: Sequence[float],
+                   bias: float) -> Tuple[List[float], float, float]:
+    '''
+    Суммы для градиента по подмножеству строк за один проход
+    ----------
+
+    Подходит для мини-батчей: строки передаются итератором по индексам,
+    без сборки отдельной матрицы для батча
+
+    Параметры
+    ----------
+    rows: Iterable[Sequence[float]]
+        Строки батча
+    targets: Iterable[float]
+        Целевые значения для тех же строк
+    weights: Sequence[float]
+        Текущие веса
+    bias: float
+        Текущее смещение
+
+    Возвращает
+    ----------
+    tuple(list[float], float, float)
+        X^T r по строкам батча, сумма остатков и сумма квадратов остатков
+    '''
+    grad = [0.0] * len(weights)
+    errors_sum = 0.0
+    squared_sum = 0.0
+    for row, target in zip(rows, targets):
+        r = target - sum(map(mul, row, weights)) - bias
+        errors_sum += r
+        squared_sum += r * r
+        grad[:] = map(add, grad, map(mul, row, repeat(r)))
+    return grad, errors_sum, squared_sum
@@ -1,6 +1,58 @@
 from __future__ import annotations
-from typing import Optional, List, Union, Tuple, Any, Self
-import my_project.mmath as mm 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, List, Union, Tuple, Any, Self, Iterable, Iterator, Sequence, MutableSequence
+from array import array
+from math import sqrt, isfinite
+from itertools import chain, islice
+import operator
+import struct
+import sys
+import my_project.mmath as mm
+from my_project import mkernels
+
+# Модули, нужные только для обучения, импортируются при первом обращении,
+# чтобы загрузка сохранённой модели для предсказаний не тянула их за собой
+if TYPE_CHECKING:
+    from my_project import moptim
+    from my_project.mstats import RegressionStats
+    from my_project.mpreprocessing import StandardScaler
+
+_SOLVERS = ('gd', 'normal', 'qr')
+
+# Заголовок двоичного файла модели: сигнатура, версия, флаги, количество весов, смещение
+_MODEL_HEADER = struct.Struct('<4sHHQd')
+_MODEL_MAGIC = b'MYLR'
+_MODEL_VERSION = 1
+
+
+def _by_columns(X: mm.Matrix) -> bool:
+    '''
+    Хранится ли матрица по столбцам, как DataFrame: строки из неё читаются с шагом
+    ----------
+    '''
+    return isinstance(X, mm.ArrayMatrix) and X._strides[0] == 1 and X.size[0] > 1
+
+
+def _affine(X: mm.Matrix, coef: Sequence[float], bias: float, out: MutableSequence[float]) -> MutableSequence[float]:
+    '''
+    Предсказания Xw + b в конец out, для матриц по столбцам - через affine_cols
+    ----------
+    '''
+    if _by_columns(X):
+        out.extend(mkernels.affine_cols(X._iter_cols(), coef, bias, X.size[0]))
+        return out
+    return mkernels.affine(X._iter_rows(), coef, bias, out)
+
+
+def _squared_error(X: mm.Matrix, targets: Sequence[float], coef: Sequence[float], bias: float) -> float:
+    '''
+    Сумма квадратов остатков y - (Xw + b)
+    ----------
+    '''
+    residuals = array('d', map(operator.sub, targets, _affine(X, coef, bias, array('d'))))
+    return sum(map(operator.mul, residuals, residuals))
+
 
 class Linear_Regression:
     '''
@@ -13,47 +65,547 @@ class Linear_Regression:
         Скорость обучения между 0 и 1
     n_epochs: int
         Количество эпох
+    solver: str
+        Способ обучения: 'gd' - градиентный спуск на n_epochs эпох, 'normal' - решение
+        нормальных уравнений разложением Холецкого за один проход по данным,
+        'qr' - метод наименьших квадратов через QR-разложение для плохо обусловленных данных
+    batch_size: int | None
+        Размер мини-батча для градиентного спуска, None - полный батч на каждой эпохе
+    shuffle: bool
+        Перемешивать ли порядок строк перед каждой эпохой мини-батчевого спуска
+    optimizer: SGD | Momentum | Adam | None
+        Оптимизатор из moptim, по умолчанию SGD с learning_rate
+    random_state: int | None
+        Зерно генератора для перемешивания
+    standardize: bool
+        Обучать градиентный спуск на стандартизованных признаках. Масштабированная
+        копия X не создаётся: стандартизация учитывается в весах и градиенте,
+        а w_ и b_ после обучения относятся к исходным признакам. На 'normal'
+        и 'qr' не влияет, их решение не зависит от масштаба признаков
+    tol: float | None
+        Ранняя остановка градиентного спуска: обучение прекращается, если
+        относительное улучшение лучшей потери (на валидации, если она задана)
+        меньше tol patience эпох подряд
+    gtol: float | None
+        Ранняя остановка по норме градиента функции потерь
+    patience: int
+        Количество эпох без достаточного улучшения до остановки по tol
         
     Атрибуты
     ----------
-    w_: Matrix
-        Веса после обучения
+    w_: Vector
+        Веса после обучения (вектор-столбец). Предсказания читают его буфер,
+        поэтому изменение w_ на месте или присваивание новых весов сразу
+        учитывается
     b_: Matrix
         Смещение после обучения
     losses_: list[int | float]
-        Значения потерь на каждой из эпох обучения
+        Значения потерь на каждой из эпох обучения (для 'normal' и 'qr' - одно итоговое значение)
+    scaler_: StandardScaler | None
+        Статистики стандартизации, с которыми обучался градиентный спуск
+    val_losses_: list[float]
+        Потери на валидационных данных после каждой эпохи, если они заданы
+    n_epochs_: int
+        Количество выполненных эпох
+    stop_reason_: str
+        Причина окончания обучения: 'n_epochs' - выполнены все эпохи, 'tol' - потеря
+        перестала улучшаться, 'gtol' - градиент стал меньше gtol, 'diverged' - потеря
+        перестала быть конечным числом, 'exact' - точное решение 'normal' или 'qr'
     '''
     
-    def __init__(self, learning_rate: float = 0.01, n_epochs: int = 100):
+    def __init__(self, learning_rate: float = 0.01, n_epochs: int = 100, solver: str = 'gd',
+                 batch_size: Optional[int] = None, shuffle: bool = True,
+                 optimizer: Optional[moptim.SGD] = None, random_state: Optional[int] = None,
+                 standardize: bool = False, tol: Optional[float] = None, gtol: Optional[float] = None,
+                 patience: int = 5):
+        if solver not in _SOLVERS:
+            raise ValueError(f'solver может быть только одним из {_SOLVERS}')
+        if batch_size is not None and batch_size < 1:
+            raise ValueError('batch_size должен быть положительным')
+        if patience < 1:
+            raise ValueError('patience должен быть положительным')
         self.learning_rate = learning_rate
         self.n_epochs = n_epochs
+        self.solver = solver
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.optimizer = optimizer
+        self.random_state = random_state
+        self.standardize = standardize
+        self.tol = tol
+        self.gtol = gtol
+        self.patience = patience
+        self._coef = None
         
     
-    def fit(self, X: mm.Matrix, y: mm.Matrix):
+    def fit(self, X: Union[mm.Matrix, Iterable[mm.Matrix]], y: Union[mm.Matrix, str], features: Optional[List[str]] = None,
+            scaler: Optional[StandardScaler] = None,
+            validation_data: Optional[Tuple[mm.Matrix, mm.Matrix]] = None):
         '''
         Обучение модели
         ----------
         
+        Параметры
+        ----------
+        X: Matrix | Iterable[DataFrame]
+            Матрица содержащая обучающие данные или части таблицы. Повторно
+            итерируемый источник частей (например, список частей или объект, чей
+            __iter__ заново вызывает mdata_reader.iter_chunks) проходится на
+            каждой эпохе, одноразовый итератор - только один раз
+        y: Matrix | str
+            Вектор целевых значений для обучающих данных или, для потока частей,
+            заголовок целевого столбца
+        features: list[str] | None
+            Заголовки признаков для потока частей, по умолчанию все столбцы кроме y
+        scaler: StandardScaler | None
+            Обученный StandardScaler, встраиваемый в градиентный спуск; при
+            standardize=True и scaler=None он обучается на X
+        validation_data: tuple(Matrix, Matrix) | None
+            Валидационные X и y: потеря на них записывается в val_losses_ и
+            используется для ранней остановки по tol
+        '''
+        # времена эпох от прошлого обучения под mprofile.Profiler не относятся к новым losses_
+        self.__dict__.pop('epoch_times_', None)
+        if not isinstance(X, mm.Matrix):
+            return self._fit_stream(X, y, features, validation_data)
+        from my_project.mstats import RegressionStats
+        from my_project.mpreprocessing import StandardScaler
+        
+        n, d = X.size
+        if y.size != (n, 1):
+            raise ValueError('y должен быть столбцом той же длины, что и X')
+        if validation_data is not None:
+            X_val, y_val = validation_data
+            if X_val.size[1] != d or y_val.size != (X_val.size[0], 1):
+                raise ValueError('validation_data должны быть парой X, y с теми же признаками, что и X')
+        self.val_losses_ = []
+        
+        # Столбцы X и целевые значения берутся один раз на всё обучение,
+        # а буфер остатков переиспользуется между эпохами
+        cols = [X._col_view(j) for j in range(d)]
+        targets = y._col_view(0)
+        residuals = array('d', bytes(8 * n))
+        
+        # в параллельном режиме данные один раз копируются в разделяемую память,
+        # а полные эпохи и статистики считаются по блокам строк в нескольких процессах
+        backend = mm._parallel_backend
+        shared = None
+        if backend is not None and backend.accepts(n) and self.solver != 'qr' \
+                and (self.solver == 'normal' or not self.batch_size or self.batch_size >= n):
+            shared = backend.share(X, y)
+        
+        try:
+            if self.solver == 'gd':
+                if scaler is None and self.standardize:
+                    scaler = StandardScaler().fit(X)
+                self._start_gd(d, scaler)
+                kernel = shared.gd_epoch if shared is not None else None
+                self.stop_reason_ = 'n_epochs'
+                progress = [float('inf'), 0]
+                for epoch in range(self.n_epochs):
+                    self._gd_epoch(X, cols, targets, residuals, kernel)
+                    if self._should_stop(validation_data, progress):
+                        break
+                self.n_epochs_ = self._epoch
+                weights, bias = self._raw_params()
+            else:
+                self.scaler_ = self._params = None
+                self.n_epochs_, self.stop_reason_ = 1, 'exact'
+                if self.solver == 'normal':
+                    stats = shared.stats() if shared is not None else RegressionStats.from_columns(cols, targets)
+                    weights, bias = stats.solve()
+                else:
+                    weights, bias = self._fit_qr(cols, targets)
+                if shared is not None:
+                    _, _, squared_sum = shared.gd_epoch(weights, bias)
+                else:
+                    squared_sum = _squared_error(X, targets, weights, bias)
+                self.losses_ = [squared_sum / n]
+                if validation_data is not None:
+                    self.val_losses_.append(self._validation_loss(*validation_data, weights, bias))
+        finally:
+            if shared is not None:
+                shared.close()
+        
+        self._set_weights(weights, bias)
+    
+    def _should_stop(self, validation_data: Optional[Tuple[mm.Matrix, mm.Matrix]], progress: List) -> bool:
+        '''
+        Проверка условий ранней остановки после эпохи градиентного спуска
+        ----------
+        
+        Потеря на валидации, если она задана, дописывается в val_losses_.
+        progress - лучшая потеря и количество эпох без улучшения, обновляются
+        на месте. При остановке записывается stop_reason_
+        '''
+        loss = self.losses_[-1]
+        if validation_data is not None:
+            loss = self._validation_loss(*validation_data, *self._raw_params())
+            self.val_losses_.append(loss)
+        if not isfinite(loss):
+            self.stop_reason_ = 'diverged'
+            return True
+        if self.gtol is not None and self._grad_norm < self.gtol:
+            self.stop_reason_ = 'gtol'
+            return True
+        best, stale = progress
+        if self.tol is not None:
+            stale = stale + 1 if best - loss < self.tol * abs(best) else 0
+            if stale >= self.patience:
+                self.stop_reason_ = 'tol'
+                return True
+        progress[:] = min(best, loss), stale
+        return False
+    
+    def partial_fit(self, X: mm.Matrix, y: mm.Matrix):
+        '''
+        Одна эпоха градиентного спуска по очередной части данных
+        ----------
+        
+        Веса, состояние оптимизатора и losses_ сохраняются между вызовами, поэтому
+        модель можно обучать по частям файла, не загружая его целиком. При
+        standardize=True статистики стандартизации берутся по первой части.
+        Количество признаков всех частей должно совпадать с первой, начать
+        обучение заново можно через fit
+        
         Параметры
         ----------
         X: Matrix
-            Матрица содержащая обучающие данные
+            Очередная часть обучающих данных
         y: Matrix
-            Вектор целевых значений для обучающих данных
+            Вектор целевых значений для этой части
+        '''
+        n, d = X.size
+        if y.size != (n, 1):
+            raise ValueError('y должен быть столбцом той же длины, что и X')
+        self._prepare_gd(X)
+        self._start_epoch()
+        squared_sum = self._gd_update(X, [X._col_view(j) for j in range(d)], y._col_view(0), array('d', bytes(8 * n)))
+        self._end_epoch(squared_sum / n)
+        weights, bias = self._raw_params()
+        self._set_weights(weights, bias)
+    
+    def _prepare_gd(self, X: mm.Matrix) -> None:
+        '''
+        Начало градиентного спуска на первой части данных
+        ----------
+        
+        При standardize=True статистики стандартизации берутся по этой части.
+        Часть с другим количеством признаков не сбрасывает обученную модель:
+        начать обучение заново можно только через fit
+        '''
+        if getattr(self, '_params', None) is None:
+            from my_project.mpreprocessing import StandardScaler
+            self._start_gd(X.size[1], StandardScaler().fit(X) if self.standardize else None)
+        elif len(self._params) != X.size[1] + 1:
+            raise ValueError('количество признаков не совпадает с обученной моделью')
+    
+    def fit_stats(self, stats: RegressionStats):
+        '''
+        Обучение по накопленным достаточным статистикам без обращения к данным
+        ----------
+        
+        Решаются нормальные уравнения, поэтому результат совпадает с solver='normal'
+        для всех данных, учтённых в stats
+        
+        Параметры
+        ----------
+        stats: RegressionStats
+            Статистики, накопленные по частям данных и, возможно, сложенные между ними
+        '''
+        weights, bias = stats.solve()
+        self.__dict__.pop('epoch_times_', None)
+        self.scaler_ = self._params = None
+        self.losses_ = [stats.mse(weights, bias)]
+        self.val_losses_ = []
+        self.n_epochs_, self.stop_reason_ = 1, 'exact'
+        self._set_weights(weights, bias)
+    
+    def _fit_stream(self, chunks: Iterable[mm.Matrix], target: str, features: Optional[List[str]],
+                    validation_data: Optional[Tuple[mm.Matrix, mm.Matrix]] = None):
+        '''
+        Обучение по частям таблицы
+        ----------
+        
+        'normal' за один проход накапливает RegressionStats и решает систему в
+        конце. 'gd' на каждой эпохе обновляет параметры по каждой части, а номер
+        эпохи для расписания скорости обучения и losses_ продвигаются один раз за
+        проход: потеря эпохи взвешивается по строкам частей.
+        Одноразовый итератор можно пройти только один раз, поэтому при
+        n_epochs > 1 выполняется одна эпоха с предупреждением
+        '''
+        if not isinstance(target, str):
+            raise ValueError('для потока частей y должен быть заголовком целевого столбца')
+        if self.solver == 'qr':
+            raise ValueError('обучение по потоку частей поддерживает только solver gd и normal')
+        if self.solver == 'normal':
+            from my_project.mstats import RegressionStats
+            stats = RegressionStats()
+            for chunk in chunks:
+                stats.update(chunk, target, features)
+            if not stats.n:
+                raise ValueError('поток не содержит данных')
+            self.fit_stats(stats)
+            if validation_data is not None:
+                self.val_losses_.append(self._validation_loss(*validation_data, self._weights(), self.b_))
+            return
+        n_epochs = self.n_epochs
+        if iter(chunks) is chunks and n_epochs > 1:
+            import warnings
+            warnings.warn(f'одноразовый итератор частей можно пройти только один раз: '
+                          f'выполняется 1 эпоха вместо n_epochs={n_epochs}', stacklevel=3)
+            n_epochs = 1
+        self._params = None
+        self.val_losses_ = []
+        self.stop_reason_ = 'n_epochs'
+        progress = [float('inf'), 0]
+        for epoch in range(n_epochs):
+            squared_sum, rows = 0.0, 0
+            for chunk in chunks:
+                X = chunk[features if features else [label for label in chunk.labels if label != target]]
+                n, d = X.size
+                self._prepare_gd(X)
+                if not rows:
+                    self._start_epoch()
+                squared_sum += self._gd_update(X, [X._col_view(j) for j in range(d)], chunk[target]._col_view(0),
+                                               array('d', bytes(8 * n)))
+                rows += n
+            if not rows:
+                raise ValueError('поток не содержит данных')
+            self._end_epoch(squared_sum / rows)
+            if self._should_stop(validation_data, progress):
+                break
+        self.n_epochs_ = self._epoch
+        weights, bias = self._raw_params()
+        self._set_weights(weights, bias)
+    
+    def _start_gd(self, d: int, scaler: Optional[StandardScaler] = None) -> None:
         '''
+        Сброс параметров и состояния оптимизатора перед градиентным спуском
+        ----------
         
-        self.w_ = mm.ZeroMatrix(size=(X.size[1], 1))
-        self.b_ = 0.0
+        Параметры _params относятся к стандартизованным признакам, если задан scaler
+        '''
+        import random
+        from my_project import moptim
+        self.scaler_ = scaler
+        self._optimizer = self.optimizer if self.optimizer else moptim.SGD(self.learning_rate)
+        self._optimizer.reset(d + 1)
+        self._params = [0.0] * (d + 1)
+        self._rng = random.Random(self.random_state)
+        self._epoch = 0
         self.losses_ = []
+        self.__dict__.pop('epoch_times_', None)
+    
+    def _gd_epoch(self, X: mm.Matrix, cols: List, targets, residuals: array, kernel: Optional[callable] = None) -> None:
+        '''
+        Одна эпоха градиентного спуска по всем данным X
+        ----------
+        '''
+        self._start_epoch()
+        self._end_epoch(self._gd_update(X, cols, targets, residuals, kernel) / X.size[0])
+    
+    def _start_epoch(self) -> None:
+        '''
+        Начало эпохи: скорость обучения по расписанию для её номера
+        ----------
+        '''
+        self._optimizer.start_epoch(self._epoch)
+    
+    def _end_epoch(self, loss: float) -> None:
+        '''
+        Конец эпохи: потеря за проход по всем данным записывается в losses_
+        ----------
+        '''
+        self._epoch += 1
+        self.losses_.append(loss)
+    
+    def _gd_update(self, X: mm.Matrix, cols: List, targets, residuals: array,
+                   kernel: Optional[callable] = None) -> float:
+        '''
+        Проход градиентного спуска по X, полным батчем или мини-батчами
+        ----------
+        
+        Номер эпохи и losses_ не меняются, поэтому проход может быть частью эпохи
+        по потоку частей. Мини-батчи задаются срезами перестановки индексов строк,
+        строки батча читаются напрямую из X без сборки новой матрицы.
+        kernel(weights, bias) заменяет mkernels.gd_epoch для полного батча
+        (например, SharedDataset.gd_epoch). Возвращает сумму квадратов остатков
+        '''
+        n, d = X.size
+        optimizer = self._optimizer
+        batch_size = self.batch_size if self.batch_size and self.batch_size < n else None
+        if batch_size is None:
+            weights, bias = self._raw_params()
+            if kernel is not None:
+                grad, errors_sum, squared_sum = kernel(weights, bias)
+            elif _by_columns(X):
+                grad, errors_sum, squared_sum = mkernels.gd_epoch_cols(cols, targets, weights, bias, residuals)
+            else:
+                grad, errors_sum, squared_sum = mkernels.gd_epoch(X._iter_rows(), cols, targets, weights, bias, residuals)
+            loss_grad = self._loss_grad(grad, errors_sum, n)
+            self._params = optimizer.step(self._params, loss_grad)
+        else:
+            indices = list(range(n))
+            if self.shuffle:
+                self._rng.shuffle(indices)
+            squared_sum = 0.0
+            for start in range(0, n, batch_size):
+                batch = indices[start:start + batch_size]
+                weights, bias = self._raw_params()
+                grad, errors_sum, batch_squared = mkernels.batch_gradient(
+                    map(X._row, batch), map(targets.__getitem__, batch), weights, bias)
+                loss_grad = self._loss_grad(grad, errors_sum, len(batch))
+                self._params = optimizer.step(self._params, loss_grad)
+                squared_sum += batch_squared
+        # норма градиента последнего шага эпохи, для полного батча - точная
+        self._grad_norm = sqrt(mkernels.dot(loss_grad, loss_grad))
+        return squared_sum
+    
+    @staticmethod
+    def _validation_loss(X: mm.Matrix, y: mm.Matrix, weights: List[float], bias: float) -> float:
+        '''
+        Среднеквадратичная ошибка модели на валидационных данных
+        ----------
+        '''
+        return _squared_error(X, y._col_view(0), weights, bias) / X.size[0]
+    
+    def _raw_params(self) -> Tuple[List[float], float]:
+        '''
+        Веса и смещение для исходных признаков из текущих параметров
+        ----------
+        '''
+        d = len(self._params) - 1
+        if self.scaler_ is None:
+            return self._params[:d], self._params[d]
+        return self.scaler_.unscale(self._params[:d], self._params[d])
+    
+    def _loss_grad(self, grad: List[float], errors_sum: float, n: int) -> List[float]:
+        '''
+        Градиент среднеквадратичной ошибки по весам и смещению из сумм по остаткам
+        ----------
         
-        for epoch in range(self.n_epochs):
-            lr_input = self.activation(X)
-            errors = y - lr_input
-            self.w_ += self.learning_rate * 2.0 * X.T().matmul(errors) / X.size[0]
-            self.b_ += self.learning_rate * 2.0 * errors.mean()
-            loss = (errors**2).mean()
-            self.losses_.append(loss)
+        Ядра считают X^T r по исходным признакам; для стандартизованных признаков
+        z = (x - mean) / std сумма z^T r равна (x^T r - mean * sum(r)) / std
+        '''
+        scale = -2.0 / n
+        if self.scaler_ is not None:
+            grad = [(g - m * errors_sum) / s for g, m, s in zip(grad, self.scaler_.mean_, self.scaler_.scale_)]
+        return [scale * g for g in grad] + [scale * errors_sum]
+    
+    def _fit_qr(self, cols: List, targets) -> Tuple[List[float], float]:
+        '''
+        Метод наименьших квадратов через QR-разложение матрицы [X, 1]
+        ----------
+        '''
+        n, d = len(targets), len(cols)
+        data = array('d')
+        for col in cols:
+            data.extend(col)
+        data.extend([1.0] * n)
+        A = mm.ArrayMatrix._from_buffer(data, (n, d + 1), strides=(1, n))
+        y = mm.ArrayMatrix._from_buffer(array('d', targets), (n, 1))
+        coef = mm.qr_solve(A, y)._col(0)
+        return coef[:d], coef[d]
             
+    def _set_weights(self, weights: List[float], bias: float) -> None:
+        '''
+        Сохранение обученных весов
+        ----------
+        '''
+        self.w_ = mm.Vector(weights)
+        self.b_ = bias
+    
+    @property
+    def w_(self) -> mm.Vector:
+        return self._w
+    
+    @w_.setter
+    def w_(self, weights: Union[mm.Matrix, Sequence[float]]) -> None:
+        if not isinstance(weights, mm.Vector):
+            weights = mm.Vector(weights._flat() if isinstance(weights, mm.Matrix) else weights)
+        self._w = weights
+        self._coef = weights._flat()
+    
+    def _weights(self) -> array:
+        '''
+        Плоский буфер весов w_ для предсказаний
+        ----------
+        
+        Обычно это сам буфер w_, поэтому запись в w_ на месте видна сразу. Если
+        w_ заменил свой буфер (например, скопировал его при записи после
+        создания представления), буфер берётся заново
+        '''
+        coef = self._coef
+        if coef is None:
+            raise ValueError('модель ещё не обучена')
+        if coef is not self._w._data:
+            coef = self._coef = self._w._flat()
+        return coef
+    
+    def __setstate__(self, state: dict) -> None:
+        # модели, сохранённые pickle до появления свойства w_, хранят веса в __dict__
+        weights = state.pop('w_', None)
+        state.setdefault('_coef', None)
+        self.__dict__.update(state)
+        if weights is not None:
+            self.w_ = weights
+    
+    def save(self, path: str) -> None:
+        '''
+        Сохранение обученных весов в компактный двоичный файл
+        ----------
+        
+        Формат: заголовок _MODEL_HEADER (сигнатура, версия, флаги, количество
+        весов, смещение) и затем веса подряд как float64 little-endian. История
+        обучения и гиперпараметры не сохраняются
+        
+        Параметры
+        ----------
+        path: str
+            Путь к файлу
+        '''
+        coef = array('d', self._weights())
+        if sys.byteorder != 'little':
+            coef.byteswap()
+        with open(path, 'wb') as f:
+            f.write(_MODEL_HEADER.pack(_MODEL_MAGIC, _MODEL_VERSION, 0, len(coef), self.b_))
+            f.write(coef.tobytes())
+    
+    @classmethod
+    def load(cls, path: str) -> Linear_Regression:
+        '''
+        Загрузка модели, сохранённой save(), для предсказаний
+        ----------
+        
+        Читаются только заголовок и веса, модули для обучения не импортируются
+        
+        Параметры
+        ----------
+        path: str
+            Путь к файлу
+        '''
+        with open(path, 'rb') as f:
+            header = f.read(_MODEL_HEADER.size)
+            if len(header) != _MODEL_HEADER.size or header[:4] != _MODEL_MAGIC:
+                raise ValueError('файл не является сохранённой моделью')
+            magic, version, flags, n_weights, bias = _MODEL_HEADER.unpack(header)
+            if version != _MODEL_VERSION:
+                raise ValueError(f'неподдерживаемая версия формата: {version}')
+            coef = array('d')
+            coef.frombytes(f.read(n_weights * 8))
+        if len(coef) != n_weights:
+            raise ValueError('файл модели повреждён')
+        if sys.byteorder != 'little':
+            coef.byteswap()
+        model = cls()
+        model._set_weights(coef.tolist(), bias)
+        return model
+    
+    def _check_fitted(self) -> None:
+        if self._coef is None:
+            raise ValueError('модель ещё не обучена')
+    
     def activation(self, X: mm.Matrix) -> mm.Matrix:
         '''
         Вычисление активации от текущего входа
@@ -69,22 +621,97 @@ class Linear_Regression:
         mm.Matrix
             Новый экземпляр мартрицы с выходными значениями
         '''
-        return X.matmul(self.w_) + self.b_
+        coef = self._weights()
+        if X.size[1] != len(coef):
+            raise ValueError('размеры матриц не совпадают')
+        backend = mm._parallel_backend
+        if backend is not None and backend.accepts(X.size[0]):
+            return X.matmul(self.w_) + self.b_
+        return X._new_like(_affine(X, coef, self.b_, X._new_buffer()), (X.size[0], 1))
     
-    def predict(self, X: mm.Matrix) -> mm.Matrix:
+    def predict(self, X: Union[mm.Matrix, List[float]]) -> mm.Matrix:
         '''
         Вычисление предсказания для обученной модели
         ----------
         
         Параметры
         ----------
-        X: mm.Matrix
-            Матрица со входными данными
+        X: mm.Matrix | list[float]
+            Матрица со входными данными или одна строка признаков (список или
+            вектор-строка Vector 1 x d)
             
         Возвращает
         ----------
         mm.Matrix
             Новый экземпляр матрицы с выходными значениями
         '''
-        return self.activation(X) if isinstance(X, mm.Matrix) else self.activation(mm.Matrix([X]))
-    
\ No newline at end of file
+        if isinstance(X, mm.Vector) and X.size[0] == 1:
+            X = X._flat()
+        elif isinstance(X, mm.Matrix):
+            return self.activation(X)
+        return mm.Matrix._from_values([[self.predict_one(X)]], (1, 1))
+    
+    def predict_one(self, row: Sequence[float]) -> float:
+        '''
+        Предсказание для одной строки признаков без создания матриц
+        ----------
+        
+        Параметры
+        ----------
+        row: Sequence[float]
+            Значения признаков (list, tuple, array или memoryview)
+            
+        Возвращает
+        ----------
+        float
+            Предсказание модели
+        '''
+        coef = self._weights()
+        if len(row) != len(coef):
+            raise ValueError('количество признаков не совпадает с обученной моделью')
+        return sum(map(operator.mul, row, coef), self.b_)
+    
+    def predict_iter(self, rows: Iterable[Union[Sequence[float], mm.Matrix]], batch_size: int = 1024,
+                     features: Optional[List[str]] = None) -> Iterator[array]:
+        '''
+        Потоковое предсказание по итератору строк или частей таблицы
+        ----------
+        
+        Строки собираются в батчи по batch_size, части таблицы (например,
+        mdata_reader.iter_chunks) обрабатываются целиком. В памяти одновременно
+        находится только один батч или одна часть
+        
+        Параметры
+        ----------
+        rows: Iterable[Sequence[float]] | Iterable[Matrix]
+            Строки признаков или части таблицы
+        batch_size: int
+            Количество строк в одном батче
+        features: list[str] | None
+            Заголовки признаков, которые выбираются из частей DataFrame
+            
+        Возвращает
+        ----------
+        Iterator[array]
+            Предсказания для каждого батча или части в виде array('d')
+        '''
+        if batch_size < 1:
+            raise ValueError('batch_size должен быть положительным')
+        coef, bias = self._weights(), self.b_
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return
+        if isinstance(first, mm.Matrix):
+            for chunk in chain([first], rows):
+                if features:
+                    chunk = chunk[features]
+                if chunk.size[1] != len(coef):
+                    raise ValueError('количество признаков не совпадает с обученной моделью')
+                yield _affine(chunk, coef, bias, array('d'))
+            return
+        rows = chain([first], rows)
+        while batch := list(islice(rows, batch_size)):
+            if set(map(len, batch)) != {len(coef)}:
+                raise ValueError('количество признаков не совпадает с обученной моделью')
+            yield mkernels.affine(batch, coef, bias, array('d'))
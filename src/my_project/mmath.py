@@ -1,6 +1,15 @@
 from __future__ import annotations
-from typing import Optional, List, Union, Tuple, Any, Self
-from copy import deepcopy
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, List, Union, Tuple, Any, Self, Sequence, Dict
+from array import array
+from itertools import repeat, chain, tee
+import operator
+from math import sqrt, copysign
+from my_project import mkernels
+
+# Активный параллельный режим (mparallel.ParallelBackend) или None
+_parallel_backend = None
 
 class Matrix:
     '''
@@ -21,38 +30,29 @@ class Matrix:
     size: tuple(int, int)
         Текущий размер матрицы
     '''
+    __slots__ = ('values', 'size')
+    
     def __init__(self, values: List[List[Union[int, float]]], size: Optional[Tuple[int, int]] = None) -> None:
         if not values:
             raise ValueError('values должно быть матрицей')
         
-        if not all(len(row) == len(values[0]) for row in values):
+        rows = [list(row) for row in values]
+        cols = len(rows[0])
+        if len(rows) > 1 and len(set(map(len, rows))) != 1:
             raise ValueError('все строки матрицы должны быть одинаковой длины')
         
-        rows, cols = len(values), len(values[0])
+        if not size:
+            self.values = rows
+            self.size = (len(rows), cols)
+            return
         
-        if size is None:
-            self.values = deepcopy(values)
-            self.size = (rows, cols)
-            
-        if size and (not isinstance(size, (tuple)) or len(size) != 2):
+        if not isinstance(size, tuple) or len(size) != 2:
             raise ValueError('size должен быть кортежем из 2ух положительных чисел')
-        elif size:
-            self.size = size
-            
-            new_rows, new_cols = self.size
-            flat_matrx = [elem for row in values for elem in row]
-        
-            self.values = []
-            idx = 0
-            for _ in range(new_rows):
-                row = []
-                for _ in range(new_cols):
-                    if idx < len(flat_matrx):
-                        row.append(flat_matrx[idx])
-                        idx += 1
-                    else:
-                        row.append(0)
-                self.values.append(row)
+        self.size = size
+        new_rows, new_cols = size
+        flat = list(chain.from_iterable(rows))[:new_rows * new_cols]
+        flat.extend(repeat(0, new_rows * new_cols - len(flat)))
+        self.values = [flat[i:i + new_cols] for i in range(0, new_rows * new_cols, new_cols)]
     
     
     def __getitem__(self, idx: Union[int, Tuple[int, int]]):
@@ -95,234 +95,249 @@ class Matrix:
                 raise ValueError("Длина списка не совпадает с шириной матрицы")
             self.values[idx] = value
     
-    def __add__(self, other: Union[Matrix, int, float]) -> Matrix:
+    def _apply(self, other: Union[Matrix, int, float], op, out: Optional[Matrix]) -> Matrix:
         '''
-        Сложение матрицы с числом или другой матрицей
+        Поэлементное применение op к матрице и числу или другой матрице за один проход
         ----------
         
-        Параметры
+        Матрицы из одной строки или одного столбца растягиваются до размера
+        другой матрицы (broadcasting). Результат записывается в out, если он
+        задан, иначе в новую матрицу, которая создаётся без повторной проверки
+        и копирования
+        '''
+        if isinstance(other, Matrix):
+            size = self._broadcast_size(other)
+            rows = map(map, repeat(op), self._broadcast_rows(size), other._broadcast_rows(size))
+        else:
+            size = self.size
+            rows = map(map, repeat(op), self._iter_rows(), repeat(repeat(other)))
+        if out is None:
+            return Matrix._from_values(list(map(list, rows)), size)
+        self._check_out(out, size)
+        out._store_rows(rows)
+        return out
+    
+    def _broadcast_size(self, other: Matrix) -> Tuple[int, int]:
+        '''
+        Размер результата поэлементной операции двух матриц
         ----------
-        other: Matrix | int | float
-            Элемент с которым складывается исходная матрица
         
-        Возвращает
-        ----------
-        Matrix
-            Новый экземпляр матрицы
+        По каждой оси размеры должны совпадать или один из них должен быть равен 1
         '''
-        if not isinstance(other, (Matrix, int, float)):
-            raise ValueError('сложение поддерживает только Matrix, int и float типы')
-        result = deepcopy(self.values)
-        if isinstance(other, Matrix):
-            if self.size != other.size:
+        if self.size == other.size:
+            return self.size
+        size = []
+        for a, b in zip(self.size, other.size):
+            if a != b and a != 1 and b != 1:
                 raise ValueError('размеры матриц не совпадают')
-            for i in range(self.size[0]):
-                for j in range(self.size[1]):
-                    result[i][j] += other.values[i][j]
-        elif isinstance(other, (int, float)):
-            for i in range(self.size[0]):
-                for j in range(self.size[1]):
-                    result[i][j] += other
-        return Matrix(result)
+            size.append(max(a, b))
+        return tuple(size)
     
-    def __iadd__(self, other: Union[Matrix, int, float]) -> Self:
+    def _broadcast_rows(self, size: Tuple[int, int]):
         '''
-        Сложение матрицы с числом или другой матрицей на месте
+        Итератор по строкам матрицы, растянутой до размера size
+        ----------
+        '''
+        rows, cols = self.size
+        if cols == size[1]:
+            return self._iter_rows() if rows == size[0] else repeat(self._row(0), size[0])
+        if rows == size[0]:
+            return map(repeat, self._col(0), repeat(size[1]))
+        return repeat([self._row(0)[0]] * size[1], size[0])
+    
+    def _broadcast_flat(self, size: Tuple[int, int]):
+        '''
+        Итератор по всем значениям матрицы, растянутой до размера size, построчно
+        ----------
+        '''
+        return chain.from_iterable(self._broadcast_rows(size))
+    
+    def _check_out(self, out: Matrix, size: Tuple[int, int]) -> None:
+        '''
+        Проверка матрицы для записи результата
+        ----------
+        '''
+        if not isinstance(out, Matrix) or out.size != size:
+            raise ValueError('out должен быть матрицей того же размера, что и результат')
+    
+    def add(self, other: Union[Matrix, int, float], out: Optional[Matrix] = None) -> Matrix:
+        '''
+        Сложение матрицы с числом или другой матрицей
         ----------
         
         Параметры
         ----------
         other: Matrix | int | float
-            Элемент с которым складывается исходная матрицы
-            
+            Элемент с которым складывается исходная матрица, матрица из одной
+            строки или одного столбца растягивается до размера другой матрицы
+        out: Matrix | None
+            Матрица того же размера для записи результата (может быть и самой
+            исходной матрицей), по умолчанию создаётся новая
+        
         Возвращает
         ----------
-        self
+        Matrix
+            out или новый экземпляр матрицы
         '''
         if not isinstance(other, (Matrix, int, float)):
             raise ValueError('сложение поддерживает только Matrix, int и float типы')
-        if isinstance(other, Matrix):
-            if self.size != other.size:
-                raise ValueError('размеры матриц не совпадают')
-            for i in range(self.size[0]):
-                for j in range(self.size[1]):
-                    self.values[i][j] += other[i][j]
-        elif isinstance(other, (int, float)):
-            for i in range(self.size[0]):
-                for j in range(self.size[1]):
-                    self.values[i][j] += other
-        return self
+        return self._apply(other, operator.add, out)
     
-    def __sub__(self, other: Union[Matrix, int, float]) -> Matrix:
+    def sub(self, other: Union[Matrix, int, float], out: Optional[Matrix] = None) -> Matrix:
         '''
-        Вычитание из матрицы числа или другой матрицы 
+        Вычитание из матрицы числа или другой матрицы
         ----------
         
         Параметры
+        ----------
         other: Matrix | int | float
             Элемент который вычитается из исходной матрицы
-            
+        out: Matrix | None
+            Матрица того же размера для записи результата, по умолчанию создаётся новая
+        
         Возвращает
         ----------
         Matrix
-            Новый экземпляр матрицы
+            out или новый экземпляр матрицы
         '''
         if not isinstance(other, (Matrix, int, float)):
             raise ValueError('вычитание поддерживает только Matrix, int и float типы')
-        result = deepcopy(self.values)
-        if isinstance(other, Matrix):
-            if self.size != other.size:
-                raise ValueError('размеры матриц не совпадают')
-            for i in range(self.size[0]):
-                for j in range(self.size[1]):
-                    result[i][j] -= other.values[i][j]
-        elif isinstance(other, (int, float)):
-            for i in range(self.size[0]):
-                for j in range(self.size[1]):
-                    result[i][j] -= other
-        return Matrix(result)
+        return self._apply(other, operator.sub, out)
     
-    def __isub__(self, other: Union[Matrix, int, float]) -> Self:
+    def mul(self, other: Union[Matrix, int, float], out: Optional[Matrix] = None) -> Matrix:
         '''
-        Вычитание из матрицы числа или другой матрицы на месте
+        Поэлементное умножение матрицы на число или другую матрицу
         ----------
         
         Параметры
+        ----------
         other: Matrix | int | float
-            Элемент который вычитается из исходной матрицы
-            
+            Множитель для чисел в матрице, матрица из одной строки или одного
+            столбца растягивается до размера другой матрицы
+        out: Matrix | None
+            Матрица того же размера для записи результата, по умолчанию создаётся новая
+        
         Возвращает
         ----------
-        self
+        Matrix
+            out или новый экземпляр матрицы
         '''
         if not isinstance(other, (Matrix, int, float)):
-            raise ValueError('вычитание поддерживает только Matrix, int и float типы')
-        if isinstance(other, Matrix):
-            if self.size != other.size:
-                raise ValueError('размеры матриц не совпадают')
-            for i in range(self.size[0]):
-                for j in range(self.size[1]):
-                    self.values[i][j] -= other.values[i][j]
-        elif isinstance(other, (int, float)):
-            for i in range(self.size[0]):
-                for j in range(self.size[1]):
-                    self.values[i][j] -= other
-        return self
+            raise ValueError('умножение поддерживает только Matrix, int и float типы')
+        return self._apply(other, operator.mul, out)
     
-    def __mul__(self, other: Union[int, float]) -> Matrix:
+    def truediv(self, other: Union[Matrix, int, float], out: Optional[Matrix] = None) -> Matrix:
         '''
-        Умножение матрицы на число
+        Поэлементное деление матрицы на число или другую матрицу
         ----------
         
         Параметры
-        other: int | float
-            Множитель для чисел в матрице
-            
-        Возвращает:
+        ----------
+        other: Matrix | int | float
+            Делитель для чисел в матрице, матрица из одной строки или одного
+            столбца растягивается до размера другой матрицы
+        out: Matrix | None
+            Матрица того же размера для записи результата, по умолчанию создаётся новая
+        
+        Возвращает
+        ----------
         Matrix
-            Новый эземлпяр матрицы
+            out или новый экземпляр матрицы
         '''
-        result = deepcopy(self.values)
-        if not isinstance(other, (int, float)):
-            raise ValueError('только int и float типы')
-        for i in range(self.size[0]):
-            for j in range(self.size[1]):
-                result[i][j] *= other
-        return Matrix(result)
-    
-    def __rmul__(self, other: Union[int, float]):
-        return self.__mul__(other)
-    
+        if not isinstance(other, (Matrix, int, float)):
+            raise ValueError('делитель может быть только Matrix, int или float')
+        return self._apply(other, operator.truediv, out)
     
-    def __imul__(self, other: Union[int, float]) -> Self:
+    def pow(self, value: Union[Matrix, int, float], out: Optional[Matrix] = None) -> Matrix:
         '''
-        Умножение матрицы на число на месте
+        Поэлементное возведение значений матрицы в степень
         ----------
         
         Параметры
         ----------
-        other: int | float
-            Множитель для чисел в матрице
+        value: Matrix | int | float
+            Показатель возведения в степень, матрица из одной строки или одного
+            столбца растягивается до размера другой матрицы
+        out: Matrix | None
+            Матрица того же размера для записи результата, по умолчанию создаётся новая
         
         Возвращает
         ----------
-        self
+        Matrix
+            out или новый экземпляр матрицы
         '''
-        if not isinstance(other, (int, float)):
-            raise ValueError('только int и float типы')
-        for i in range(self.size[0]):
-            for j in range(self.size[1]):
-                self.values[i][j] *= other
-        return self
+        if not isinstance(value, (Matrix, int, float)):
+            raise ValueError('показатель возведения в степень может быть только Matrix, int или float')
+        return self._apply(value, operator.pow, out)
     
-    def __truediv__(self, other: Union[int | float]) -> Matrix:
+    def __add__(self, other: Union[Matrix, int, float]) -> Matrix:
         '''
-        Деление всех значений в матрице на число
+        Сложение матрицы с числом или другой матрицей, см. add
         ----------
-        
-        Параметры
+        '''
+        return self.add(other)
+    
+    def __radd__(self, other: Union[int, float]) -> Matrix:
+        return self.add(other)
+    
+    def __iadd__(self, other: Union[Matrix, int, float]) -> Self:
+        '''
+        Сложение матрицы с числом или другой матрицей на месте
         ----------
-        other: int | float
-            Делитель для всех чисел в матрице
-            
-        Возвращает
+        '''
+        return self.add(other, out=self)
+    
+    def __sub__(self, other: Union[Matrix, int, float]) -> Matrix:
+        '''
+        Вычитание из матрицы числа или другой матрицы, см. sub
         ----------
-        Matrix
-            Новый экземлпяр матрицы с результатом деления
         '''
-        if not isinstance(other, (int, float)):
-            raise ValueError('делитель может быть только int или float')
-        result = deepcopy(self.values)
-        for i in range(self.size[0]):
-            for j in range(self.size[1]):
-                result[i][j] /= other
-        return Matrix(result)
+        return self.sub(other)
     
-    def __itruediv__(self, other: Union[int | float]) -> Self:
+    def __isub__(self, other: Union[Matrix, int, float]) -> Self:
         '''
-        Деление всех значений в матрице на число на месте
+        Вычитание из матрицы числа или другой матрицы на месте
         ----------
-        
-        Параметры
+        '''
+        return self.sub(other, out=self)
+    
+    def __mul__(self, other: Union[Matrix, int, float]) -> Matrix:
+        '''
+        Поэлементное умножение матрицы на число или другую матрицу, см. mul
         ----------
-        other: int | float
-            Делитель для всех чисел в матрице
-            
-        Возвращает
+        '''
+        return self.mul(other)
+    
+    def __rmul__(self, other: Union[int, float]):
+        return self.mul(other)
+    
+    def __imul__(self, other: Union[Matrix, int, float]) -> Self:
+        '''
+        Поэлементное умножение матрицы на число или другую матрицу на месте
         ----------
-        Matrix
-            Новый экземлпяр матрицы с результатом деления
         '''
-        if not isinstance(other, (int, float)):
-            raise ValueError('делитель может быть только int или float')
-        for i in range(self.size[0]):
-            for j in range(self.size[1]):
-                self.values[i][j] /= other
-        return self
-
+        return self.mul(other, out=self)
     
-    def __pow__(self, value: Union[int, float]) -> Matrix:
+    def __truediv__(self, other: Union[Matrix, int, float]) -> Matrix:
         '''
-        Возведение всех значений в матрице в степень
+        Поэлементное деление матрицы на число или другую матрицу, см. truediv
         ----------
-        
-        Параметры
+        '''
+        return self.truediv(other)
+    
+    def __itruediv__(self, other: Union[Matrix, int, float]) -> Self:
+        '''
+        Поэлементное деление матрицы на число или другую матрицу на месте
         ----------
-        value: int | float
-            Показатель возведения в степень
-            
-        Возвращает
+        '''
+        return self.truediv(other, out=self)
+    
+    def __pow__(self, value: Union[Matrix, int, float]) -> Matrix:
+        '''
+        Возведение всех значений в матрице в степень, см. pow
         ----------
-        Matrix
-            Новый экземпляр матрицы с результатом возведения в степень
         '''
-        if not isinstance(value, (int, float)):
-            raise ValueError('показатель возведения в степень может быть только int или float')
-        result = deepcopy(self.values)
-        for i in range(self.size[0]):
-            for j in range(self.size[1]):
-                result[i][j] **= value
-        return Matrix(result)
+        return self.pow(value)
         
         
     def __repr__(self):
@@ -381,6 +396,12 @@ class Matrix:
         Перемножение двух матриц между собой (self @ other)
         ----------
         
+        Для правой матрицы из одного столбца используется произведение матрицы
+        на вектор, в остальных случаях столбцы правой матрицы собираются один раз
+        и каждый элемент считается скалярным произведением строки на столбец.
+        Внутри mparallel.ParallelBackend большие матрицы делятся по строкам
+        между процессами
+        
         Параметры
         ----------
         other: Matrix
@@ -395,13 +416,14 @@ class Matrix:
             raise ValueError('только для матриц')
         if self.size[1] != other.size[0]:
             raise ValueError('размеры матриц не совпадают')
-        result = ZeroMatrix(size=(self.size[0], other.size[1]))
-        for i in range(self.size[0]):
-            for j in range(other.size[1]):
-                for k in range(self.size[1]):
-                    result.values[i][j] += self.values[i][k] * other.values[k][j]
-
-        return Matrix(result.values)
+        out = self._new_buffer()
+        if _parallel_backend is not None and _parallel_backend.accepts(self.size[0]):
+            out.extend(_parallel_backend.matmul(self, other))
+        elif other.size[1] == 1:
+            mkernels.matvec(self._iter_rows(), other._col(0), out)
+        else:
+            mkernels.matmul(self._iter_rows(), [other._col(j) for j in range(other.size[1])], out)
+        return self._new_like(out, (self.size[0], other.size[1]))
     
     def T(self) -> Matrix:
         '''
@@ -413,9 +435,7 @@ class Matrix:
         Matrix
             Новый экземпляр матрицы с результатом транспонирования
         '''
-        result = deepcopy(self.values)
-        result = [list(row) for row in zip(*result)]
-        return Matrix(result)
+        return Matrix._from_values([list(row) for row in zip(*self.values)], (self.size[1], self.size[0]))
     
     def addcol(self, other: Union[List, Tuple]) -> Self:
         '''
@@ -432,21 +452,13 @@ class Matrix:
         '''
         if not isinstance(other, (list, tuple)):
             raise ValueError('только list ил tuple')
-        if len(other) != len(self.values):
+        if len(other) != self.size[0]:
             raise ValueError('размеры не совпадают')
         
-        extra_col = self.size[1]
-        
-        result = ZeroMatrix((self.size[0], self.size[1] + 1))
-        for i in range(result.size[0]):
-            for j in range(result.size[1]):
-                if j == extra_col:
-                    result[i][j] = other[i]
-                else:
-                    result.values[i][j] = self.values[i][j]
-        self.values = deepcopy(result.values)
-        self._update_size()
-        
+        # каждая строка дописывается на месте: амортизированно O(1) на элемент
+        for row, value in zip(self.values, other):
+            row.append(value)
+        self.size = (self.size[0], self.size[1] + 1)
         return self
     
     
@@ -466,34 +478,241 @@ class Matrix:
         
         if not isinstance(other, (list, tuple)):
             raise ValueError('только list ил tuple')
-        if len(other) != len(self.values[0]):
+        if len(other) != self.size[1]:
             raise ValueError('размеры не совпадают')
         
-        extra_row = self.size[0]
-        
-        result = ZeroMatrix((self.size[0] + 1, self.size[1]))
-        for i in range(result.size[0]):
-            for j in range(result.size[1]):
-                if i == extra_row:
-                    result[i][j] = other[i]
-                else:
-                    result.values[i][j] = self.values[i][j]
-        self.values = deepcopy(result.values)
-        self._update_size()
+        self.values.append(list(other))
+        self.size = (self.size[0] + 1, self.size[1])
         return self
     
-    def mean(self) -> Union[int, float]:
+    def _reduce(self, func, axis: Optional[int]) -> Union[int, float, Matrix]:
+        '''
+        Применение func ко всем значениям, к каждому столбцу (axis=0) или к каждой строке (axis=1)
+        ----------
+        
+        Для axis=0 результат - матрица из одной строки, для axis=1 - из одного
+        столбца, поэтому его можно сразу использовать в операциях с исходной матрицей
+        '''
+        if axis is None:
+            return func(self._flat())
+        if axis == 0:
+            lines, size = self._iter_cols(), (1, self.size[1])
+        elif axis == 1:
+            lines, size = self._iter_rows(), (self.size[0], 1)
+        else:
+            raise ValueError('axis может быть только None, 0 или 1')
+        out = self._new_buffer()
+        out.extend(map(func, lines))
+        return self._new_like(out, size)
+    
+    def sum(self, axis: Optional[int] = None) -> Union[int, float, Matrix]:
+        '''
+        Сумма значений матрицы
+        ----------
+        
+        Параметры
+        ----------
+        axis: int | None
+            None - по всей матрице, 0 - по каждому столбцу, 1 - по каждой строке
+        
+        Возвращает
+        ----------
+        int | float | Matrix
+            Число или матрица из одной строки (axis=0) или одного столбца (axis=1)
+        '''
+        return self._reduce(sum, axis)
+    
+    def mean(self, axis: Optional[int] = None) -> Union[int, float, Matrix]:
+        '''
+        Вычисление среднего значения по матрице
+        ----------
+        
+        Параметры
+        ----------
+        axis: int | None
+            None - по всей матрице, 0 - по каждому столбцу, 1 - по каждой строке
+        
+        Возвращает
+        ----------
+        int | float | Matrix
+            Среднее значение по матрице или матрица средних значений
+        '''
+        return self._reduce(_mean, axis)
+    
+    def var(self, axis: Optional[int] = None, ddof: int = 0) -> Union[float, Matrix]:
+        '''
+        Дисперсия значений матрицы
+        ----------
+        
+        Считается через отклонения от среднего, а не через разность сумм
+        квадратов, чтобы не терять точность на данных с большим средним
+        
+        Параметры
+        ----------
+        axis: int | None
+            None - по всей матрице, 0 - по каждому столбцу, 1 - по каждой строке
+        ddof: int
+            Поправка знаменателя: n - ddof (1 - несмещённая оценка)
+        
+        Возвращает
+        ----------
+        float | Matrix
+            Дисперсия или матрица дисперсий
+        '''
+        n = self.size[0] * self.size[1] if axis is None else self.size[axis]
+        if n - ddof <= 0:
+            raise ValueError('ddof должен быть меньше количества значений')
+        return self._reduce(lambda values: _squared_deviations(values) / (n - ddof), axis)
+    
+    def min(self, axis: Optional[int] = None) -> Union[int, float, Matrix]:
+        '''
+        Наименьшее значение матрицы
+        ----------
+        
+        Параметры
+        ----------
+        axis: int | None
+            None - по всей матрице, 0 - по каждому столбцу, 1 - по каждой строке
+        '''
+        return self._reduce(min, axis)
+    
+    def max(self, axis: Optional[int] = None) -> Union[int, float, Matrix]:
         '''
-        Вычисление среднего значения по матрицу
+        Наибольшее значение матрицы
         ----------
         
+        Параметры
+        ----------
+        axis: int | None
+            None - по всей матрице, 0 - по каждому столбцу, 1 - по каждой строке
+        '''
+        return self._reduce(max, axis)
+    
+    def argmax(self, axis: Optional[int] = None) -> Union[int, Matrix]:
+        '''
+        Индекс наибольшего значения матрицы
+        ----------
+        
+        Параметры
+        ----------
+        axis: int | None
+            None - индекс в построчном порядке всех значений, 0 - номер строки
+            для каждого столбца, 1 - номер столбца для каждой строки
+        
         Возвращает
         ----------
-        int | float
-            Среднее значение по матрице
+        int | Matrix
+            Индекс первого наибольшего значения или матрица индексов
+        '''
+        return self._reduce(_argmax, axis)
+    
+    def __setstate__(self, state) -> None:
+        '''
+        Восстановление из pickle
+        ----------
+        
+        Матрицы, сохранённые до появления __slots__, хранят состояние словарём
+        атрибутов, новые - парой (None, словарь слотов)
+        '''
+        if isinstance(state, tuple):
+            state = state[1]
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    @classmethod
+    def _from_values(cls, values: List[List[Union[int, float]]], size: Tuple[int, int]) -> Matrix:
+        '''
+        Создание матрицы из готовых строк без проверок и копирования
+        ----------
+        
+        Параметры
+        ----------
+        values: list[list[int | float]]
+            Строки матрицы, которые становятся собственностью новой матрицы
+        size: tuple(int, int)
+            Размер матрицы
+        '''
+        result = cls.__new__(cls)
+        result.values = values
+        result.size = size
+        return result
+    
+    def _row(self, i: int) -> List[Union[int, float]]:
+        '''
+        i-ая строка матрицы
+        ----------
+        '''
+        return self.values[i]
+    
+    def _col(self, j: int) -> List[Union[int, float]]:
+        '''
+        j-ый столбец матрицы в виде нового списка
+        ----------
+        '''
+        return [row[j] for row in self.values]
+    
+    def _col_view(self, j: int) -> List[Union[int, float]]:
+        '''
+        j-ый столбец матрицы для многократного чтения
+        ----------
+        
+        Для списков строк столбец приходится копировать
+        '''
+        return self._col(j)
+    
+    def _iter_rows(self):
+        '''
+        Итератор по строкам матрицы
+        ----------
+        '''
+        return iter(self.values)
+    
+    def _iter_cols(self):
+        '''
+        Итератор по столбцам матрицы
+        ----------
+        '''
+        return zip(*self.values)
+    
+    def _flat(self) -> List[Union[int, float]]:
+        '''
+        Все значения матрицы подряд построчно
+        ----------
+        '''
+        return list(chain.from_iterable(self.values))
+    
+    def _new_buffer(self) -> List[Union[int, float]]:
+        '''
+        Пустой плоский буфер для результата операции
+        ----------
+        '''
+        return []
+    
+    def _new_like(self, flat: List[Union[int, float]], size: Tuple[int, int]) -> Matrix:
+        '''
+        Матрица того же способа хранения из плоского построчного буфера
+        ----------
+        '''
+        cols = size[1]
+        return Matrix._from_values([flat[i:i + cols] for i in range(0, len(flat), cols)], size)
+    
+    def _store_rows(self, rows) -> None:
+        '''
+        Запись значений по строкам в существующие строки матрицы
+        ----------
+        '''
+        for dst, src in zip(self.values, rows):
+            dst[:] = src
+    
+    def _store_flat(self, flat) -> None:
+        '''
+        Запись плоского построчного буфера в существующие строки матрицы
+        ----------
         '''
-        return sum(map(sum, self.values)) / (self.size[0] * self.size[1])
-                
+        cols = self.size[1]
+        for i, dst in enumerate(self.values):
+            dst[:] = flat[i * cols:(i + 1) * cols]
+    
     def _update_size(self):
         '''
         Метод для обновления информации о текущем размере матрицы
@@ -513,5 +732,751 @@ class ZeroMatrix(Matrix):
     size: tuple(int, int)
         Размер нулевой матрицы
     '''
+    __slots__ = ()
+    
     def __init__(self, size: Tuple[int, int]):
-        super().__init__([[0]], size)
\ No newline at end of file
+        super().__init__([[0]], size)
+
+
+class ArrayMatrix(Matrix):
+    '''
+    Матрица, хранящая все значения в одном непрерывном буфере array('d')
+    ----------
+    
+    Элементы лежат построчно: значение (i, j) находится в буфере по индексу
+    offset + i * strides[0] + j * strides[1]. На элемент приходится 8 байт
+    вместо отдельного объекта float и ячейки списка.
+    
+    Транспонирование и срезы возвращают представления, которые разделяют буфер
+    с исходной матрицей. Буфер копируется только при первой записи в матрицу,
+    чей буфер разделён с другими (copy-on-write).
+    
+    Параметры
+    ----------
+    values: list[list[int | float]] | Matrix
+        Стартовые значения матрицы
+    size: tuple(int, int)
+        Размер матрицы
+        
+    Атрибуты
+    ----------
+    values: list[memoryview]
+        Строки матрицы (только для чтения)
+    size: tuple(int, int)
+        Текущий размер матрицы
+    '''
+    __slots__ = ('_data', '_offset', '_strides', '_shared')
+    
+    def __init__(self, values: Union[List[List[Union[int, float]]], Matrix], size: Optional[Tuple[int, int]] = None) -> None:
+        if isinstance(values, ArrayMatrix):
+            rows, cols = values.size
+            data = array('d', values._flat())
+        else:
+            if isinstance(values, Matrix):
+                values = values.values
+            if not values:
+                raise ValueError('values должно быть матрицей')
+            if not all(len(row) == len(values[0]) for row in values):
+                raise ValueError('все строки матрицы должны быть одинаковой длины')
+            rows, cols = len(values), len(values[0])
+            data = array('d')
+            for row in values:
+                data.extend(row)
+        
+        if size and (not isinstance(size, (tuple)) or len(size) != 2):
+            raise ValueError('size должен быть кортежем из 2ух положительных чисел')
+        elif size:
+            rows, cols = size
+            del data[rows * cols:]
+            data.extend(repeat(0.0, rows * cols - len(data)))
+        
+        self._set_buffer(data, (rows, cols))
+    
+    @classmethod
+    def _from_buffer(cls, data: array, size: Tuple[int, int], offset: int = 0, strides: Optional[Tuple[int, int]] = None, shared: bool = False) -> ArrayMatrix:
+        '''
+        Создание матрицы поверх готового буфера без проверок и копирования
+        ----------
+        
+        Параметры
+        ----------
+        data: array
+            Буфер со значениями
+        size: tuple(int, int)
+            Размер матрицы
+        offset: int
+            Индекс первого элемента в буфере
+        strides: tuple(int, int)
+            Шаги по строкам и столбцам, по умолчанию построчное хранение
+        shared: bool
+            Разделяется ли буфер с другими матрицами
+        '''
+        result = cls.__new__(cls)
+        result._set_buffer(data, size, offset, strides, shared)
+        return result
+    
+    def _set_buffer(self, data: array, size: Tuple[int, int], offset: int = 0, strides: Optional[Tuple[int, int]] = None, shared: bool = False) -> None:
+        '''
+        Замена буфера и раскладки матрицы
+        ----------
+        '''
+        self._data = data
+        self._offset = offset
+        self._strides = strides if strides else (size[1], 1)
+        self._shared = shared
+        self.size = size
+    
+    def _view(self, size: Tuple[int, int], offset: int, strides: Tuple[int, int]) -> ArrayMatrix:
+        '''
+        Представление над буфером матрицы без копирования данных
+        ----------
+        
+        После создания представления буфер считается разделённым: и исходная
+        матрица, и представление скопируют его перед первой записью
+        '''
+        self._shared = True
+        return ArrayMatrix._from_buffer(self._data, size, offset, strides, shared=True)
+    
+    def _ensure_owned(self) -> None:
+        '''
+        Копирование разделённого буфера перед записью (copy-on-write)
+        ----------
+        '''
+        if self._shared:
+            data, strides = self._compact()
+            self._set_buffer(data if data is not self._data and isinstance(data, array) else array('d', data),
+                             self.size, strides=strides)
+    
+    def _compact(self) -> Tuple[array, Tuple[int, int]]:
+        '''
+        Значения матрицы в непрерывном буфере с той же раскладкой и шаги для него
+        ----------
+        
+        Матрица, хранящаяся по столбцам (как DataFrame), остаётся по столбцам,
+        остальные раскладываются построчно. Как и _flat, может вернуть сам буфер
+        или memoryview над ним, поэтому результат нельзя изменять
+        '''
+        rows, cols = self.size
+        if rows == 1 or self._strides[0] != 1:
+            return self._flat(), (cols, 1)
+        n = rows * cols
+        if cols == 1 or self._strides[1] == rows:
+            if self._offset == 0 and len(self._data) == n:
+                return self._data, (1, rows)
+            return self._data[self._offset:self._offset + n], (1, rows)
+        data = array('d')
+        for column in self._iter_cols():
+            data.extend(column)
+        return data, (1, rows)
+    
+    def _select(self, idx: Union[int, slice], axis: int) -> Tuple[int, int, int]:
+        '''
+        Начало, длина и шаг выборки по одной из осей в терминах буфера
+        ----------
+        '''
+        if isinstance(idx, int):
+            return self._normalize(idx, axis) * self._strides[axis], 1, self._strides[axis]
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(self.size[axis])
+            length = len(range(start, stop, step))
+            if not length:
+                raise ValueError('срез не должен быть пустым')
+            return start * self._strides[axis], length, step * self._strides[axis]
+        raise ValueError('индексы могут быть только числами или срезами')
+    
+    def _is_contiguous(self) -> bool:
+        '''
+        Лежат ли элементы в буфере подряд построчно
+        ----------
+        '''
+        rows, cols = self.size
+        return (cols == 1 or self._strides[1] == 1) and (rows == 1 or self._strides[0] == cols)
+    
+    @staticmethod
+    def _span(start: int, count: int, step: int) -> slice:
+        '''
+        Срез буфера из count элементов, начиная со start, с шагом step
+        ----------
+        '''
+        last = start + (count - 1) * step
+        if step > 0:
+            return slice(start, last + 1, step)
+        return slice(start, last - 1 if last > 0 else None, step)
+    
+    def _row(self, i: int) -> array:
+        '''
+        Копия i-ой строки матрицы в виде array('d')
+        ----------
+        '''
+        return self._data[self._span(self._offset + i * self._strides[0], self.size[1], self._strides[1])]
+    
+    def _col(self, j: int) -> array:
+        '''
+        Копия j-го столбца матрицы в виде array('d')
+        ----------
+        '''
+        return self._data[self._span(self._offset + j * self._strides[1], self.size[0], self._strides[0])]
+    
+    def _flat(self) -> array:
+        '''
+        Все значения матрицы подряд построчно
+        ----------
+        
+        Для непрерывной матрицы может вернуть сам буфер, поэтому результат нельзя изменять
+        '''
+        n = self.size[0] * self.size[1]
+        if self._is_contiguous():
+            if self._offset == 0 and len(self._data) == n:
+                return self._data
+            return self._data[self._offset:self._offset + n]
+        result = array('d')
+        for i in range(self.size[0]):
+            result.extend(self._row(i))
+        return result
+    
+    def _other_flat(self, other: Matrix) -> array:
+        '''
+        Значения другой матрицы того же размера подряд построчно
+        ----------
+        '''
+        if self.size != other.size:
+            raise ValueError('размеры матриц не совпадают')
+        if isinstance(other, ArrayMatrix):
+            return other._flat()
+        result = array('d')
+        for row in other.values:
+            result.extend(row)
+        return result
+    
+    def _binary(self, other: Union[Matrix, int, float], op) -> array:
+        '''
+        Поэлементное применение op к матрице и числу или другой матрице
+        ----------
+        '''
+        if isinstance(other, Matrix):
+            return array('d', map(op, self._flat(), self._other_flat(other)))
+        return array('d', map(op, self._flat(), repeat(other)))
+    
+    def _col_view(self, j: int) -> memoryview:
+        '''
+        j-ый столбец матрицы в виде memoryview над буфером без копирования
+        ----------
+        '''
+        view = memoryview(self._data).toreadonly()
+        return view[self._span(self._offset + j * self._strides[1], self.size[0], self._strides[0])]
+    
+    def _iter_rows(self):
+        '''
+        Итератор по строкам матрицы в виде array('d')
+        ----------
+        '''
+        data, (rows, cols), (row_step, col_step) = self._data, self.size, self._strides
+        starts = range(self._offset, self._offset + rows * row_step, row_step) if row_step else [self._offset]
+        if col_step == 1:
+            return (data[start:start + cols] for start in starts)
+        span = self._span
+        return (data[span(start, cols, col_step)] for start in starts)
+    
+    def _iter_cols(self):
+        '''
+        Итератор по столбцам матрицы в виде array('d')
+        ----------
+        
+        Столбцы копируются по одному: срез array быстрее читается, чем
+        memoryview с шагом, а в памяти одновременно лежит только один столбец
+        '''
+        return map(self._col, range(self.size[1]))
+    
+    def _new_buffer(self) -> array:
+        return array('d')
+    
+    def _new_like(self, flat: array, size: Tuple[int, int]) -> ArrayMatrix:
+        return ArrayMatrix._from_buffer(flat, size)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        '''
+        Состояние для pickle и copy
+        ----------
+        
+        Сохраняются только значения самой матрицы в непрерывном буфере с той же
+        раскладкой (по строкам или по столбцам): слот values закрыт свойством со
+        строками-memoryview, а буфер представления или отображённого в память
+        файла pickle сохранить не может
+        '''
+        state = {name: getattr(self, name) for cls in type(self).__mro__
+                 for name in cls.__dict__.get('__slots__', ()) if name != 'values' and hasattr(self, name)}
+        data, strides = self._compact()
+        state.update(_data=data if isinstance(data, array) else array('d', data),
+                     _offset=0, _strides=strides, _shared=False)
+        return state
+    
+    def tolist(self) -> List[List[float]]:
+        '''
+        Значения матрицы в виде списка списков
+        ----------
+        '''
+        return [self._row(i).tolist() for i in range(self.size[0])]
+    
+    @property
+    def values(self) -> List[memoryview]:
+        view = memoryview(self._data).toreadonly()
+        return [view[self._span(self._offset + i * self._strides[0], self.size[1], self._strides[1])] for i in range(self.size[0])]
+    
+    @values.setter
+    def values(self, values: List[List[Union[int, float]]]) -> None:
+        data = array('d')
+        for row in values:
+            data.extend(row)
+        self._set_buffer(data, (len(values), len(values[0])))
+    
+    def _normalize(self, idx: int, axis: int) -> int:
+        '''
+        Приведение отрицательного индекса и проверка границ
+        ----------
+        '''
+        bound = self.size[axis]
+        if idx < 0:
+            idx += bound
+        if not 0 <= idx < bound:
+            raise IndexError('индекс за пределами матрицы')
+        return idx
+    
+    def __getitem__(self, idx: Union[int, Tuple[int, int]]):
+        '''
+        Доступ к элементу, строке или срезу матрицы по индексу
+        ----------
+        
+        Срезы возвращают представления, разделяющие буфер с исходной матрицей
+        
+        Параметры
+        ----------
+        idx: int | slice | tuple(int | slice, int | slice)
+            Индекс строки, элемента или срез
+        '''
+        if isinstance(idx, slice) or isinstance(idx, tuple) and any(isinstance(x, slice) for x in idx):
+            rows, cols = (idx, slice(None)) if isinstance(idx, slice) else idx
+            row_start, n_rows, row_step = self._select(rows, 0)
+            col_start, n_cols, col_step = self._select(cols, 1)
+            return self._view((n_rows, n_cols), self._offset + row_start + col_start, (row_step, col_step))
+        if isinstance(idx, int):
+            start = self._offset + self._normalize(idx, 0) * self._strides[0]
+            return memoryview(self._data).toreadonly()[self._span(start, self.size[1], self._strides[1])]
+        elif isinstance(idx, tuple):
+            row, col = idx
+            row, col = self._normalize(row, 0), self._normalize(col, 1)
+            return self._data[self._offset + row * self._strides[0] + col * self._strides[1]]
+    
+    def __setitem__(self, idx: Union[int, Tuple[int, int]], value: Union[int, float, List[Union[int, float]]]):
+        '''
+        Изменений значения матрицы по индексу
+        ----------
+        
+        Параметры
+        ----------
+        idx: int | tuple(int, int)
+            Индекс элемента
+        value: int | float | list[int | float]
+            Новые значения элементов матрицы
+        '''
+        if isinstance(idx, tuple):
+            if not isinstance(value, (int, float)):
+                raise TypeError("Для элемента значение должно быть int или float")
+            row, col = idx
+            row, col = self._normalize(row, 0), self._normalize(col, 1)
+            self._ensure_owned()
+            self._data[self._offset + row * self._strides[0] + col * self._strides[1]] = value
+        else:
+            if not isinstance(value, list):
+                raise TypeError("Для строки значение должно быть списком")
+            if len(value) != self.size[1]:
+                raise ValueError("Длина списка не совпадает с шириной матрицы")
+            self._ensure_owned()
+            start = self._offset + self._normalize(idx, 0) * self._strides[0]
+            self._data[self._span(start, self.size[1], self._strides[1])] = array('d', value)
+    
+    def _apply(self, other: Union[Matrix, int, float], op, out: Optional[Matrix]) -> Matrix:
+        if isinstance(other, Matrix) and other.size != self.size:
+            size = self._broadcast_size(other)
+            flat = array('d', map(op, self._broadcast_flat(size), other._broadcast_flat(size)))
+        else:
+            size = self.size
+            flat = self._binary(other, op)
+        if out is None:
+            return ArrayMatrix._from_buffer(flat, size)
+        self._check_out(out, size)
+        out._store_flat(flat)
+        return out
+    
+    def _broadcast_flat(self, size: Tuple[int, int]):
+        if size == self.size:
+            return self._flat()
+        return super()._broadcast_flat(size)
+    
+    def _store_rows(self, rows) -> None:
+        self._ensure_owned()
+        for i, src in enumerate(rows):
+            start = self._offset + i * self._strides[0]
+            self._data[self._span(start, self.size[1], self._strides[1])] = array('d', src)
+    
+    def _store_flat(self, flat: array) -> None:
+        '''
+        Запись плоского построчного буфера в буфер матрицы без его замены
+        ----------
+        '''
+        if self._shared and self._is_contiguous():
+            # разделённый буфер всё равно пришлось бы копировать, новый буфер занимает его место
+            self._set_buffer(flat, self.size)
+            return
+        self._ensure_owned()
+        if self._is_contiguous():
+            n = self.size[0] * self.size[1]
+            self._data[self._offset:self._offset + n] = flat
+        else:
+            cols = self.size[1]
+            self._store_rows(flat[i:i + cols] for i in range(0, len(flat), cols))
+    
+    def __repr__(self):
+        return '\n'.join([str(self._row(i).tolist()) for i in range(self.size[0])])
+    
+    def reshape(self, rows: int, cols: int) -> None:
+        '''
+        Изменение размера матрицы на месте, пустые элементы, если они имеются, заменяются нулями
+        ----------
+        
+        Параметры
+        ----------
+        rows: int
+            Итоговой количество строк в матрице
+        cols: int
+            Итоговой количество столбцов в матрицу
+        '''
+        data = array('d', self._flat())
+        del data[rows * cols:]
+        data.extend(repeat(0.0, rows * cols - len(data)))
+        self._set_buffer(data, (rows, cols))
+    
+    def T(self) -> ArrayMatrix:
+        '''
+        Транспонирование матрицы без копирования данных
+        ----------
+        
+        Возвращает
+        ----------
+        ArrayMatrix
+            Представление, разделяющее буфер с исходной матрицей
+        '''
+        return self._view((self.size[1], self.size[0]), self._offset, (self._strides[1], self._strides[0]))
+    
+    def addcol(self, other: Union[List, Tuple]) -> Self:
+        '''
+        Добавление заданного столбца в исходную матрицу
+        
+        Параметры
+        ----------
+        other: list | tuple
+            Столбец для добавления в матрицу
+            
+        Возвращает
+        ----------
+        self
+        '''
+        if not isinstance(other, (list, tuple)):
+            raise ValueError('только list ил tuple')
+        if len(other) != self.size[0]:
+            raise ValueError('размеры не совпадают')
+        rows, cols = self.size
+        self._append(array('d', other), column_major=True)
+        self._set_buffer(self._data, (rows, cols + 1), strides=(1, rows))
+        return self
+    
+    def addrow(self, other: Union[List, Tuple]) -> Self:
+        '''
+        Добавления новой строки в исходную матрицу
+        
+        Параметры
+        ----------
+        other: list | tuple
+            Строка для добавления в матрицу
+            
+        Возвращает
+        ----------
+        self
+        '''
+        if not isinstance(other, (list, tuple)):
+            raise ValueError('только list ил tuple')
+        if len(other) != self.size[1]:
+            raise ValueError('размеры не совпадают')
+        rows, cols = self.size
+        self._append(array('d', other), column_major=False)
+        self._set_buffer(self._data, (rows + 1, cols))
+        return self
+    
+    def _append(self, values: array, column_major: bool) -> None:
+        '''
+        Дописывание значений в конец буфера для addrow (построчно) или addcol (по столбцам)
+        ----------
+        
+        Собственный непрерывный буфер array('d') в нужном порядке расширяется на
+        месте, array выделяет память с запасом, поэтому серия добавлений стоит
+        амортизированно O(1) на элемент. Иначе (разделённый буфер, представление,
+        отображённый файл или другой порядок) значения один раз перекладываются
+        в новый буфер в нужном порядке, и следующие добавления снова идут на месте
+        '''
+        rows, cols = self.size
+        if column_major:
+            ordered = (rows == 1 or self._strides[0] == 1) and (cols == 1 or self._strides[1] == rows)
+        else:
+            ordered = self._is_contiguous()
+        data = self._data
+        if self._shared or type(data) is not array or self._offset or len(data) != rows * cols or not ordered:
+            if column_major:
+                data = array('d')
+                for col in self._iter_cols():
+                    data.extend(col)
+            else:
+                data = array('d', self._flat())
+        try:
+            data.extend(values)
+        except BufferError:
+            # на буфер есть memoryview (values, столбцы для обучения): расширить его
+            # на месте нельзя, а копия оставляет им прежние значения
+            data = array('d', data)
+            data.extend(values)
+        self._data = data
+        self._shared = False
+
+
+
+class Vector(ArrayMatrix):
+    '''
+    Вектор-столбец d x 1 или вектор-строка 1 x d в одном буфере array('d')
+    ----------
+    
+    Создаётся из плоской последовательности значений без разбора строк, поэтому
+    дешевле Matrix для весов модели и одиночных строк признаков. Во всех
+    операциях ведёт себя как ArrayMatrix, а len и итерация идут по элементам
+    
+    Параметры
+    ----------
+    values: Sequence[int | float]
+        Значения вектора (list, tuple, array или memoryview)
+    column: bool
+        Вектор-столбец (d x 1) или вектор-строка (1 x d)
+    '''
+    __slots__ = ()
+    
+    def __init__(self, values: Sequence[Union[int, float]], column: bool = True) -> None:
+        data = array('d', values)
+        n = len(data)
+        if not n:
+            raise ValueError('values не должно быть пустым')
+        # слоты заполняются напрямую, без _set_buffer: для столбца шаги - общий кортеж-константа
+        self._data = data
+        self._offset = 0
+        self._shared = False
+        if column:
+            self.size = (n, 1)
+            self._strides = (1, 1)
+        else:
+            self.size = (1, n)
+            self._strides = (n, 1)
+    
+    def __len__(self) -> int:
+        return self.size[0] * self.size[1]
+    
+    def __iter__(self):
+        return iter(self._flat())
+
+
+def _mean(values) -> float:
+    return sum(values) / len(values)
+
+
+def _squared_deviations(values) -> float:
+    '''
+    Сумма квадратов отклонений от среднего за два прохода на уровне C
+    ----------
+    '''
+    mean = sum(values) / len(values)
+    deviations = map(operator.sub, values, repeat(mean))
+    return sum(map(operator.mul, *tee(deviations)))
+
+
+def _argmax(values) -> int:
+    return operator.indexOf(values, max(values))
+
+
+def cholesky(A: Matrix) -> Matrix:
+    '''
+    Разложение Холецкого симметричной положительно определённой матрицы: A = L @ L.T()
+    ----------
+    
+    Параметры
+    ----------
+    A: Matrix
+        Квадратная симметричная положительно определённая матрица
+        
+    Возвращает
+    ----------
+    Matrix
+        Нижнетреугольная матрица L
+    '''
+    if not isinstance(A, Matrix):
+        raise ValueError('только для матриц')
+    n = A.size[0]
+    if A.size != (n, n):
+        raise ValueError('матрица должна быть квадратной')
+    L = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        row = A._row(i)
+        L_i = L[i]
+        for j in range(i + 1):
+            L_j = L[j]
+            s = row[j] - sum(map(operator.mul, L_i[:j], L_j[:j]))
+            if i == j:
+                if s <= 0:
+                    raise ValueError('матрица не является положительно определённой')
+                L_i[j] = sqrt(s)
+            else:
+                L_i[j] = s / L_j[j]
+    return Matrix._from_values(L, (n, n))
+
+
+def solve_triangular(T: Matrix, b: Matrix, lower: bool = True) -> Matrix:
+    '''
+    Решение системы T @ x = b с треугольной матрицей T подстановкой
+    ----------
+    
+    Параметры
+    ----------
+    T: Matrix
+        Квадратная треугольная матрица
+    b: Matrix
+        Правая часть, по столбцу на каждую систему
+    lower: bool
+        Нижнетреугольная (прямая подстановка) или верхнетреугольная (обратная) матрица
+        
+    Возвращает
+    ----------
+    Matrix
+        Решение x размера b
+    '''
+    if not isinstance(T, Matrix) or not isinstance(b, Matrix):
+        raise ValueError('только для матриц')
+    n = T.size[0]
+    if T.size != (n, n) or b.size[0] != n:
+        raise ValueError('размеры матриц не совпадают')
+    rows = [T._row(i) for i in range(n)]
+    if any(rows[i][i] == 0 for i in range(n)):
+        raise ValueError('матрица вырождена')
+    order = range(n) if lower else range(n - 1, -1, -1)
+    result = [[0.0] * b.size[1] for _ in range(n)]
+    for k in range(b.size[1]):
+        rhs = b._col(k)
+        x = [0.0] * n
+        for i in order:
+            known = sum(map(operator.mul, rows[i][:i], x[:i])) if lower else sum(map(operator.mul, rows[i][i + 1:], x[i + 1:]))
+            x[i] = (rhs[i] - known) / rows[i][i]
+        for i in range(n):
+            result[i][k] = x[i]
+    return Matrix._from_values(result, b.size)
+
+
+def _householder(cols: List[List[float]], others: List[List[float]]) -> List[List[float]]:
+    '''
+    Приведение столбцов к верхнетреугольному виду отражениями Хаусхолдера на месте
+    ----------
+    
+    Те же отражения применяются к столбцам others. Возвращает векторы отражений,
+    по одному на столбец (None, если отражение не потребовалось)
+    '''
+    n = len(cols[0])
+    reflectors = []
+    for j in range(len(cols)):
+        x = cols[j][j:]
+        norm = sqrt(sum(map(operator.mul, x, x)))
+        if norm == 0:
+            reflectors.append(None)
+            continue
+        v = x
+        v[0] += copysign(norm, x[0])
+        v_norm2 = sum(map(operator.mul, v, v))
+        for col in cols[j:] + others:
+            tail = col[j:]
+            scale = 2.0 * sum(map(operator.mul, v, tail)) / v_norm2
+            col[j:] = map(operator.sub, tail, map(operator.mul, v, repeat(scale)))
+        reflectors.append(v)
+    return reflectors
+
+
+def qr(A: Matrix) -> Tuple[Matrix, Matrix]:
+    '''
+    QR-разложение отражениями Хаусхолдера (сокращённое): A = Q @ R
+    ----------
+    
+    Параметры
+    ----------
+    A: Matrix
+        Матрица размера n x k, где n >= k
+        
+    Возвращает
+    ----------
+    tuple(Matrix, Matrix)
+        Матрица Q размера n x k с ортонормированными столбцами и
+        верхнетреугольная матрица R размера k x k
+    '''
+    if not isinstance(A, Matrix):
+        raise ValueError('только для матриц')
+    n, k = A.size
+    if n < k:
+        raise ValueError('строк должно быть не меньше, чем столбцов')
+    cols = [list(A._col(j)) for j in range(k)]
+    reflectors = _householder(cols, [])
+    R = [[cols[j][i] if j >= i else 0.0 for j in range(k)] for i in range(k)]
+    # Q получается применением отражений в обратном порядке к первым k столбцам единичной матрицы
+    q_cols = [[1.0 if i == j else 0.0 for i in range(n)] for j in range(k)]
+    for j in range(k - 1, -1, -1):
+        v = reflectors[j]
+        if v is None:
+            continue
+        v_norm2 = sum(map(operator.mul, v, v))
+        for col in q_cols:
+            tail = col[j:]
+            scale = 2.0 * sum(map(operator.mul, v, tail)) / v_norm2
+            col[j:] = map(operator.sub, tail, map(operator.mul, v, repeat(scale)))
+    Q = [list(row) for row in zip(*q_cols)]
+    return Matrix._from_values(Q, (n, k)), Matrix._from_values(R, (k, k))
+
+
+def qr_solve(A: Matrix, b: Matrix) -> Matrix:
+    '''
+    Решение задачи наименьших квадратов min ||A @ x - b|| через QR-разложение
+    ----------
+    
+    Отражения Хаусхолдера применяются сразу к b, поэтому матрица Q не строится
+    
+    Параметры
+    ----------
+    A: Matrix
+        Матрица размера n x k, где n >= k
+    b: Matrix
+        Правая часть размера n x m
+        
+    Возвращает
+    ----------
+    Matrix
+        Решение x размера k x m
+    '''
+    if not isinstance(A, Matrix) or not isinstance(b, Matrix):
+        raise ValueError('только для матриц')
+    n, k = A.size
+    if n < k:
+        raise ValueError('строк должно быть не меньше, чем столбцов')
+    if b.size[0] != n:
+        raise ValueError('размеры матриц не совпадают')
+    cols = [list(A._col(j)) for j in range(k)]
+    rhs = [list(b._col(j)) for j in range(b.size[1])]
+    _householder(cols, rhs)
+    R = Matrix._from_values([[cols[j][i] if j >= i else 0.0 for j in range(k)] for i in range(k)], (k, k))
+    top = Matrix._from_values([[col[i] for col in rhs] for i in range(k)], (k, b.size[1]))
+    return solve_triangular(R, top, lower=False)
\ No newline at end of file
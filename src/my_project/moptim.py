@@ -0,0 +1,207 @@
+from __future__ import annotations
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, List
+from math import sqrt
+
+
+class ConstantLR:
+    '''
+    Постоянная скорость обучения
+    ----------
+    '''
+    def __call__(self, learning_rate: float, epoch: int) -> float:
+        return learning_rate
+
+
+class StepLR:
+    '''
+    Уменьшение скорости обучения в gamma раз каждые step_size эпох
+    ----------
+
+    Параметры
+    ----------
+    step_size: int
+        Количество эпох между уменьшениями
+    gamma: float
+        Множитель скорости обучения
+    '''
+    def __init__(self, step_size: int = 10, gamma: float = 0.5):
+        if step_size < 1:
+            raise ValueError('step_size должен быть положительным')
+        self.step_size = step_size
+        self.gamma = gamma
+
+    def __call__(self, learning_rate: float, epoch: int) -> float:
+        return learning_rate * self.gamma ** (epoch // self.step_size)
+
+
+class ExponentialLR:
+    '''
+    Экспоненциальное уменьшение скорости обучения: lr * gamma ** epoch
+    ----------
+
+    Параметры
+    ----------
+    gamma: float
+        Множитель скорости обучения за одну эпоху
+    '''
+    def __init__(self, gamma: float = 0.95):
+        self.gamma = gamma
+
+    def __call__(self, learning_rate: float, epoch: int) -> float:
+        return learning_rate * self.gamma ** epoch
+
+
+class InverseTimeLR:
+    '''
+    Уменьшение скорости обучения обратно пропорционально времени: lr / (1 + decay * epoch)
+    ----------
+
+    Параметры
+    ----------
+    decay: float
+        Скорость затухания
+    '''
+    def __init__(self, decay: float = 0.01):
+        self.decay = decay
+
+    def __call__(self, learning_rate: float, epoch: int) -> float:
+        return learning_rate / (1.0 + self.decay * epoch)
+
+
+class SGD:
+    '''
+    Градиентный спуск: params - lr * grads
+    ----------
+
+    Параметры
+    ----------
+    learning_rate: float
+        Скорость обучения
+    schedule: callable | None
+        Расписание скорости обучения, вызывается как schedule(learning_rate, epoch)
+
+    Атрибуты
+    ----------
+    lr: float
+        Скорость обучения на текущей эпохе
+    '''
+    def __init__(self, learning_rate: float = 0.01, schedule: Optional[callable] = None):
+        self.learning_rate = learning_rate
+        self.schedule = schedule if schedule else ConstantLR()
+        self.lr = learning_rate
+
+    def reset(self, n_params: int) -> None:
+        '''
+        Подготовка состояния оптимизатора перед обучением
+        ----------
+
+        Параметры
+        ----------
+        n_params: int
+            Количество обучаемых параметров
+        '''
+        self.lr = self.learning_rate
+
+    def start_epoch(self, epoch: int) -> None:
+        '''
+        Обновление скорости обучения в начале эпохи
+        ----------
+
+        Параметры
+        ----------
+        epoch: int
+            Номер эпохи, начиная с 0
+        '''
+        self.lr = self.schedule(self.learning_rate, epoch)
+
+    def step(self, params: List[float], grads: List[float]) -> List[float]:
+        '''
+        Один шаг оптимизации
+        ----------
+
+        Параметры
+        ----------
+        params: list[float]
+            Текущие значения параметров
+        grads: list[float]
+            Градиент функции потерь по параметрам
+
+        Возвращает
+        ----------
+        list[float]
+            Новые значения параметров
+        '''
+        lr = self.lr
+        return [p - lr * g for p, g in zip(params, grads)]
+
+
+class Momentum(SGD):
+    '''
+    Градиентный спуск с моментом (тяжёлый шарик)
+    ----------
+
+    Параметры
+    ----------
+    learning_rate: float
+        Скорость обучения
+    momentum: float
+        Доля предыдущего шага, сохраняемая в текущем
+    schedule: callable | None
+        Расписание скорости обучения
+    '''
+    def __init__(self, learning_rate: float = 0.01, momentum: float = 0.9, schedule: Optional[callable] = None):
+        super().__init__(learning_rate, schedule)
+        self.momentum = momentum
+
+    def reset(self, n_params: int) -> None:
+        super().reset(n_params)
+        self.velocity = [0.0] * n_params
+
+    def step(self, params: List[float], grads: List[float]) -> List[float]:
+        lr, momentum = self.lr, self.momentum
+        self.velocity = [momentum * v - lr * g for v, g in zip(self.velocity, grads)]
+        return [p + v for p, v in zip(params, self.velocity)]
+
+
+class Adam(SGD):
+    '''
+    Адаптивная оценка моментов (Adam)
+    ----------
+
+    Параметры
+    ----------
+    learning_rate: float
+        Скорость обучения
+    beta1: float
+        Коэффициент затухания для среднего градиента
+    beta2: float
+        Коэффициент затухания для среднего квадрата градиента
+    eps: float
+        Добавка для устойчивости деления
+    schedule: callable | None
+        Расписание скорости обучения
+    '''
+    def __init__(self, learning_rate: float = 0.001, beta1: float = 0.9, beta2: float = 0.999,
+                 eps: float = 1e-8, schedule: Optional[callable] = None):
+        super().__init__(learning_rate, schedule)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+
+    def reset(self, n_params: int) -> None:
+        super().reset(n_params)
+        self.m = [0.0] * n_params
+        self.v = [0.0] * n_params
+        self.t = 0
+
+    def step(self, params: List[float], grads: List[float]) -> List[float]:
+        beta1, beta2 = self.beta1, self.beta2
+        self.t += 1
+        self.m = [beta1 * m + (1.0 - beta1) * g for m, g in zip(self.m, grads)]
+        self.v = [beta2 * v + (1.0 - beta2) * g * g for v, g in zip(self.v, grads)]
+        # поправка на смещение моментов к нулю в начале обучения
+        lr = self.lr * sqrt(1.0 - beta2 ** self.t) / (1.0 - beta1 ** self.t)
+        eps = self.eps
+        return [p - lr * m / (sqrt(v) + eps) for p, m, v in zip(params, self.m, self.v)]
@@ -0,0 +1,265 @@
+'''
+Параллельное выполнение матричных ядер в нескольких процессах
+----------
+
+Режим включается явно:
+
+    with mparallel.ParallelBackend(workers=8):
+        model.fit(X, y)
+
+Внутри блока Matrix.matmul и Linear_Regression.fit делят строки на блоки и
+обрабатывают их в ProcessPoolExecutor. Данные передаются процессам через
+multiprocessing.shared_memory: матрица копируется в разделяемую память один раз
+(для fit - один раз на всё обучение), а каждой задаче передаются только имя
+сегмента и границы блока. Частичные результаты (градиенты, X^T X) суммируются
+в основном процессе.
+'''
+from __future__ import annotations
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, List, Tuple
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+from my_project import mkernels
+import my_project.mmath as mm
+from my_project.mstats import RegressionStats
+
+
+def _attach_rows(name: str, cols: int, start: int, stop: int) -> array:
+    '''
+    Копия строк start:stop построчной матрицы из разделяемой памяти в array('d')
+    ----------
+    '''
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        block = array('d')
+        block.frombytes(shm.buf[start * cols * 8:stop * cols * 8])
+        return block
+    finally:
+        shm.close()
+
+
+def _block_rows(block: array, cols: int):
+    return (block[i:i + cols] for i in range(0, len(block), cols))
+
+
+def _block_cols(block: array, cols: int) -> List[memoryview]:
+    view = memoryview(block)
+    return [view[j::cols] for j in range(cols)]
+
+
+def _matmul_block(a_name: str, a_cols: int, b_name: str, b_size: Tuple[int, int],
+                  out_name: str, start: int, stop: int) -> None:
+    '''
+    Вычисление строк start:stop произведения A @ B в процессе-исполнителе
+    ----------
+    '''
+    a_block = _attach_rows(a_name, a_cols, start, stop)
+    b_data = _attach_rows(b_name, b_size[1], 0, b_size[0])
+    result = array('d')
+    if b_size[1] == 1:
+        mkernels.matvec(_block_rows(a_block, a_cols), b_data, result)
+    else:
+        mkernels.matmul(_block_rows(a_block, a_cols), [b_data[j::b_size[1]] for j in range(b_size[1])], result)
+    shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        shm.buf[start * b_size[1] * 8:stop * b_size[1] * 8] = result.tobytes()
+    finally:
+        shm.close()
+
+
+def _gd_block(x_name: str, y_name: str, cols: int, start: int, stop: int,
+              weights: List[float], bias: float) -> Tuple[List[float], float, float]:
+    '''
+    Суммы для градиента по блоку строк start:stop в процессе-исполнителе
+    ----------
+    '''
+    block = _attach_rows(x_name, cols, start, stop)
+    targets = _attach_rows(y_name, 1, start, stop)
+    residuals = array('d', bytes(8 * (stop - start)))
+    return mkernels.gd_epoch(_block_rows(block, cols), _block_cols(block, cols), targets, weights, bias, residuals)
+
+
+def _stats_block(x_name: str, y_name: str, cols: int, start: int, stop: int) -> RegressionStats:
+    '''
+    Достаточные статистики нормальных уравнений по блоку строк в процессе-исполнителе
+    ----------
+    '''
+    block = _attach_rows(x_name, cols, start, stop)
+    targets = _attach_rows(y_name, 1, start, stop)
+    return RegressionStats.from_columns(_block_cols(block, cols), targets)
+
+
+def _to_shared(matrix: mm.Matrix) -> shared_memory.SharedMemory:
+    '''
+    Копирование значений матрицы построчно в новый сегмент разделяемой памяти
+    ----------
+    '''
+    rows, cols = matrix.size
+    if isinstance(matrix, mm.ArrayMatrix):
+        flat = matrix._flat()
+    else:
+        flat = array('d')
+        for row in matrix.values:
+            flat.extend(row)
+    shm = shared_memory.SharedMemory(create=True, size=max(rows * cols * 8, 8))
+    shm.buf[:rows * cols * 8] = memoryview(flat).cast('B')
+    return shm
+
+
+def _release(*segments: shared_memory.SharedMemory) -> None:
+    for shm in segments:
+        shm.close()
+        shm.unlink()
+
+
+class SharedDataset:
+    '''
+    Обучающие данные X, y в разделяемой памяти на время обучения
+    ----------
+
+    Параметры
+    ----------
+    backend: ParallelBackend
+        Параллельный режим, в котором выполняются задачи
+    X: Matrix
+        Матрица признаков
+    y: Matrix
+        Столбец целевых значений
+    '''
+    def __init__(self, backend: ParallelBackend, X: mm.Matrix, y: mm.Matrix):
+        self.backend = backend
+        self.size = X.size
+        self._x = _to_shared(X)
+        self._y = _to_shared(y)
+
+    def __enter__(self) -> SharedDataset:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        '''
+        Освобождение разделяемой памяти
+        ----------
+        '''
+        if self._x is not None:
+            _release(self._x, self._y)
+            self._x = self._y = None
+
+    def gd_epoch(self, weights: List[float], bias: float) -> Tuple[List[float], float, float]:
+        '''
+        Суммы для градиента по всем строкам, посчитанные по блокам параллельно
+        ----------
+
+        Возвращает то же, что mkernels.gd_epoch: X^T r, сумму остатков и сумму их квадратов
+        '''
+        rows, cols = self.size
+        futures = [self.backend._executor.submit(_gd_block, self._x.name, self._y.name, cols, start, stop, weights, bias)
+                   for start, stop in self.backend._blocks(rows)]
+        grad, errors_sum, squared_sum = [0.0] * cols, 0.0, 0.0
+        for future in futures:
+            part_grad, part_errors, part_squared = future.result()
+            grad = [a + b for a, b in zip(grad, part_grad)]
+            errors_sum += part_errors
+            squared_sum += part_squared
+        return grad, errors_sum, squared_sum
+
+    def stats(self) -> RegressionStats:
+        '''
+        Достаточные статистики нормальных уравнений, посчитанные по блокам параллельно
+        ----------
+        '''
+        rows, cols = self.size
+        futures = [self.backend._executor.submit(_stats_block, self._x.name, self._y.name, cols, start, stop)
+                   for start, stop in self.backend._blocks(rows)]
+        stats = RegressionStats()
+        for future in futures:
+            stats.merge(future.result())
+        return stats
+
+
+class ParallelBackend:
+    '''
+    Параллельный режим для Matrix.matmul и Linear_Regression.fit
+    ----------
+
+    Пока режим активен (внутри блока with), умножение матриц и эпохи полного
+    градиентного спуска и накопление статистик для solver='normal' выполняются
+    по блокам строк в пуле процессов. Матрицы меньше min_rows строк считаются
+    в текущем процессе, так как для них накладные расходы больше выигрыша
+
+    Параметры
+    ----------
+    workers: int | None
+        Количество процессов, по умолчанию os.cpu_count()
+    min_rows: int
+        Наименьшее количество строк, начиная с которого работа делится между процессами
+    blocks_per_worker: int
+        Количество блоков строк на один процесс для выравнивания нагрузки
+    '''
+    def __init__(self, workers: Optional[int] = None, min_rows: int = 50000, blocks_per_worker: int = 2):
+        if workers is not None and workers < 1:
+            raise ValueError('workers должен быть положительным')
+        self.workers = workers if workers else os.cpu_count() or 1
+        self.min_rows = min_rows
+        self.blocks_per_worker = blocks_per_worker
+        self._executor = None
+        self._previous = None
+
+    def __enter__(self) -> ParallelBackend:
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._previous = mm._parallel_backend
+        mm._parallel_backend = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        mm._parallel_backend = self._previous
+        self._executor.shutdown()
+        self._executor = None
+
+    def accepts(self, rows: int) -> bool:
+        '''
+        Стоит ли делить работу над матрицей из rows строк между процессами
+        ----------
+        '''
+        return self._executor is not None and rows >= self.min_rows
+
+    def _blocks(self, rows: int) -> List[Tuple[int, int]]:
+        count = min(rows, self.workers * self.blocks_per_worker)
+        bounds = [rows * k // count for k in range(count + 1)]
+        return [(bounds[k], bounds[k + 1]) for k in range(count) if bounds[k] < bounds[k + 1]]
+
+    def matmul(self, a: mm.Matrix, b: mm.Matrix) -> array:
+        '''
+        Произведение A @ B по блокам строк A
+        ----------
+
+        Возвращает
+        ----------
+        array
+            Значения результата построчно
+        '''
+        rows, p = a.size[0], b.size[1]
+        a_shm, b_shm = _to_shared(a), _to_shared(b)
+        out_shm = shared_memory.SharedMemory(create=True, size=max(rows * p * 8, 8))
+        try:
+            futures = [self._executor.submit(_matmul_block, a_shm.name, a.size[1], b_shm.name, b.size, out_shm.name, start, stop)
+                       for start, stop in self._blocks(rows)]
+            for future in futures:
+                future.result()
+            result = array('d')
+            result.frombytes(out_shm.buf[:rows * p * 8])
+            return result
+        finally:
+            _release(a_shm, b_shm, out_shm)
+
+    def share(self, X: mm.Matrix, y: mm.Matrix) -> SharedDataset:
+        '''
+        Размещение обучающих данных в разделяемой памяти
+        ----------
+        '''
+        return SharedDataset(self, X, y)
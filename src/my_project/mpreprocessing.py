@@ -0,0 +1,230 @@
+from __future__ import annotations
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, List, Tuple, Any
+from array import array
+import my_project.mmath as mm
+
+
+def _row(values: List[float]) -> mm.ArrayMatrix:
+    return mm.ArrayMatrix._from_buffer(array('d', values), (1, len(values)))
+
+
+class StandardScaler:
+    '''
+    Стандартизация признаков: (x - mean) / std по каждому столбцу
+    ----------
+
+    Статистики можно накапливать по частям данных (partial_fit), части
+    объединяются по формуле Чана без повторного прохода по уже учтённым строкам.
+    Столбцы с нулевым разбросом делятся на 1
+
+    Атрибуты
+    ----------
+    n_samples_seen_: int
+        Количество учтённых строк
+    mean_: list[float]
+        Средние значения столбцов
+    var_: list[float]
+        Дисперсии столбцов
+    scale_: list[float]
+        Стандартные отклонения столбцов, на которые делятся признаки
+    '''
+    def __init__(self):
+        self.n_samples_seen_ = 0
+        self.mean_ = self.var_ = self.scale_ = None
+
+    @property
+    def fitted(self) -> bool:
+        return self.n_samples_seen_ > 0
+
+    def fit(self, X: mm.Matrix) -> StandardScaler:
+        '''
+        Вычисление средних и стандартных отклонений столбцов
+        ----------
+
+        Параметры
+        ----------
+        X: Matrix
+            Матрица признаков
+
+        Возвращает
+        ----------
+        StandardScaler
+            Этот же объект
+        '''
+        self.n_samples_seen_ = 0
+        return self.partial_fit(X)
+
+    def partial_fit(self, X: mm.Matrix) -> StandardScaler:
+        '''
+        Учёт очередной части данных в средних и дисперсиях
+        ----------
+
+        Параметры
+        ----------
+        X: Matrix
+            Очередная часть матрицы признаков
+
+        Возвращает
+        ----------
+        StandardScaler
+            Этот же объект
+        '''
+        if not isinstance(X, mm.Matrix):
+            raise ValueError('только для матриц')
+        n = X.size[0]
+        mean = X.mean(axis=0)._row(0)
+        m2 = [v * n for v in X.var(axis=0)._row(0)]
+        if not self.fitted:
+            self.mean_, self._m2 = list(mean), m2
+        else:
+            if len(mean) != len(self.mean_):
+                raise ValueError('количество признаков в частях не совпадает')
+            seen = self.n_samples_seen_
+            total = seen + n
+            deltas = [b - a for a, b in zip(self.mean_, mean)]
+            self.mean_ = [a + delta * n / total for a, delta in zip(self.mean_, deltas)]
+            self._m2 = [a + b + delta * delta * seen * n / total for a, b, delta in zip(self._m2, m2, deltas)]
+        self.n_samples_seen_ += n
+        self.var_ = [m / self.n_samples_seen_ for m in self._m2]
+        self.scale_ = [v ** 0.5 if v > 0 else 1.0 for v in self.var_]
+        return self
+
+    def _check_fitted(self, X: mm.Matrix) -> None:
+        if not self.fitted:
+            raise ValueError('StandardScaler ещё не обучен')
+        if X.size[1] != len(self.mean_):
+            raise ValueError('количество признаков не совпадает с обучающими данными')
+
+    def transform(self, X: mm.Matrix) -> mm.Matrix:
+        '''
+        Стандартизация матрицы признаков
+        ----------
+
+        Параметры
+        ----------
+        X: Matrix
+            Матрица признаков
+
+        Возвращает
+        ----------
+        Matrix
+            Новая матрица со стандартизованными признаками
+        '''
+        self._check_fitted(X)
+        result = X.sub(_row(self.mean_))
+        return result.truediv(_row(self.scale_), out=result)
+
+    def fit_transform(self, X: mm.Matrix) -> mm.Matrix:
+        return self.fit(X).transform(X)
+
+    def inverse_transform(self, X: mm.Matrix) -> mm.Matrix:
+        '''
+        Возврат стандартизованных признаков к исходному масштабу
+        ----------
+        '''
+        self._check_fitted(X)
+        result = X.mul(_row(self.scale_))
+        return result.add(_row(self.mean_), out=result)
+
+    def unscale(self, weights: List[float], bias: float) -> Tuple[List[float], float]:
+        '''
+        Веса и смещение модели на стандартизованных признаках в пересчёте на исходные
+        ----------
+
+        Из w^T (x - mean) / std + b следует w' = w / std и b' = b - w'^T mean
+
+        Параметры
+        ----------
+        weights: list[float]
+            Веса для стандартизованных признаков
+        bias: float
+            Смещение для стандартизованных признаков
+
+        Возвращает
+        ----------
+        tuple(list[float], float)
+            Веса и смещение для исходных признаков
+        '''
+        raw = [w / s for w, s in zip(weights, self.scale_)]
+        return raw, bias - sum(w * m for w, m in zip(raw, self.mean_))
+
+
+class Pipeline:
+    '''
+    Последовательность преобразований признаков и модель в конце
+    ----------
+
+    Если перед Linear_Regression с solver='gd' стоит StandardScaler, он
+    встраивается в градиентный спуск (Linear_Regression.fit(..., scaler=...)):
+    стандартизованная копия X не создаётся, а модель получает веса для
+    исходных признаков, поэтому при предсказании этот шаг пропускается
+
+    Параметры
+    ----------
+    steps: list
+        Преобразователи с методами fit_transform и transform, последний
+        элемент - модель с методами fit и predict
+    '''
+    def __init__(self, steps: List[Any]):
+        if not steps:
+            raise ValueError('steps не должен быть пустым')
+        self.steps = list(steps)
+        self._fused = False
+
+    def fit(self, X: mm.Matrix, y: mm.Matrix) -> Pipeline:
+        '''
+        Обучение преобразователей и модели
+        ----------
+
+        Параметры
+        ----------
+        X: Matrix
+            Матрица признаков
+        y: Matrix
+            Вектор целевых значений
+
+        Возвращает
+        ----------
+        Pipeline
+            Этот же объект
+        '''
+        from my_project.ml import Linear_Regression
+        *transformers, model = self.steps
+        self._fused = bool(transformers) and isinstance(transformers[-1], StandardScaler) \
+            and isinstance(model, Linear_Regression) and model.solver == 'gd'
+        for step in transformers[:-1] if self._fused else transformers:
+            X = step.fit_transform(X)
+        if self._fused:
+            model.fit(X, y, scaler=transformers[-1].fit(X))
+        else:
+            model.fit(X, y)
+        return self
+
+    def transform(self, X: mm.Matrix) -> mm.Matrix:
+        '''
+        Применение преобразований, которые нужны модели при предсказании
+        ----------
+        '''
+        transformers = self.steps[:-1]
+        for step in transformers[:-1] if self._fused else transformers:
+            X = step.transform(X)
+        return X
+
+    def predict(self, X: mm.Matrix) -> mm.Matrix:
+        '''
+        Предсказание модели на преобразованных признаках
+        ----------
+
+        Параметры
+        ----------
+        X: Matrix
+            Матрица со входными данными
+
+        Возвращает
+        ----------
+        Matrix
+            Предсказания модели
+        '''
+        return self.steps[-1].predict(self.transform(X))
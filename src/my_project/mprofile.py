@@ -0,0 +1,266 @@
+'''
+Профилирование операций с матрицами и обучения Linear_Regression
+----------
+
+Профилирование включается явно и только на время блока with:
+
+    with mprofile.Profiler(on_epoch=print) as profiler:
+        model.fit(X, y)
+    print(profiler.summary())
+
+На входе в блок методы Matrix, ArrayMatrix и Linear_Regression, функции
+mkernels и разбора файлов заменяются обёртками, которые считают вызовы,
+время (полное и собственное, без вложенных замеренных вызовов) и количество
+элементов и байт в созданных результатах. На выходе исходные функции
+возвращаются на место, поэтому вне блока профилирование ничего не стоит.
+
+Каждая эпоха градиентного спуска дополнительно записывается в
+Linear_Regression.epoch_times_ (в пару к losses_) и передаётся в on_epoch.
+Время эпохи считается от _start_epoch до _end_epoch модели, поэтому при
+обучении по потоку частей это время всего прохода, а не одной части.
+Новое обучение модели удаляет epoch_times_, поэтому после обучения без
+профилирования устаревших времён не остаётся.
+'''
+from __future__ import annotations
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, List, Dict, Tuple, Any, Callable
+from array import array
+from math import nan
+import sys
+import time
+from my_project import mdata_reader, mkernels, ml, mstats
+import my_project.mmath as mm
+
+# Что замеряется: (владелец, имя атрибута, способ подсчёта созданных элементов)
+# result - по возвращённому значению, self - по самому объекту (конструкторы),
+# copy - по объекту, если буфер был разделён и метод его скопировал
+_TARGETS = [
+    (mm.Matrix, '__init__', 'self'),
+    (mm.Matrix, 'matmul', 'result'),
+    (mm.Matrix, 'T', 'result'),
+    (mm.Matrix, 'add', 'result'),
+    (mm.Matrix, 'sub', 'result'),
+    (mm.Matrix, 'mul', 'result'),
+    (mm.Matrix, 'truediv', 'result'),
+    (mm.Matrix, 'pow', 'result'),
+    (mm.Matrix, 'sum', 'result'),
+    (mm.Matrix, 'mean', 'result'),
+    (mm.Matrix, 'var', 'result'),
+    (mm.Matrix, 'addcol', 'result'),
+    (mm.Matrix, 'addrow', 'result'),
+    (mm.Matrix, '_flat', 'result'),
+    (mm.ArrayMatrix, '__init__', 'self'),
+    (mm.ArrayMatrix, 'T', 'result'),
+    (mm.ArrayMatrix, 'addcol', 'result'),
+    (mm.ArrayMatrix, 'addrow', 'result'),
+    (mm.ArrayMatrix, 'tolist', 'result'),
+    (mm.ArrayMatrix, '_flat', 'result'),
+    (mm.ArrayMatrix, '_ensure_owned', 'copy'),
+    (mkernels, 'matmul', 'result'),
+    (mkernels, 'matvec', 'result'),
+    (mkernels, 'affine', 'result'),
+    (mkernels, 'affine_cols', 'result'),
+    (mkernels, 'gram', 'result'),
+    (mkernels, 'gd_epoch', 'result'),
+    (mkernels, 'gd_epoch_cols', 'result'),
+    (mkernels, 'batch_gradient', 'result'),
+    (mdata_reader, 'read_data', 'result'),
+    (mdata_reader, '_parse_bulk', 'result'),
+    (mdata_reader, '_parse_rows', 'result'),
+    (mstats.RegressionStats, 'solve', 'result'),
+    (mstats.RegressionStats, 'mse', 'result'),
+    (ml.Linear_Regression, 'fit', 'result'),
+    (ml.Linear_Regression, 'partial_fit', 'result'),
+    (ml.Linear_Regression, '_start_epoch', 'result'),
+    (ml.Linear_Regression, '_gd_update', 'result'),
+    (ml.Linear_Regression, '_end_epoch', 'result'),
+    (ml.Linear_Regression, '_loss_grad', 'result'),
+    (ml.Linear_Regression, '_validation_loss', 'result'),
+    (ml.Linear_Regression, '_fit_qr', 'result'),
+    (ml.Linear_Regression, 'predict', 'result'),
+    (ml.Linear_Regression, 'predict_one', 'result'),
+]
+
+_active = None
+
+
+def _allocated(value) -> Tuple[int, int]:
+    '''
+    Количество элементов и байт в значении, созданном замеренным вызовом
+    ----------
+
+    Представления ArrayMatrix, разделяющие чужой буфер, не создают элементов.
+    Для матриц на списках байты оцениваются по спискам строк и объектам float
+    '''
+    if isinstance(value, mm.ArrayMatrix):
+        if value._shared:
+            return 0, 0
+        count = value.size[0] * value.size[1]
+        return count, count * value._data.itemsize
+    if isinstance(value, mm.Matrix):
+        rows = value.values
+        count = value.size[0] * value.size[1]
+        return count, sum(map(sys.getsizeof, rows)) + count * sys.getsizeof(0.0)
+    if isinstance(value, array):
+        return len(value), len(value) * value.itemsize
+    if isinstance(value, list) and value and isinstance(value[0], float):
+        return len(value), sys.getsizeof(value) + len(value) * sys.getsizeof(0.0)
+    return 0, 0
+
+
+class _Stat:
+    __slots__ = ('calls', 'total', 'own', 'elements', 'bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = self.own = 0.0
+        self.elements = self.bytes = 0
+
+
+class Profiler:
+    '''
+    Счётчики вызовов, времени и созданных элементов по операциям
+    ----------
+
+    Параметры
+    ----------
+    on_epoch: callable | None
+        Вызывается после каждой эпохи градиентного спуска как
+        on_epoch(model, epoch, seconds, loss)
+
+    Атрибуты
+    ----------
+    stats: dict
+        Счётчики по названиям операций вида 'ArrayMatrix.T'
+    epochs: list[tuple(int, float, float)]
+        Номер, время в секундах и потеря каждой эпохи градиентного спуска
+    '''
+    def __init__(self, on_epoch: Optional[Callable[[Any, int, float, float], None]] = None):
+        self.on_epoch = on_epoch
+        self.stats: Dict[str, _Stat] = {}
+        self.epochs: List[Tuple[int, float, float]] = []
+        self._originals = []
+        self._children = []
+        self._epoch_starts = {}
+
+    def __enter__(self) -> Profiler:
+        global _active
+        if _active is not None:
+            raise ValueError('профилирование уже включено')
+        _active = self
+        for owner, name, kind in _TARGETS:
+            original = owner.__dict__[name]
+            label = f'{owner.__name__.rpartition(".")[2]}.{name}'
+            self._originals.append((owner, name, original))
+            setattr(owner, name, self._wrap(original, label, kind))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _active
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+        self._children = []
+        self._epoch_starts = {}
+        _active = None
+
+    def _wrap(self, original, label: str, kind: str):
+        if isinstance(original, staticmethod):
+            return staticmethod(self._wrap(original.__func__, label, kind))
+        stat = self.stats.setdefault(label, _Stat())
+        children = self._children
+        clock = time.perf_counter
+        epoch_starts = self._epoch_starts
+        starts_epoch = label == 'Linear_Regression._start_epoch'
+        ends_epoch = label == 'Linear_Regression._end_epoch'
+
+        def wrapper(*args, **kwargs):
+            was_shared = kind == 'copy' and args[0]._shared
+            children.append(0.0)
+            start = clock()
+            if starts_epoch:
+                epoch_starts[id(args[0])] = start
+            try:
+                result = original(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                nested = children.pop()
+                if children:
+                    children[-1] += elapsed
+                stat.calls += 1
+                stat.total += elapsed
+                stat.own += elapsed - nested
+            if kind == 'result' or kind == 'self' or was_shared:
+                elements, size = _allocated(result if kind == 'result' else args[0])
+                stat.elements += elements
+                stat.bytes += size
+            if ends_epoch:
+                epoch_start = epoch_starts.pop(id(args[0]), None)
+                if epoch_start is not None:
+                    self._record_epoch(args[0], clock() - epoch_start)
+            return result
+
+        wrapper.__wrapped__ = original
+        wrapper.__name__ = original.__name__
+        wrapper.__doc__ = original.__doc__
+        return wrapper
+
+    def _record_epoch(self, model, seconds: float) -> None:
+        '''
+        Запись времени эпохи рядом с её потерей в model.losses_
+        ----------
+        '''
+        losses = model.losses_
+        times = model.__dict__.setdefault('epoch_times_', [])
+        # эпохи до включения профилирования не замерены
+        times.extend([nan] * (len(losses) - 1 - len(times)))
+        times.append(seconds)
+        self.epochs.append((model._epoch, seconds, losses[-1]))
+        if self.on_epoch is not None:
+            self.on_epoch(model, model._epoch, seconds, losses[-1])
+
+    def report(self, sort: str = 'own') -> List[Dict[str, Any]]:
+        '''
+        Счётчики по операциям, у которых были вызовы
+        ----------
+
+        Параметры
+        ----------
+        sort: str
+            Поле для сортировки по убыванию: 'own', 'total', 'calls', 'elements' или 'bytes'
+
+        Возвращает
+        ----------
+        list[dict]
+            name, calls, total, own (секунды), elements, bytes
+        '''
+        if sort not in _Stat.__slots__:
+            raise ValueError(f'sort должен быть одним из: {", ".join(_Stat.__slots__)}')
+        rows = [{'name': name, **{field: getattr(stat, field) for field in _Stat.__slots__}}
+                for name, stat in self.stats.items() if stat.calls]
+        return sorted(rows, key=lambda row: row[sort], reverse=True)
+
+    def summary(self, sort: str = 'own', limit: Optional[int] = None) -> str:
+        '''
+        Таблица счётчиков по операциям
+        ----------
+
+        Параметры
+        ----------
+        sort: str
+            Поле для сортировки по убыванию, как в report
+        limit: int | None
+            Количество выводимых операций, по умолчанию все
+        '''
+        rows = self.report(sort)[:limit]
+        lines = [f'{"операция":<34}{"вызовов":>9}{"всего, с":>11}{"своё, с":>11}{"среднее, мс":>13}'
+                 f'{"элементов":>13}{"МБ":>9}']
+        for row in rows:
+            lines.append(f'{row["name"]:<34}{row["calls"]:>9}{row["total"]:>11.4f}{row["own"]:>11.4f}'
+                         f'{row["total"] / row["calls"] * 1000:>13.3f}{row["elements"]:>13,}'
+                         f'{row["bytes"] / 2 ** 20:>9.2f}')
+        return '\n'.join(lines)
+
+    def __str__(self) -> str:
+        return self.summary()
@@ -0,0 +1,352 @@
+'''
+Сервер предсказаний на asyncio с объединением запросов в микро-батчи
+----------
+
+Протокол строковый поверх TCP: клиент отправляет строку с JSON-массивом
+признаков и получает строку с предсказанием - JSON-числом или объектом
+{"error": ...}. Строка STATS возвращает JSON со счётчиками сервера.
+
+Запросы из всех соединений попадают в общую очередь. Фоновая задача ждёт
+первый запрос, затем собирает следующие в течение max_delay секунд (или
+пока не наберётся max_batch) и считает весь батч одним вызовом
+Linear_Regression.predict_iter. Ошибка в запросе возвращается только его
+клиенту, задача сбора батчей при этом продолжает работать.
+
+Запуск:
+
+    python -m my_project.mserver model.bin --port 8765
+    python -m my_project.mserver model.bin --bench
+'''
+from __future__ import annotations
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, List, Dict, Any, Tuple
+from collections import deque
+import argparse
+import asyncio
+import json
+from math import isfinite
+import random
+import time
+
+
+def load_model(path: str):
+    '''
+    Загрузка обученной модели из файла Linear_Regression.save
+    ----------
+
+    pickle не загружается: он может выполнить произвольный код из файла
+    '''
+    from my_project.ml import Linear_Regression
+    return Linear_Regression.load(path)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    '''
+    Процентиль q (от 0 до 100) отсортированного списка
+    ----------
+    '''
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+class ScoringServer:
+    '''
+    Сервер предсказаний для обученной Linear_Regression
+    ----------
+
+    Параметры
+    ----------
+    model: Linear_Regression
+        Обученная модель
+    host: str
+        Адрес для прослушивания
+    port: int
+        Порт, 0 - выбрать свободный
+    max_batch: int
+        Наибольшее количество запросов в одном батче
+    max_delay: float
+        Сколько секунд после первого запроса батча ждать следующие, 0 - брать
+        только уже пришедшие запросы
+    latency_window: int
+        По скольким последним запросам считаются задержки p50/p99 в stats()
+
+    Атрибуты
+    ----------
+    requests: int
+        Количество обработанных запросов
+    batches: int
+        Количество вызовов модели
+    '''
+    def __init__(self, model, host: str = '127.0.0.1', port: int = 8765, max_batch: int = 256,
+                 max_delay: float = 0.002, latency_window: int = 100000):
+        if max_batch < 1:
+            raise ValueError('max_batch должен быть положительным')
+        if max_delay < 0:
+            raise ValueError('max_delay не может быть отрицательным')
+        model._check_fitted()
+        self.model = model
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.requests = 0
+        self.batches = 0
+        self._latencies = deque(maxlen=latency_window)
+        self._started = None
+        self._queue = None
+        self._server = None
+        self._batcher = None
+
+    async def start(self) -> ScoringServer:
+        '''
+        Запуск сервера и задачи, собирающей батчи
+        ----------
+        '''
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batches())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started = time.perf_counter()
+        return self
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        '''
+        Остановка сервера
+        ----------
+
+        Задача сбора батчей останавливается до возврата, а запросы, которые
+        остались в очереди или в недособранном батче, завершаются ошибкой
+        '''
+        self._server.close()
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+        error = RuntimeError('сервер остановлен')
+        while not self._queue.empty():
+            self._fail([self._queue.get_nowait()], error)
+        await self._server.wait_closed()
+
+    async def predict(self, row: List[float]) -> float:
+        '''
+        Предсказание для одной строки через общую очередь батчей
+        ----------
+        '''
+        if self._batcher.done():
+            raise RuntimeError('сервер остановлен')
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future, time.perf_counter()))
+        return await future
+
+    async def _run_batches(self) -> None:
+        '''
+        Сбор запросов в батчи и их обработка одним вызовом модели
+        ----------
+
+        После первого запроса новые запросы собираются до конца окна max_delay
+        или пока батч не заполнится. Исключение при обработке батча передаётся
+        его запросам и не останавливает цикл. При отмене задачи (close) запросы
+        собираемого батча завершаются ошибкой
+        '''
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            try:
+                deadline = loop.time() + self.max_delay
+                while len(batch) < self.max_batch:
+                    if not queue.empty():
+                        batch.append(queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                self._score(batch)
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError('сервер остановлен'))
+                raise
+            except Exception as error:
+                self._fail(batch, error)
+
+    @staticmethod
+    def _fail(batch: List[Tuple[List[float], asyncio.Future, float]], error: Exception) -> None:
+        for _, future, _ in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _score(self, batch: List[Tuple[List[float], asyncio.Future, float]]) -> None:
+        try:
+            predictions = next(self.model.predict_iter([row for row, _, _ in batch], batch_size=len(batch)))
+        except Exception:
+            # ошибка одной строки (нечисловое значение, слишком большое целое)
+            # не должна ломать остальные запросы батча
+            predictions = []
+            for row, _, _ in batch:
+                try:
+                    predictions.append(self.model.predict_one(row))
+                except Exception as error:
+                    predictions.append(error)
+        now = time.perf_counter()
+        for (_, future, started), value in zip(batch, predictions):
+            if future.done():
+                continue
+            if isinstance(value, Exception):
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+            self._latencies.append(now - started)
+        self.requests += len(batch)
+        self.batches += 1
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        '''
+        Обработка одного соединения: строка запроса - строка ответа
+        ----------
+        '''
+        try:
+            while line := await reader.readline():
+                line = line.strip()
+                if line == b'STATS':
+                    response = json.dumps(self.stats())
+                else:
+                    try:
+                        row = json.loads(line)
+                        if not isinstance(row, list):
+                            raise ValueError('запрос должен быть JSON-массивом признаков')
+                        value = await self.predict(row)
+                        if not isfinite(value):
+                            raise ValueError('предсказание не является конечным числом')
+                        response = json.dumps(value)
+                    except Exception as error:
+                        response = json.dumps({'error': str(error)})
+                writer.write(response.encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def stats(self) -> Dict[str, Any]:
+        '''
+        Счётчики сервера
+        ----------
+
+        Возвращает
+        ----------
+        dict
+            requests, batches, средний размер батча, запросов в секунду с момента
+            запуска и задержки p50/p99 в миллисекундах по последним запросам
+        '''
+        latencies = sorted(self._latencies)
+        elapsed = time.perf_counter() - self._started if self._started else 0.0
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch': self.requests / self.batches if self.batches else 0.0,
+            'throughput': self.requests / elapsed if elapsed else 0.0,
+            'p50_ms': _percentile(latencies, 50) * 1000,
+            'p99_ms': _percentile(latencies, 99) * 1000,
+        }
+
+
+async def load_test(host: str, port: int, n_features: int, n_requests: int = 20000,
+                    concurrency: int = 64) -> Dict[str, float]:
+    '''
+    Генератор нагрузки: concurrency соединений отправляют запросы по одному
+    ----------
+
+    Параметры
+    ----------
+    host: str
+        Адрес сервера
+    port: int
+        Порт сервера
+    n_features: int
+        Количество признаков в случайных запросах
+    n_requests: int
+        Общее количество запросов
+    concurrency: int
+        Количество одновременных соединений
+
+    Возвращает
+    ----------
+    dict
+        Запросов в секунду и задержки p50/p99 в миллисекундах со стороны клиента
+    '''
+    latencies = []
+    per_client = [n_requests // concurrency + (i < n_requests % concurrency) for i in range(concurrency)]
+
+    async def client(count: int) -> None:
+        reader, writer = await asyncio.open_connection(host, port)
+        rng = random.Random()
+        for _ in range(count):
+            payload = json.dumps([rng.random() for _ in range(n_features)]).encode('utf-8') + b'\n'
+            started = time.perf_counter()
+            writer.write(payload)
+            await writer.drain()
+            await reader.readline()
+            latencies.append(time.perf_counter() - started)
+        writer.close()
+        await writer.wait_closed()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(count) for count in per_client if count))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': _percentile(latencies, 50) * 1000,
+        'p99_ms': _percentile(latencies, 99) * 1000,
+    }
+
+
+async def _bench(model, n_requests: int, concurrency: int) -> None:
+    '''
+    Сравнение сервера без батчей (max_batch=1) и с микро-батчами на одном генераторе нагрузки
+    ----------
+    '''
+    n_features = len(model._weights())
+    print('| max_batch | запросов/с | p50, мс | p99, мс | средний батч |')
+    print('|---|---|---|---|---|')
+    for max_batch in (1, 256):
+        server = await ScoringServer(model, port=0, max_batch=max_batch).start()
+        result = await load_test(server.host, server.port, n_features, n_requests, concurrency)
+        stats = server.stats()
+        await server.close()
+        print(f"| {max_batch} | {result['throughput']:.0f} | {result['p50_ms']:.2f} | "
+              f"{result['p99_ms']:.2f} | {stats['mean_batch']:.1f} |")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Сервер предсказаний Linear_Regression')
+    parser.add_argument('model', help='путь к обученной модели')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-delay', type=float, default=0.002, help='окно сбора батча в секундах')
+    parser.add_argument('--bench', action='store_true', help='запустить генератор нагрузки вместо сервера')
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    args = parser.parse_args(argv)
+    model = load_model(args.model)
+    if args.bench:
+        asyncio.run(_bench(model, args.requests, args.concurrency))
+    else:
+        server = ScoringServer(model, args.host, args.port, args.max_batch, args.max_delay)
+        asyncio.run(server.serve_forever())
+
+
+if __name__ == '__main__':
+    main()
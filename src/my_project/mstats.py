@@ -0,0 +1,210 @@
+from __future__ import annotations
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, List, Union, Tuple, Sequence
+from array import array
+from itertools import repeat
+from operator import sub
+import my_project.mmath as mm
+from my_project import mkernels
+
+
+class RegressionStats:
+    '''
+    Достаточные статистики линейной регрессии: n, средние x и y и центрированные смешанные моменты
+    ----------
+
+    Статистики накапливаются по частям данных за один проход и складываются
+    между частями, файлами или процессами, после чего решение нормальных
+    уравнений и ошибка на обучающих данных получаются без повторного чтения данных:
+
+        stats = RegressionStats()
+        for chunk in iter_chunks('data.txt'):
+            stats.update(chunk, 'y')
+        model.fit_stats(stats)
+
+    Моменты хранятся относительно средних и складываются по формулам Чана, как
+    дисперсии в StandardScaler: вычитание n * mean * mean^T из X^T X теряет
+    точность, когда средние признаков велики по сравнению с их разбросом
+
+    Параметры
+    ----------
+    n_features: int | None
+        Количество признаков, по умолчанию определяется по первой части данных
+
+    Атрибуты
+    ----------
+    n: int
+        Количество учтённых строк
+    x_mean: list[float]
+        Средние столбцов X
+    y_mean: float
+        Среднее целевых значений
+    sxx: list[list[float]]
+        Матрица сумм (x - x_mean)(x - x_mean)^T
+    sxy: list[float]
+        Вектор сумм (x - x_mean)(y - y_mean)
+    syy: float
+        Сумма (y - y_mean)^2
+    '''
+    def __init__(self, n_features: Optional[int] = None):
+        self.n = 0
+        self.y_mean = 0.0
+        self.syy = 0.0
+        self.x_mean = self.sxx = self.sxy = None
+        if n_features is not None:
+            self._allocate(n_features)
+
+    def _allocate(self, d: int) -> None:
+        self.x_mean = [0.0] * d
+        self.sxx = [[0.0] * d for _ in range(d)]
+        self.sxy = [0.0] * d
+
+    @property
+    def n_features(self) -> Optional[int]:
+        return None if self.x_mean is None else len(self.x_mean)
+
+    @classmethod
+    def from_columns(cls, cols: List[Sequence[float]], targets: Sequence[float]) -> RegressionStats:
+        '''
+        Статистики для одной части данных, заданной столбцами
+        ----------
+
+        Моменты считаются по столбцам, из которых заранее вычтены средние части
+
+        Параметры
+        ----------
+        cols: list[Sequence[float]]
+            Столбцы X (list, array или memoryview)
+        targets: Sequence[float]
+            Целевые значения
+        '''
+        stats = cls(len(cols))
+        n = len(targets)
+        if not n:
+            return stats
+        stats.n = n
+        stats.x_mean = [sum(col) / n for col in cols]
+        stats.y_mean = sum(targets) / n
+        centered = [array('d', map(sub, col, repeat(mean))) for col, mean in zip(cols, stats.x_mean)]
+        y_centered = array('d', map(sub, targets, repeat(stats.y_mean)))
+        stats.sxx = mkernels.gram(centered)
+        stats.sxy = [mkernels.dot(col, y_centered) for col in centered]
+        stats.syy = mkernels.dot(y_centered, y_centered)
+        return stats
+
+    def update(self, X: mm.Matrix, y: Union[mm.Matrix, str], features: Optional[List[str]] = None) -> RegressionStats:
+        '''
+        Добавление части данных
+        ----------
+
+        Параметры
+        ----------
+        X: Matrix | DataFrame
+            Матрица признаков или часть таблицы
+        y: Matrix | str
+            Столбец целевых значений или, для DataFrame, заголовок целевого столбца
+        features: list[str] | None
+            Заголовки признаков для DataFrame, по умолчанию все столбцы кроме y
+
+        Возвращает
+        ----------
+        RegressionStats
+            Этот же объект
+        '''
+        if isinstance(y, str):
+            frame = X
+            X = frame[features if features else [label for label in frame.labels if label != y]]
+            y = frame[y]
+        n, d = X.size
+        if y.size != (n, 1):
+            raise ValueError('y должен быть столбцом той же длины, что и X')
+        return self.merge(RegressionStats.from_columns([X._col_view(j) for j in range(d)], y._col_view(0)))
+
+    def merge(self, other: RegressionStats) -> RegressionStats:
+        '''
+        Добавление статистик другой части данных на месте
+        ----------
+
+        Параметры
+        ----------
+        other: RegressionStats
+            Статистики другой части с тем же количеством признаков
+
+        Возвращает
+        ----------
+        RegressionStats
+            Этот же объект
+        '''
+        if not isinstance(other, RegressionStats):
+            raise ValueError('только для RegressionStats')
+        if other.x_mean is None:
+            return self
+        if self.x_mean is None:
+            self._allocate(len(other.x_mean))
+        elif len(self.x_mean) != len(other.x_mean):
+            raise ValueError('количество признаков в частях не совпадает')
+        if not other.n:
+            return self
+        seen, total = self.n, self.n + other.n
+        weight = seen * other.n / total
+        dx = [b - a for a, b in zip(self.x_mean, other.x_mean)]
+        dy = other.y_mean - self.y_mean
+        self.sxx = [[a + b + di * dj * weight for a, b, dj in zip(row_a, row_b, dx)]
+                    for row_a, row_b, di in zip(self.sxx, other.sxx, dx)]
+        self.sxy = [a + b + di * dy * weight for a, b, di in zip(self.sxy, other.sxy, dx)]
+        self.syy += other.syy + dy * dy * weight
+        self.x_mean = [a + delta * other.n / total for a, delta in zip(self.x_mean, dx)]
+        self.y_mean += dy * other.n / total
+        self.n = total
+        return self
+
+    def __iadd__(self, other: RegressionStats) -> RegressionStats:
+        return self.merge(other)
+
+    def __add__(self, other: RegressionStats) -> RegressionStats:
+        return RegressionStats().merge(self).merge(other)
+
+    def __repr__(self) -> str:
+        return f'RegressionStats(n={self.n}, n_features={self.n_features})'
+
+    def solve(self) -> Tuple[List[float], float]:
+        '''
+        Решение нормальных уравнений разложением Холецкого
+        ----------
+
+        Система составлена из центрированных моментов, поэтому смещение в неё
+        не входит и находится по средним
+
+        Возвращает
+        ----------
+        tuple(list[float], float)
+            Веса и смещение
+        '''
+        if not self.n:
+            raise ValueError('статистики не содержат данных')
+        L = mm.cholesky(mm.Matrix(self.sxx))
+        z = mm.solve_triangular(L, mm.Matrix([[value] for value in self.sxy]))
+        weights = mm.solve_triangular(L.T(), z, lower=False)._col(0)
+        return weights, self.y_mean - mkernels.dot(self.x_mean, weights)
+
+    def mse(self, weights: Sequence[float], bias: float) -> float:
+        '''
+        Среднеквадратичная ошибка модели на учтённых данных без второго прохода по ним
+        ----------
+
+        Параметры
+        ----------
+        weights: Sequence[float]
+            Веса модели
+        bias: float
+            Смещение модели
+        '''
+        if not self.n:
+            raise ValueError('статистики не содержат данных')
+        # остаток = центрированный остаток + постоянный сдвиг, сумма центрированных остатков равна 0
+        shift = self.y_mean - mkernels.dot(weights, self.x_mean) - bias
+        squared_sum = (self.syy - 2.0 * mkernels.dot(weights, self.sxy)
+                       + sum(w * mkernels.dot(row, weights) for w, row in zip(weights, self.sxx))
+                       + self.n * shift * shift)
+        return max(squared_sum, 0.0) / self.n
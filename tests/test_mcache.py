@@ -0,0 +1,105 @@
+'''
+Дисковый кеш разобранных файлов
+'''
+import os
+import pytest
+from my_project import mcache
+from my_project import mdata_reader as mr
+
+TEXT = 'a,b\n' + ''.join(f'{i},{i * 2}\n' for i in range(100))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return mcache.ParseCache(str(tmp_path / 'cache'))
+
+
+def _write(tmp_path, name, text=TEXT):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_hit_returns_same_frame(tmp_path, cache):
+    path = _write(tmp_path, 'a.txt')
+    first = mr.read_data(path, sep=',', cache=cache)
+    second = mr.read_data(path, sep=',', cache=cache)
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert second.tolist() == first.tolist()
+    assert second.labels == first.labels
+
+
+def test_changed_file_is_parsed_again(tmp_path, cache):
+    path = _write(tmp_path, 'a.txt')
+    mr.read_data(path, sep=',', cache=cache)
+    with open(path, 'a') as f:
+        f.write('1000,2000\n')
+    frame = mr.read_data(path, sep=',', cache=cache)
+    assert cache.misses == 2
+    assert frame.size == (101, 2)
+    assert len(cache.entries()) == 1
+
+
+def test_invalidate_path_found_by_hash(tmp_path, cache):
+    a, b = _write(tmp_path, 'a.txt'), _write(tmp_path, 'b.txt')
+    mr.read_data(a, sep=',', cache=cache)
+    mr.read_data(b, sep=',', cache=cache)
+    assert cache.hits == 1
+    assert cache.invalidate(b) == 1
+    mr.read_data(b, sep=',', cache=cache)
+    assert (cache.misses, cache.hits) == (2, 1)
+
+
+def test_sep_and_header_are_part_of_key(tmp_path, cache):
+    path = _write(tmp_path, 'a.txt', '1 2\n3 4\n')
+    with_header = mr.read_data(path, sep=' ', cache=cache)
+    without_header = mr.read_data(path, sep=' ', header=False, cache=cache)
+    assert with_header.size == (1, 2)
+    assert without_header.size == (2, 2)
+    assert cache.hits == 0
+
+
+def test_lru_eviction(tmp_path, cache):
+    paths = [_write(tmp_path, f'{i}.txt', TEXT + f'{i},0\n') for i in range(3)]
+    mr.read_data(paths[0], sep=',', cache=cache)
+    entry_bytes = cache.entries()[0]['bytes']
+    cache.max_bytes = 2 * entry_bytes
+    mr.read_data(paths[1], sep=',', cache=cache)
+    mr.read_data(paths[0], sep=',', cache=cache)
+    mr.read_data(paths[2], sep=',', cache=cache)
+    kept = {path for entry in cache.entries() for path in entry['paths']}
+    assert kept == {os.path.abspath(paths[0]), os.path.abspath(paths[2])}
+    assert len([name for name in os.listdir(cache.directory) if name.endswith('.mdf')]) == 2
+
+
+def test_orphan_files_are_removed(tmp_path, cache):
+    mr.read_data(_write(tmp_path, 'a.txt'), sep=',', cache=cache)
+    orphan = os.path.join(cache.directory, '0' * 32 + '.mdf')
+    with open(orphan, 'wb') as f:
+        f.write(b'\0' * 64)
+    mr.read_data(_write(tmp_path, 'b.txt', TEXT + '1,1\n'), sep=',', cache=cache)
+    assert not os.path.exists(orphan)
+
+
+def test_corrupt_entry_is_parsed_again(tmp_path, cache):
+    path = _write(tmp_path, 'a.txt')
+    mr.read_data(path, sep=',', cache=cache)
+    name = next(name for name in os.listdir(cache.directory) if name.endswith('.mdf'))
+    with open(os.path.join(cache.directory, name), 'r+b') as f:
+        f.truncate(16)
+    frame = mr.read_data(path, sep=',', cache=cache)
+    assert (cache.misses, cache.hits) == (2, 0)
+    assert frame.size == (100, 2)
+    mr.read_data(path, sep=',', cache=cache)
+    assert cache.hits == 1
+
+
+def test_source_is_taken_before_parsing(tmp_path, cache):
+    path = _write(tmp_path, 'a.txt')
+    source = cache.source(path)
+    # файл изменился во время разбора: таблица не должна попасть под хеш нового содержимого
+    _write(tmp_path, 'a.txt', TEXT + '1000,2000\n')
+    cache.put(path, ',', True, mr.read_data(path, sep=','), source)
+    frame = mr.read_data(path, sep=',', cache=cache)
+    assert cache.hits == 0
+    assert frame.size == (101, 2)
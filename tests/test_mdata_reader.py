@@ -0,0 +1,187 @@
+'''
+Разбор txt файлов: быстрый блочный путь против построчного
+'''
+import pickle
+import pytest
+from my_project import mdata_reader as mr
+
+
+def _values(frame):
+    # repr различает nan, inf и -0.0, которые == сравнивает неудобно
+    return [[repr(value) for value in row] for row in frame.tolist()]
+
+
+def _write(tmp_path, text, name='data.txt'):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+EDGE_CASES = {
+    'целые и знаки': 'a,b\n1,-2\n+3,-0\n0,007\n',
+    'экспоненты': 'a,b\n1e5,1E-3\n.5,5.\n-1.5e+2,2e400\n',
+    'inf и nan': 'a,b\ninf,-inf\nnan,NaN\nInfinity,-Infinity\n',
+    'подчёркивания и пробелы': 'a,b\n1_000, 2\n 3 ,4\n',
+    'большие целые': 'a,b\n' + '9' * 400 + ',2\n1,2\n',
+    'некорректные поля': 'a,b\n1,2\nx,3\n4,\n,5\n0x10,1\ntrue,1\n"1",2\n[1],2\n6,7\n',
+    'неверное число столбцов': 'a,b\n1,2\n1,2,3\n4\n5,6\n',
+    'пустые строки': 'a,b\n\n1,2\n\n\n3,4\n\n',
+    'без перевода строки в конце': 'a,b\n1,2\n3,4',
+    'crlf': 'a,b\r\n1,2\r\n3,4\r\n',
+}
+
+
+@pytest.mark.filterwarnings('ignore:.*пропущено некорректных строк')
+@pytest.mark.parametrize('text', EDGE_CASES.values(), ids=EDGE_CASES.keys())
+@pytest.mark.parametrize('block_size', [mr._BLOCK_SIZE, 8])
+def test_bulk_matches_rows(tmp_path, monkeypatch, text, block_size):
+    monkeypatch.setattr(mr, '_BLOCK_SIZE', block_size)
+    path = _write(tmp_path, text)
+    bulk = mr.read_data(path, sep=',', bulk=True)
+    rows = mr.read_data(path, sep=',', bulk=False)
+    assert _values(bulk) == _values(rows)
+    assert bulk.labels == rows.labels == ['a', 'b']
+    assert bulk.skipped_rows == rows.skipped_rows
+
+
+def test_skipped_rows_numbers(tmp_path):
+    path = _write(tmp_path, EDGE_CASES['некорректные поля'])
+    with pytest.warns(UserWarning, match='пропущено некорректных строк: 7'):
+        frame = mr.read_data(path, sep=',')
+    assert frame.skipped_rows == [3, 4, 5, 6, 7, 8, 9]
+    assert frame.tolist() == [[1.0, 2.0], [6.0, 7.0]]
+
+
+@pytest.mark.parametrize('sep', [' ', '\t', ';'])
+def test_bulk_matches_rows_other_separators(tmp_path, sep):
+    text = sep.join('abc') + '\n' + ''.join(sep.join(f'{i * 3 + j}.25' for j in range(3)) + '\n' for i in range(500))
+    path = _write(tmp_path, text)
+    bulk = mr.read_data(path, sep=sep)
+    rows = mr.read_data(path, sep=sep, bulk=False)
+    assert _values(bulk) == _values(rows)
+    assert bulk.size == (500, 3)
+
+
+def test_iter_chunks_matches_read_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(mr, '_BLOCK_VALUES', 7)
+    lines = [f'{i},{i * 0.5},{-i}' if i % 13 else 'bad,row' for i in range(1, 300)]
+    path = _write(tmp_path, 'x,y,z\n' + '\n'.join(lines) + '\n')
+    with pytest.warns(UserWarning):
+        frame = mr.read_data(path, sep=',')
+        chunks = list(mr.iter_chunks(path, sep=',', chunk_rows=40))
+    assert [row for chunk in chunks for row in chunk.tolist()] == frame.tolist()
+    assert [line for chunk in chunks for line in chunk.skipped_rows] == frame.skipped_rows
+    assert all(chunk.size[0] == 40 for chunk in chunks[:-1])
+    assert all(chunk.labels == ['x', 'y', 'z'] for chunk in chunks)
+
+
+def test_columns_are_views_in_column_major_order(tmp_path):
+    path = _write(tmp_path, 'a,b,c\n1,2,3\n4,5,6\n')
+    frame = mr.read_data(path, sep=',')
+    assert frame._strides == (1, 2)
+    assert frame['b'].tolist() == [[2.0], [5.0]]
+    assert frame['b']._shared
+    assert frame[['a', 'c']].tolist() == [[1.0, 3.0], [4.0, 6.0]]
+    assert frame[['c', 'a']].tolist() == [[3.0, 1.0], [6.0, 4.0]]
+    with pytest.raises(ValueError):
+        frame['d']
+    with pytest.raises(ValueError):
+        frame[[]]
+
+
+def test_copies_stay_column_major(tmp_path):
+    path = _write(tmp_path, 'a,b,c\n1,2,3\n4,5,6\n7,8,9\n')
+    frame = mr.read_data(path, sep=',')
+    view = frame[['c', 'a']]
+    view[0, 0] = 0.0
+    assert view._strides == (1, 3) and not view._shared
+    assert view.tolist() == [[0.0, 1.0], [6.0, 4.0], [9.0, 7.0]]
+    assert frame.tolist()[0] == [1.0, 2.0, 3.0]
+    restored = pickle.loads(pickle.dumps(frame[['b', 'c']]))
+    assert restored._strides == (1, 3) and len(restored._data) == 6
+    assert restored.tolist() == frame[['b', 'c']].tolist()
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load_round_trip(tmp_path, mmap):
+    frame = mr.DataFrame([[1.5, -2.0, 3.0], [4.0, float('inf'), 6.25]], labels=['x', 'признак', 'y'])
+    frame.addcol([7.0, 8.0], label='z')
+    path = str(tmp_path / 'frame.mdf')
+    frame.save(path)
+    loaded = mr.DataFrame.load(path, mmap=mmap)
+    assert loaded.tolist() == frame.tolist()
+    assert loaded.labels == frame.labels
+    assert loaded['y'].tolist() == [[3.0], [6.25]]
+
+
+def test_save_load_without_labels(tmp_path):
+    frame = mr.DataFrame([[1.0], [2.0], [3.0]])
+    path = str(tmp_path / 'frame.mdf')
+    frame.save(path)
+    loaded = mr.DataFrame.load(path)
+    assert loaded.tolist() == frame.tolist()
+    assert not loaded.labels
+
+
+def test_mmap_load_is_copy_on_write(tmp_path):
+    frame = mr.DataFrame([[1.0, 2.0], [3.0, 4.0]], labels=['a', 'b'])
+    path = str(tmp_path / 'frame.mdf')
+    frame.save(path)
+    loaded = mr.DataFrame.load(path, mmap=True)
+    loaded[0, 0] = 10.0
+    assert loaded.tolist() == [[10.0, 2.0], [3.0, 4.0]]
+    assert mr.DataFrame.load(path).tolist() == frame.tolist()
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+@pytest.mark.parametrize('cut', [1, 8, 40])
+def test_load_truncated_file(tmp_path, mmap, cut):
+    frame = mr.DataFrame([[float(i), float(i * 2)] for i in range(10)], labels=['a', 'b'])
+    path = tmp_path / 'frame.mdf'
+    frame.save(str(path))
+    path.write_bytes(path.read_bytes()[:-cut])
+    with pytest.raises(ValueError):
+        mr.DataFrame.load(str(path), mmap=mmap)
+
+
+def test_load_foreign_file(tmp_path):
+    path = tmp_path / 'frame.mdf'
+    path.write_bytes(b'abc')
+    with pytest.raises(ValueError):
+        mr.DataFrame.load(str(path))
+
+
+@pytest.mark.parametrize('flags, labels', [(mr._HAS_LABELS, b'a'), (2, b'')], ids=['labels', 'flags'])
+def test_load_bad_header(tmp_path, flags, labels):
+    path = tmp_path / 'frame.mdf'
+    header = mr._HEADER.pack(mr._MAGIC, mr._VERSION, flags, 1, 2, len(labels)) + labels
+    path.write_bytes(header + b'\0' * (-len(header) % 8) + b'\0' * 16)
+    with pytest.raises(ValueError):
+        mr.DataFrame.load(str(path))
+
+
+def test_save_rejects_newline_in_labels(tmp_path):
+    frame = mr.DataFrame([[1.0, 2.0]], labels=['a', 'b\nc'])
+    with pytest.raises(ValueError, match='перевод строки'):
+        frame.save(str(tmp_path / 'frame.mdf'))
+
+
+def test_builder_snapshot_matches_frame():
+    rows = [[float(i), i * 0.5, -i] for i in range(40)]
+    builder = mr.DataFrameBuilder(['a', 'b', 'c'])
+    builder.extend(rows[:25])
+    first = builder.snapshot()
+    for row in rows[25:]:
+        builder.append(row)
+    second = builder.snapshot()
+    expected = mr.DataFrame(rows, labels=['a', 'b', 'c'])
+    assert second.tolist() == expected.tolist()
+    assert second['b'].tolist() == expected['b'].tolist()
+    assert first.tolist() == rows[:25]
+    first[0, 0] = 100.0
+    assert builder.snapshot().tolist()[0][0] == second.tolist()[0][0] == 0.0
+    assert first.tolist()[0][0] == 100.0
+    with pytest.raises(ValueError):
+        builder.append([1.0, 2.0])
+    with pytest.raises(ValueError):
+        mr.DataFrameBuilder().snapshot()
@@ -0,0 +1,251 @@
+'''
+Сохранение модели, веса w_ и обучение по частям таблицы
+'''
+import pickle
+import random
+from math import sqrt
+import pytest
+from my_project import mmath as mm
+from my_project import mdata_reader as mr
+from my_project import moptim
+from my_project.ml import Linear_Regression
+
+
+@pytest.fixture
+def data():
+    X = mm.ArrayMatrix([[1.0, 2.0], [2.0, 1.0], [3.0, 5.0], [4.0, 3.0], [5.0, 4.0]])
+    y = mm.ArrayMatrix([[1.0], [2.0], [3.0], [5.0], [4.0]])
+    return X, y
+
+
+@pytest.fixture
+def model(data):
+    model = Linear_Regression(solver='normal')
+    model.fit(*data)
+    return model
+
+
+def test_save_load_round_trip(tmp_path, data, model):
+    path = str(tmp_path / 'model.bin')
+    model.save(path)
+    loaded = Linear_Regression.load(path)
+    assert list(loaded.w_) == list(model.w_)
+    assert loaded.b_ == model.b_
+    assert loaded.predict(data[0]).tolist() == model.predict(data[0]).tolist()
+
+
+def test_load_truncated_model(tmp_path, model):
+    path = tmp_path / 'model.bin'
+    model.save(str(path))
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError):
+        Linear_Regression.load(str(path))
+
+
+def test_pickle_round_trip(data, model):
+    restored = pickle.loads(pickle.dumps(model))
+    assert restored.predict(data[0]).tolist() == model.predict(data[0]).tolist()
+
+
+def test_predictions_follow_w_(data, model):
+    X = data[0]
+    model.w_ *= 0
+    assert model.predict(X).tolist() == [[model.b_]] * 5
+    assert model.predict_one([1.0, 2.0]) == model.b_
+    model.w_ = mm.Vector([1.0, 0.0])
+    assert model.predict_one([3.0, 2.0]) == 3.0 + model.b_
+    model.w_[1] = [1.0]
+    assert model.predict_one([3.0, 2.0]) == 5.0 + model.b_
+
+
+def test_fit_chunks_runs_n_epochs(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_text('x,y\n' + ''.join(f'{i / 10},{i / 5 + 1}\n' for i in range(100)))
+    chunks = list(mr.iter_chunks(str(path), sep=',', chunk_rows=30))
+    model = Linear_Regression(n_epochs=5, learning_rate=0.01)
+    model.fit(chunks, 'y')
+    assert len(model.losses_) == model.n_epochs_ == 5
+    assert model.stop_reason_ == 'n_epochs'
+    assert model.losses_[-1] < model.losses_[0]
+    with pytest.warns(UserWarning, match='одноразовый итератор'):
+        model.fit(mr.iter_chunks(str(path), sep=',', chunk_rows=30), 'y')
+    assert model.n_epochs_ == 1
+
+
+def test_fit_chunks_schedule_counts_epochs(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_text('x,y\n' + ''.join(f'{i / 10},{i / 5 + 1}\n' for i in range(100)))
+    frame = mr.read_data(str(path), sep=',')
+
+    def make():
+        return Linear_Regression(n_epochs=4, optimizer=moptim.SGD(0.01, schedule=moptim.StepLR(step_size=2)))
+
+    in_memory = make()
+    in_memory.fit(frame[['x']], frame['y'])
+    streamed = make()
+    streamed.fit(list(mr.iter_chunks(str(path), sep=',', chunk_rows=25)), 'y')
+    assert streamed._epoch == in_memory._epoch == 4
+    assert streamed._optimizer.lr == in_memory._optimizer.lr == 0.005
+    # одна часть на всю таблицу - тот же градиентный спуск, что и в памяти
+    whole = make()
+    whole.fit([frame], 'y')
+    assert whole.losses_ == in_memory.losses_
+    assert whole.w_.tolist() == in_memory.w_.tolist() and whole.b_ == in_memory.b_
+
+
+def test_partial_fit_rejects_other_features(data):
+    X, y = data
+    model = Linear_Regression()
+    model.partial_fit(X, y)
+    weights = model.w_.tolist()
+    with pytest.raises(ValueError, match='количество признаков'):
+        model.partial_fit(X[:, 0], y)
+    assert model.w_.tolist() == weights and model._epoch == 1
+    model.fit(X[:, 0], y)
+    model.partial_fit(X[:, 0], y)
+    assert model._epoch == model.n_epochs + 1
+
+
+def test_predict_iter_matches_predict_on_frames(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_text('x1,x2,y\n' + ''.join(f'{i % 7},{i / 3},{i}\n' for i in range(50)))
+    frame = mr.read_data(str(path), sep=',')
+    model = Linear_Regression(solver='normal')
+    model.fit(frame[['x1', 'x2']], frame['y'])
+    chunks = mr.iter_chunks(str(path), sep=',', chunk_rows=20)
+    streamed = [value for part in model.predict_iter(chunks, features=['x1', 'x2']) for value in part]
+    rows = [row[:2] for row in frame.tolist()]
+    expected = [value for part in model.predict_iter(rows, batch_size=20) for value in part]
+    assert streamed == pytest.approx(expected, rel=1e-12)
+    assert model.predict(frame[['x1', 'x2']]).tolist() == [[value] for value in streamed]
+
+
+def _noisy(n=60, seed=1):
+    rng = random.Random(seed)
+    X = [[rng.uniform(-2, 2), rng.uniform(0, 5)] for _ in range(n)]
+    y = [[1.5 * a - 0.5 * b + 2.0 + rng.gauss(0, 0.2)] for a, b in X]
+    return mm.ArrayMatrix(X), mm.ArrayMatrix(y)
+
+
+def _reference_gd(X, y, n_epochs, learning_rate, batch_size=None):
+    # градиентный спуск по определению: строки батча подряд, без перемешивания
+    rows, targets = X.tolist(), [target for target, in y.tolist()]
+    n, d = len(rows), len(rows[0])
+    size = batch_size or n
+    weights, bias = [0.0] * d, 0.0
+    for _ in range(n_epochs):
+        for start in range(0, n, size):
+            batch = range(start, min(start + size, n))
+            residuals = {i: targets[i] - sum(w * x for w, x in zip(weights, rows[i])) - bias for i in batch}
+            scale = -2.0 / len(batch)
+            grad = [scale * sum(residuals[i] * rows[i][j] for i in batch) for j in range(d)]
+            weights = [w - learning_rate * g for w, g in zip(weights, grad)]
+            bias -= learning_rate * scale * sum(residuals.values())
+    return weights, bias
+
+
+@pytest.mark.parametrize('solver', ['normal', 'qr'])
+def test_exact_solvers_recover_weights(solver):
+    X = mm.Matrix([[1.0, 2.0], [2.0, 1.0], [3.0, 5.0], [4.0, 3.0], [0.0, 7.0]])
+    y = mm.Matrix([[2.0 * a - 3.0 * b + 1.0] for a, b in X.values])
+    model = Linear_Regression(solver=solver)
+    model.fit(X, y)
+    assert model.w_._col(0).tolist() == pytest.approx([2.0, -3.0], abs=1e-9)
+    assert model.b_ == pytest.approx(1.0, abs=1e-9)
+    assert model.losses_ == [pytest.approx(0.0, abs=1e-18)]
+    assert (model.n_epochs_, model.stop_reason_) == (1, 'exact')
+
+
+@pytest.mark.parametrize('batch_size', [None, 7, 1, 100])
+def test_gd_matches_reference(batch_size):
+    X, y = _noisy()
+    model = Linear_Regression(n_epochs=15, learning_rate=0.01, batch_size=batch_size, shuffle=False)
+    model.fit(X, y)
+    weights, bias = _reference_gd(X, y, 15, 0.01, batch_size)
+    assert model.w_._col(0).tolist() == pytest.approx(weights, rel=1e-9)
+    assert model.b_ == pytest.approx(bias, rel=1e-9)
+
+
+def test_shuffled_batches_cover_every_row_once():
+    X, y = _noisy()
+    full = Linear_Regression(n_epochs=1, learning_rate=0.01)
+    full.fit(X, y)
+    one = Linear_Regression(n_epochs=1, learning_rate=0.01, batch_size=X.size[0], random_state=0)
+    one.fit(X, y)
+    assert one.w_.tolist() == full.w_.tolist() and one.b_ == full.b_
+    first = Linear_Regression(n_epochs=3, learning_rate=0.01, batch_size=8, random_state=5)
+    first.fit(X, y)
+    second = Linear_Regression(n_epochs=3, learning_rate=0.01, batch_size=8, random_state=5)
+    second.fit(X, y)
+    assert first.losses_ == second.losses_
+
+
+def test_optimizers_follow_update_rules():
+    params, grads = [1.0, -2.0], [0.5, -0.25]
+    momentum = moptim.Momentum(0.1, momentum=0.9)
+    momentum.reset(2)
+    first = momentum.step(params, grads)
+    assert first == pytest.approx([1.0 - 0.05, -2.0 + 0.025])
+    assert momentum.step(first, grads) == pytest.approx([first[0] - 0.9 * 0.05 - 0.05, first[1] + 0.9 * 0.025 + 0.025])
+    adam = moptim.Adam(0.1)
+    adam.reset(2)
+    # первый шаг Adam после поправки смещения равен lr * sign(g)
+    assert adam.step(params, grads) == pytest.approx([0.9, -1.9], rel=1e-6)
+    model = Linear_Regression(n_epochs=200, optimizer=moptim.Adam(0.05))
+    model.fit(*_noisy())
+    exact = Linear_Regression(solver='normal')
+    exact.fit(*_noisy())
+    assert model.w_._col(0).tolist() == pytest.approx(exact.w_._col(0).tolist(), abs=0.05)
+
+
+def test_standardize_matches_fit_on_scaled_data():
+    from my_project.mpreprocessing import StandardScaler
+    X, y = _noisy()
+    fused = Linear_Regression(n_epochs=20, learning_rate=0.05, standardize=True)
+    fused.fit(X, y)
+    scaler = StandardScaler()
+    plain = Linear_Regression(n_epochs=20, learning_rate=0.05)
+    plain.fit(scaler.fit_transform(X), y)
+    weights, bias = scaler.unscale(plain.w_._col(0).tolist(), plain.b_)
+    assert fused.w_._col(0).tolist() == pytest.approx(weights, rel=1e-9)
+    assert fused.b_ == pytest.approx(bias, rel=1e-9)
+    assert fused.losses_ == pytest.approx(plain.losses_, rel=1e-9)
+
+
+def _stop_epoch(losses, tol, patience):
+    best, stale = float('inf'), 0
+    for epoch, loss in enumerate(losses, 1):
+        stale = stale + 1 if best - loss < tol * abs(best) else 0
+        if stale >= patience:
+            return epoch
+        best = min(best, loss)
+    return len(losses)
+
+
+@pytest.mark.parametrize('patience', [1, 3])
+def test_tol_stops_like_full_run(patience):
+    X, y = _noisy()
+    full = Linear_Regression(n_epochs=300, learning_rate=0.05)
+    full.fit(X, y)
+    model = Linear_Regression(n_epochs=300, learning_rate=0.05, tol=1e-3, patience=patience)
+    model.fit(X, y)
+    assert model.stop_reason_ == 'tol'
+    assert model.n_epochs_ == _stop_epoch(full.losses_, 1e-3, patience) < 300
+    assert model.losses_ == full.losses_[:model.n_epochs_]
+
+
+def test_gtol_stops_on_gradient_norm():
+    X, y = _noisy()
+    model = Linear_Regression(n_epochs=5000, learning_rate=0.02, gtol=1e-3)
+    model.fit(X, y)
+    assert model.stop_reason_ == 'gtol' and model.n_epochs_ < 5000
+    rows, targets = X.tolist(), [target for target, in y.tolist()]
+
+    def grad_norm(epochs):
+        # градиент, по которому сделан шаг эпохи epochs + 1
+        weights, bias = _reference_gd(X, y, epochs, 0.02)
+        residuals = [t - sum(w * x for w, x in zip(weights, row)) - bias for row, t in zip(rows, targets)]
+        grad = [sum(r * row[j] for r, row in zip(residuals, rows)) for j in range(2)] + [sum(residuals)]
+        return 2.0 / len(rows) * sqrt(sum(g * g for g in grad))
+
+    assert grad_norm(model.n_epochs_ - 1) < 1e-3 <= grad_norm(model.n_epochs_ - 2)
@@ -0,0 +1,91 @@
+'''
+Представления ArrayMatrix с копированием при записи и поэлементные операции
+'''
+import pickle
+import pytest
+from my_project import mmath as mm
+
+
+@pytest.fixture
+def parent():
+    return mm.ArrayMatrix([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+
+
+def test_transpose_is_view(parent):
+    t = parent.T()
+    assert t.tolist() == [[1.0, 4.0], [2.0, 5.0], [3.0, 6.0]]
+    assert t._data is parent._data
+
+
+def test_write_to_parent_does_not_change_transpose(parent):
+    t = parent.T()
+    parent[0, 1] = 20.0
+    parent[1] = [7.0, 8.0, 9.0]
+    assert t.tolist() == [[1.0, 4.0], [2.0, 5.0], [3.0, 6.0]]
+    assert parent.tolist() == [[1.0, 20.0, 3.0], [7.0, 8.0, 9.0]]
+
+
+def test_write_to_transpose_does_not_change_parent(parent):
+    t = parent.T()
+    t[2, 0] = 30.0
+    assert t.tolist() == [[1.0, 4.0], [2.0, 5.0], [30.0, 6.0]]
+    assert parent.tolist() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+
+
+@pytest.mark.parametrize('idx', [
+    (slice(None), slice(1, None)),
+    (slice(1, 2), slice(None)),
+    (slice(None), slice(None, None, 2)),
+    (slice(None, None, -1), 1),
+])
+def test_slice_views_are_isolated(parent, idx):
+    view = parent[idx]
+    expected = view.tolist()
+    parent[0, 0] = parent[1, 2] = -1.0
+    parent[0, 1] = parent[1, 1] = -1.0
+    assert view.tolist() == expected
+    view[0, 0] = 100.0
+    assert parent.tolist() == [[-1.0, -1.0, 3.0], [4.0, -1.0, -1.0]]
+
+
+def test_view_of_view_is_isolated(parent):
+    view = parent.T()[1:, :]
+    assert view.tolist() == [[2.0, 5.0], [3.0, 6.0]]
+    view[0, 0] = 0.0
+    assert parent.tolist() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    assert parent.T().tolist() == [[1.0, 4.0], [2.0, 5.0], [3.0, 6.0]]
+
+
+@pytest.mark.parametrize('op', ['add', 'sub', 'mul', 'truediv'])
+def test_out_into_parent_keeps_views(parent, op):
+    t = parent.T()
+    getattr(parent, op)(2.0, out=parent)
+    assert t.tolist() == [[1.0, 4.0], [2.0, 5.0], [3.0, 6.0]]
+
+
+def test_inplace_operators_keep_views(parent):
+    view = parent[:, 0]
+    parent += 1.0
+    parent *= 2.0
+    assert parent.tolist() == [[4.0, 6.0, 8.0], [10.0, 12.0, 14.0]]
+    assert view.tolist() == [[1.0], [4.0]]
+
+
+def test_pickle_view_is_compact(parent):
+    view = parent.T()[1:, :]
+    restored = pickle.loads(pickle.dumps(view))
+    assert restored.tolist() == view.tolist()
+    assert len(restored._data) == 4
+
+
+@pytest.mark.parametrize('cls', [mm.Matrix, mm.ArrayMatrix])
+def test_broadcasting_arithmetic(cls):
+    X = cls([[1.0, 2.0], [3.0, 6.0], [5.0, 10.0]])
+    Z = (X - X.mean(axis=0)) / X.var(axis=0) ** 0.5
+    assert [round(v, 6) for v in Z._flat()] == [-1.224745, -1.224745, 0.0, 0.0, 1.224745, 1.224745]
+    assert list((X * X)._flat()) == [1.0, 4.0, 9.0, 36.0, 25.0, 100.0]
+    assert list((X * cls([[2.0], [1.0], [0.5]]))._flat()) == [2.0, 4.0, 3.0, 6.0, 2.5, 5.0]
+    with pytest.raises(ValueError):
+        X * cls([[1.0, 2.0, 3.0]])
+    with pytest.raises(ValueError):
+        X / 'a'
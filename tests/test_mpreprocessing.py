@@ -0,0 +1,45 @@
+'''
+StandardScaler: обучение по частям и пересчёт весов к исходным признакам
+'''
+import random
+import pytest
+from my_project import mmath as mm
+from my_project.mpreprocessing import StandardScaler
+
+
+@pytest.fixture
+def X():
+    rng = random.Random(3)
+    return mm.ArrayMatrix([[1e4 + rng.gauss(0, 1), rng.uniform(-5, 5), 7.0] for _ in range(90)])
+
+
+def test_partial_fit_matches_fit(X):
+    whole = StandardScaler().fit(X)
+    parts = StandardScaler()
+    for start, stop in ((0, 10), (10, 55), (55, 90)):
+        parts.partial_fit(X[start:stop, :])
+    assert parts.n_samples_seen_ == whole.n_samples_seen_ == 90
+    assert parts.mean_ == pytest.approx(whole.mean_, rel=1e-12)
+    assert parts.var_ == pytest.approx(whole.var_, rel=1e-9, abs=1e-12)
+    # постоянный столбец не делится на ноль
+    assert whole.scale_[2] == 1.0
+
+
+def test_transform_round_trip(X):
+    scaler = StandardScaler().fit(X)
+    Z = scaler.transform(X)
+    for column in Z.T().tolist()[:2]:
+        assert sum(column) / len(column) == pytest.approx(0.0, abs=1e-9)
+        assert sum(v * v for v in column) / len(column) == pytest.approx(1.0, rel=1e-9)
+    restored = scaler.inverse_transform(Z).tolist()
+    for row, expected in zip(restored, X.tolist()):
+        assert row == pytest.approx(expected, rel=1e-12)
+
+
+def test_unscale_gives_same_predictions(X):
+    scaler = StandardScaler().fit(X)
+    weights, bias = [0.3, -1.2, 0.5], 4.0
+    raw, raw_bias = scaler.unscale(weights, bias)
+    for z, x in zip(scaler.transform(X).tolist(), X.tolist()):
+        expected = sum(w * v for w, v in zip(weights, z)) + bias
+        assert sum(w * v for w, v in zip(raw, x)) + raw_bias == pytest.approx(expected, rel=1e-9, abs=1e-9)
@@ -0,0 +1,24 @@
+'''
+Записи эпох профилировщика при обучении в памяти и по частям
+'''
+from my_project import mdata_reader as mr
+from my_project import mprofile
+from my_project.ml import Linear_Regression
+
+
+def test_epochs_are_recorded_per_pass(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_text('x,y\n' + ''.join(f'{i / 10},{i / 5 + 1}\n' for i in range(100)))
+    frame = mr.read_data(str(path), sep=',')
+    chunks = list(mr.iter_chunks(str(path), sep=',', chunk_rows=25))
+    seen = []
+    with mprofile.Profiler(on_epoch=lambda model, epoch, seconds, loss: seen.append((epoch, loss))) as profiler:
+        streamed = Linear_Regression(n_epochs=3)
+        streamed.fit(chunks, 'y')
+        in_memory = Linear_Regression(n_epochs=3)
+        in_memory.fit(frame[['x']], frame['y'])
+    assert [epoch for epoch, _, _ in profiler.epochs] == [1, 2, 3, 1, 2, 3]
+    assert seen == [(epoch, loss) for epoch, _, loss in profiler.epochs]
+    assert [loss for _, _, loss in profiler.epochs[:3]] == streamed.losses_
+    assert len(streamed.epoch_times_) == len(in_memory.epoch_times_) == 3
+    assert all(seconds > 0 for seconds in streamed.epoch_times_)
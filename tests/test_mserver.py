@@ -0,0 +1,59 @@
+'''
+Сервер предсказаний: ответы, загрузка модели и остановка
+'''
+import asyncio
+import json
+import pickle
+import pytest
+from my_project import mmath as mm
+from my_project.ml import Linear_Regression
+from my_project.mserver import ScoringServer, load_model
+
+
+@pytest.fixture
+def model():
+    model = Linear_Regression(solver='normal')
+    model.fit(mm.ArrayMatrix([[1.0, 2.0], [2.0, 1.0], [3.0, 5.0], [4.0, 3.0]]),
+              mm.ArrayMatrix([[1.0], [2.0], [3.0], [5.0]]))
+    return model
+
+
+def test_responses_are_json(model):
+    async def run():
+        server = await ScoringServer(model, port=0).start()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        responses = []
+        for payload in (b'[1, 2]\n', b'[NaN, 2]\n', b'{"a": 1}\n'):
+            writer.write(payload)
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+        writer.close()
+        await server.close()
+        return responses
+
+    value, not_finite, wrong = asyncio.run(run())
+    assert value == model.predict_one([1.0, 2.0])
+    assert 'error' in not_finite and 'error' in wrong
+
+
+def test_close_fails_pending_requests(model):
+    async def run():
+        server = await ScoringServer(model, port=0, max_delay=10.0).start()
+        pending = [asyncio.create_task(server.predict([1.0, 2.0])) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        await server.close()
+        assert server._batcher.done()
+        with pytest.raises(RuntimeError):
+            await server.predict([1.0, 2.0])
+        return await asyncio.gather(*pending, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(run()))
+
+
+def test_load_model_rejects_pickle(tmp_path, model):
+    path = tmp_path / 'model.pkl'
+    path.write_bytes(pickle.dumps(model))
+    with pytest.raises(ValueError):
+        load_model(str(path))
+    model.save(str(tmp_path / 'model.bin'))
+    assert load_model(str(tmp_path / 'model.bin')).predict_one([1.0, 2.0]) == model.predict_one([1.0, 2.0])
@@ -0,0 +1,56 @@
+'''
+Достаточные статистики регрессии: сложение частей и решение против QR
+'''
+import random
+import pytest
+from my_project import mmath as mm
+from my_project.ml import Linear_Regression
+from my_project.mstats import RegressionStats
+
+
+def _data(n=200, offset=0.0, seed=0):
+    rng = random.Random(seed)
+    X = [[offset + rng.random(), offset + rng.gauss(0, 1), rng.random() * 10] for _ in range(n)]
+    y = [[2.0 * a - 3.0 * b + 0.5 * c + 7.0 + rng.gauss(0, 0.1)] for a, b, c in X]
+    return mm.ArrayMatrix(X), mm.ArrayMatrix(y)
+
+
+def _fit(solver, X, y):
+    model = Linear_Regression(solver=solver)
+    model.fit(X, y)
+    return model
+
+
+def test_merge_matches_whole():
+    X, y = _data()
+    whole = RegressionStats().update(X, y)
+    merged = RegressionStats()
+    for start in (0, 70, 150):
+        stop = {0: 70, 70: 150, 150: 200}[start]
+        merged += RegressionStats().update(X[start:stop, :], y[start:stop, :])
+    assert merged.n == whole.n == 200
+    assert merged.x_mean == pytest.approx(whole.x_mean, rel=1e-12)
+    assert merged.y_mean == pytest.approx(whole.y_mean, rel=1e-12)
+    for row_a, row_b in zip(merged.sxx, whole.sxx):
+        assert row_a == pytest.approx(row_b, rel=1e-10)
+    assert merged.sxy == pytest.approx(whole.sxy, rel=1e-10)
+    assert merged.syy == pytest.approx(whole.syy, rel=1e-10)
+
+
+@pytest.mark.parametrize('offset', [0.0, 1e6])
+def test_normal_matches_qr(offset):
+    X, y = _data(offset=offset)
+    normal, qr = _fit('normal', X, y), _fit('qr', X, y)
+    assert normal.w_._col(0).tolist() == pytest.approx(qr.w_._col(0).tolist(), rel=1e-6, abs=1e-6)
+    assert normal.b_ == pytest.approx(qr.b_, rel=1e-6, abs=1e-3)
+    assert normal.losses_[0] == pytest.approx(qr.losses_[0], rel=1e-6)
+
+
+def test_fit_stats_mse_matches_data():
+    X, y = _data(offset=1e3)
+    stats = RegressionStats()
+    stats.update(X[:120, :], y[:120, :]).update(X[120:, :], y[120:, :])
+    model = Linear_Regression(solver='gd')
+    model.fit_stats(stats)
+    residuals = [target - value for (target,), (value,) in zip(y.tolist(), model.predict(X).tolist())]
+    assert model.losses_[0] == pytest.approx(sum(r * r for r in residuals) / len(residuals), rel=1e-9)